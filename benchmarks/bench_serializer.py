@@ -0,0 +1,103 @@
+"""Benchmark the LibYAML and pure-Python serialization paths.
+
+Generates a multi-document Ingress file, then times parsing it and dumping
+the converted Gateway API resources with both the accelerated loader/dumper
+used by ingress2gateway.serializer and the pure-Python equivalents.
+
+Usage:
+    python benchmarks/bench_serializer.py [--ingresses N] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.ingress2gateway import serializer  # noqa: E402
+from src.ingress2gateway.converter import convert_ingress_to_gateway  # noqa: E402
+
+
+def _make_ingress(i: int) -> dict:
+    host = f"app-{i}.example.com"
+    return {
+        "apiVersion": "networking.k8s.io/v1",
+        "kind": "Ingress",
+        "metadata": {
+            "name": f"app-{i}",
+            "namespace": f"team-{i % 50}",
+            "annotations": {"nginx.ingress.kubernetes.io/rewrite-target": "/"},
+        },
+        "spec": {
+            "ingressClassName": "nginx",
+            "tls": [{"hosts": [host], "secretName": f"app-{i}-tls"}],
+            "rules": [
+                {
+                    "host": host,
+                    "http": {
+                        "paths": [
+                            {
+                                "path": f"/v{j}",
+                                "pathType": "Prefix",
+                                "backend": {
+                                    "service": {"name": f"svc-{j}", "port": {"number": 8080}}
+                                },
+                            }
+                            for j in range(4)
+                        ]
+                    },
+                }
+            ],
+        },
+    }
+
+
+def _best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ingresses", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    ingresses = [_make_ingress(i) for i in range(args.ingresses)]
+    content = yaml.dump_all(ingresses, Dumper=yaml.SafeDumper, sort_keys=False)
+    resources = []
+    for ingress in ingresses:
+        converted = convert_ingress_to_gateway(ingress)
+        resources.append(converted["gateway"])
+        resources.extend(converted["httproutes"])
+
+    def pure_load():
+        list(yaml.load_all(content, Loader=yaml.SafeLoader))
+
+    def pure_dump():
+        yaml.dump_all(resources, Dumper=yaml.SafeDumper, **serializer.DUMP_OPTIONS)
+
+    def fast_load():
+        list(serializer.load_all(content))
+
+    def fast_dump():
+        serializer.dump_all(resources)
+
+    print(f"LibYAML available: {serializer.HAS_LIBYAML}")
+    print(f"Input: {args.ingresses} Ingresses, {len(content) / 1e6:.1f} MB")
+    print(f"{'operation':<10} {'pure (s)':>10} {'serializer (s)':>15} {'speedup':>8}")
+    for name, pure, fast in (("load", pure_load, fast_load), ("dump", pure_dump, fast_dump)):
+        pure_time = _best_of(args.repeat, pure)
+        fast_time = _best_of(args.repeat, fast)
+        print(f"{name:<10} {pure_time:>10.3f} {fast_time:>15.3f} {pure_time / fast_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
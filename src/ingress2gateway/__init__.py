@@ -6,6 +6,7 @@ from .alb_gce import parse_alb_annotations, parse_cloud_annotations, parse_gce_a
 from .annotations import get_annotation_warnings, parse_annotations
 from .converter import convert_ingress_to_gateway, parse_ingress, resources_to_yaml
 from .grpc import create_grpc_route, is_grpc_backend
+from .pipeline import ConversionResult, ConversionSession
 from .providers import apply_provider_defaults, get_provider, list_providers
 from .reference_grant import create_reference_grant, generate_reference_grants
 from .report import generate_diff_summary, generate_migration_report
@@ -25,6 +26,9 @@ __all__ = [
     "convert_ingress_to_gateway",
     "parse_ingress",
     "resources_to_yaml",
+    # Sessions
+    "ConversionSession",
+    "ConversionResult",
     # gRPC
     "create_grpc_route",
     "is_grpc_backend",
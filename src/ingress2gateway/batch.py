@@ -0,0 +1,524 @@
+"""Parallel batch conversion.
+
+This module expands directories and glob patterns into input files and
+converts them independently, optionally fanned out across a process pool.
+Each worker reads one file, runs the conversion pipeline and writes its own
+output, so only small per-file summaries travel back to the parent process.
+
+A single large multi-document file can also be split into chunks of raw
+documents that are converted in parallel and reassembled in input order.
+"""
+
+import glob
+import json
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import IO, Any
+
+import yaml
+
+from . import serializer
+from .cache import ConversionCache, MemoryCache, convert_cached
+from .canonical import canonicalize
+from .conflicts import find_path_conflicts
+from .consolidate import GatewayConsolidator
+from .pipeline import ConversionResult, convert_stream, merge_results, skip_failures
+from .reference_grant import generate_reference_grants
+from .route_merge import merge_httproutes
+from .route_optimize import optimize_httproutes
+from .sink import FileSink
+from .splitter import Selector, iter_raw_documents, select_raw_documents
+from .validation import ValidationError, validate_conversion_output
+
+INPUT_SUFFIXES = (".yaml", ".yml", ".json")
+OUTPUT_SUFFIXES = {"yaml": ".yaml", "json": ".json", "ndjson": ".ndjson"}
+
+# Target amount of raw YAML handed to a worker at once when splitting a file
+CHUNK_BYTES = 256 * 1024
+
+
+class FileResult:
+    """Outcome of converting a single input file.
+
+    Attributes:
+        input_path: The input file.
+        output_path: The output file, or None if nothing was written.
+        status: 'converted', 'skipped' (no selected Ingress), 'failed', or
+            'removed' (input deleted while watching).
+        message: Error description for failed files, or a note on how much
+            of a file was re-converted in watch mode or how many Ingresses
+            were skipped.
+        ingresses: Number of Ingresses converted.
+        documents: Number of Gateway API documents written.
+        unchanged: Whether the output already had the generated content and
+            was left untouched.
+        failures: The Ingresses skipped for failing validation with
+            keep_going, each as '<namespace>/<name>: <errors>'.
+    """
+
+    def __init__(
+        self,
+        input_path: str,
+        output_path: str | None = None,
+        status: str = "converted",
+        message: str = "",
+        ingresses: int = 0,
+        documents: int = 0,
+        unchanged: bool = False,
+        failures: list[str] | None = None,
+    ):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.status = status
+        self.message = message
+        self.ingresses = ingresses
+        self.documents = documents
+        self.unchanged = unchanged
+        self.failures = failures or []
+
+    def __repr__(self) -> str:
+        return f"[{self.status.upper()}] {self.input_path}"
+
+
+def expand_inputs(
+    patterns: list[str], output_dir: str | None = None, include_outputs: bool = False
+) -> list[Path]:
+    """Expand file paths, directories and glob patterns into input files.
+
+    Directories are searched recursively for YAML and JSON files. Files found
+    that are, or may be, outputs of a batch conversion are left out, so a
+    second run does not convert the first run's outputs; files named
+    explicitly are always kept. Results are de-duplicated and sorted so batch
+    output is deterministic.
+
+    Args:
+        patterns: Paths, directories or glob patterns.
+        output_dir: Output directory of the batch conversion, if any.
+        include_outputs: Whether to keep output files found in directories
+            and glob patterns, for commands that read generated resources.
+
+    Returns:
+        The input files.
+
+    Raises:
+        FileNotFoundError: If a pattern matches nothing.
+    """
+    excluded = Path(output_dir).resolve() if output_dir else None
+    files: set[Path] = set()
+    for pattern in patterns:
+        if Path(pattern).exists():
+            matches = [Path(pattern)]
+        else:
+            matches = [Path(m) for m in glob.glob(pattern, recursive=True)]
+            if not matches:
+                raise FileNotFoundError(f"No input files match: {pattern}")
+
+        found: list[Path] = []
+        for match in matches:
+            if match.is_dir():
+                found.extend(
+                    p for p in match.rglob("*") if p.suffix in INPUT_SUFFIXES and p.is_file()
+                )
+            elif match == Path(pattern):
+                files.add(match)
+            else:
+                found.append(match)
+        files.update(p for p in found if include_outputs or not is_output(p.resolve(), excluded))
+    return sorted(files)
+
+
+def is_output(path: Path, output_dir: Path | None) -> bool:
+    """Check whether a path is, or may be, a generated output file.
+
+    Args:
+        path: A resolved file path.
+        output_dir: The resolved output directory, if outputs go to one.
+    """
+    if output_dir is not None:
+        return output_dir in path.parents
+    return path.stem.endswith(".gateway")
+
+
+def output_paths(
+    files: list[Path],
+    output_dir: str | None,
+    output_format: str = "yaml",
+    base: Path | None = None,
+) -> list[Path]:
+    """Compute the output file for each input file.
+
+    With an output directory, the input tree below the inputs' deepest common
+    directory (or base, if given) is mirrored into it. Without one, each
+    output is written next to its input as ``<name>.gateway.<ext>``.
+
+    Args:
+        files: Input files.
+        output_dir: Optional output directory.
+        output_format: Output format, which determines the file extension.
+        base: Directory to mirror the input tree from.
+
+    Returns:
+        One output path per input file, in the same order.
+    """
+    suffix = OUTPUT_SUFFIXES[output_format]
+    if not output_dir:
+        return [f.with_name(f"{f.stem}.gateway{suffix}") for f in files]
+
+    if base is None:
+        base = Path(os.path.commonpath([f.resolve().parent for f in files])) if files else Path()
+    return [Path(output_dir) / f.resolve().relative_to(base).with_suffix(suffix) for f in files]
+
+
+def convert_file(
+    input_path: str,
+    output_path: str,
+    provider: str = "istio",
+    detect_grpc: bool = False,
+    do_validate: bool = True,
+    output_format: str = "yaml",
+    namespaces: tuple[str, ...] = (),
+    ingress_classes: tuple[str, ...] = (),
+    cache: ConversionCache | MemoryCache | None = None,
+    canonical: bool = False,
+    consolidate: bool = False,
+    minimize_listeners: bool = False,
+    merge_routes: bool = False,
+    check_conflicts: bool = False,
+    optimize_routes: bool = False,
+    keep_going: bool = False,
+) -> FileResult:
+    """Convert one input file and write its output.
+
+    Runs in worker processes, so it never prints; problems are reported in
+    the returned FileResult instead.
+
+    Args:
+        input_path: Input file containing Ingress resources.
+        output_path: File the Gateway API resources are written to.
+        provider: Gateway provider preset.
+        detect_grpc: Whether to detect and convert gRPC backends to GRPCRoutes.
+        do_validate: Whether to validate input and output resources.
+        output_format: Output format ('yaml', 'json' or 'ndjson').
+        namespaces: Only convert Ingresses in these namespaces.
+        ingress_classes: Only convert Ingresses with these ingress classes.
+        cache: Optional cache of per-document conversion results.
+        canonical: Whether to write resources in canonical order with sorted keys.
+        consolidate: Whether to merge the Gateways of the file's Ingresses
+            instead of keeping only the first, adding the ReferenceGrants
+            that cross-namespace references need.
+        minimize_listeners: Whether to also fold the merged listeners into
+            shared ones; implies consolidate.
+        merge_routes: Whether to merge HTTPRoutes with the same parents and
+            hostnames.
+        check_conflicts: Whether to fail on HTTPRoute matches that conflict
+            with others for the same host and path.
+        optimize_routes: Whether to read ImplementationSpecific paths as
+            ingress-nginx regexes and GCE or ALB wildcards, then demote regex
+            matches and order and merge the rules of each HTTPRoute.
+        keep_going: Whether to skip Ingresses that fail input or output
+            validation, listing them in the result, instead of failing the
+            file.
+
+    Returns:
+        The outcome of the conversion. An existing output that already has
+        the generated content is not rewritten.
+    """
+    selector = Selector(["Ingress"], namespaces, ingress_classes)
+    counts = {"ingresses": 0}
+    failures: list[ConversionResult] = []
+    try:
+        with open(input_path) as input_stream:
+            results = _convert(
+                input_stream,
+                provider,
+                detect_grpc,
+                do_validate,
+                None,
+                selector,
+                cache,
+                optimize_routes,
+            )
+            if keep_going:
+                results = skip_failures(results, do_validate, failures)
+            consolidator = (
+                GatewayConsolidator(minimize=minimize_listeners)
+                if consolidate or minimize_listeners
+                else None
+            )
+            merged = merge_results(_counted(results, counts), consolidator=consolidator)
+    except (yaml.YAMLError, json.JSONDecodeError, serializer.LimitExceeded) as e:
+        return FileResult(input_path, status="failed", message=f"Error parsing input: {e}")
+    except Exception as e:
+        return FileResult(input_path, status="failed", message=str(e))
+
+    skipped = [
+        f"{result.name}: " + ", ".join(f"{error.path}: {error.message}" for error in result.errors)
+        for result in failures
+    ]
+    if merged is None:
+        if skipped:
+            message = "Validation failed: " + "; ".join(skipped)
+            return FileResult(input_path, status="failed", message=message, failures=skipped)
+        return FileResult(input_path, status="skipped")
+
+    if not merged.is_valid:
+        return FileResult(
+            input_path, status="failed", message=_format_errors("Input", merged.errors)
+        )
+
+    resources = merged.resources
+    if merge_routes:
+        resources["httproutes"] = merge_httproutes(resources["httproutes"])
+    if optimize_routes:
+        resources["httproutes"] = optimize_httproutes(resources["httproutes"])
+    if check_conflicts:
+        conflicts = find_path_conflicts(resources["httproutes"])
+        if not conflicts.is_valid:
+            return FileResult(
+                input_path, status="failed", message=_format_errors("Path", conflicts.errors)
+            )
+    if do_validate:
+        output_validation = validate_conversion_output(resources)
+        if not output_validation.is_valid:
+            return FileResult(
+                input_path,
+                status="failed",
+                message=_format_errors("Output", output_validation.errors),
+            )
+
+    gateways = resources.get("gateways") or [resources["gateway"]]
+    documents = [*gateways, *resources["httproutes"], *resources["grpcroutes"]]
+    if consolidator is not None:
+        # Consolidated Gateways reference routes and certificates in other namespaces
+        grants = generate_reference_grants(
+            gateways, resources["httproutes"], resources["grpcroutes"]
+        )
+        documents[len(gateways) : len(gateways)] = grants
+    if canonical:
+        documents = canonicalize(documents)
+    try:
+        with FileSink(output_path) as sink:
+            sink.write_all(serializer.iter_serialized(documents, output_format, canonical))
+    except OSError as e:
+        return FileResult(input_path, status="failed", message=str(e))
+
+    return FileResult(
+        input_path,
+        output_path,
+        ingresses=counts["ingresses"],
+        documents=len(documents),
+        unchanged=not sink.written,
+        message=f"{len(skipped)} Ingress(es) skipped" if skipped else "",
+        failures=skipped,
+    )
+
+
+def _convert(
+    content: str | IO[str],
+    provider: str,
+    detect_grpc: bool,
+    do_validate: bool,
+    on_skip: Callable[[str], None] | None,
+    selector: Selector | None,
+    cache: ConversionCache | MemoryCache | None,
+    regex_paths: bool = False,
+) -> Iterator[ConversionResult]:
+    """Convert input through the cache if one is given."""
+    if cache is None:
+        return convert_stream(
+            content, provider, detect_grpc, do_validate, on_skip, selector, regex_paths
+        )
+    return convert_cached(
+        content, provider, detect_grpc, do_validate, on_skip, selector, cache, regex_paths
+    )
+
+
+def _counted(
+    results: Iterator[ConversionResult], counts: dict[str, int]
+) -> Iterator[ConversionResult]:
+    """Count conversion results as they pass through."""
+    for result in results:
+        counts["ingresses"] += 1
+        yield result
+
+
+def _format_errors(stage: str, errors: list[ValidationError]) -> str:
+    """Summarize validation errors on a single line."""
+    details = "; ".join(f"{error.path}: {error.message}" for error in errors)
+    return f"{stage} validation failed: {details}"
+
+
+def run_batch(
+    files: list[Path],
+    outputs: list[Path],
+    jobs: int = 1,
+    **options,
+) -> Iterator[FileResult]:
+    """Convert many files, optionally in parallel.
+
+    Args:
+        files: Input files.
+        outputs: Output file for each input file.
+        jobs: Number of worker processes. 1 converts in-process; 0 uses one
+            worker per CPU.
+        **options: Conversion options passed to convert_file.
+
+    Yields:
+        A FileResult per input file, in input order.
+    """
+    worker = partial(convert_file, **options)
+    inputs = [str(f) for f in files]
+    targets = [str(o) for o in outputs]
+
+    if jobs == 1 or len(files) <= 1:
+        yield from map(worker, inputs, targets)
+        return
+
+    max_workers = jobs or os.cpu_count() or 1
+    # Batch small files together to amortize inter-process overhead
+    chunksize = max(1, len(files) // (max_workers * 4))
+    with _process_pool(max_workers) as executor:
+        yield from executor.map(worker, inputs, targets, chunksize=chunksize)
+
+
+def convert_parallel(
+    content: str | IO[str],
+    provider: str,
+    detect_grpc: bool = False,
+    do_validate: bool = True,
+    on_skip: Callable[[str], None] | None = None,
+    selector: Selector | None = None,
+    jobs: int = 0,
+    chunk_bytes: int = CHUNK_BYTES,
+    cache: ConversionCache | None = None,
+    regex_paths: bool = False,
+) -> Iterator[ConversionResult]:
+    """Convert a large multi-document input across a process pool.
+
+    Raw documents are split and sniffed in this process; documents the
+    selector excludes are dropped before dispatch. The remainder is grouped
+    into chunks of roughly chunk_bytes that workers parse, validate and
+    convert. Results are yielded in input order, so output is identical to
+    convert_stream. Only a bounded window of chunks is in flight at once.
+
+    JSON input cannot be split without parsing and is converted in-process.
+
+    Args:
+        content: A YAML or JSON string, or an open text stream.
+        provider: Gateway provider preset.
+        detect_grpc: Whether to detect and convert gRPC backends to GRPCRoutes.
+        do_validate: Whether to validate each input Ingress.
+        on_skip: Optional callback invoked with the kind of each skipped
+            non-Ingress document.
+        selector: Optional selector documents must match.
+        jobs: Number of worker processes (0: one per CPU).
+        chunk_bytes: Target size of each chunk of raw documents.
+        cache: Optional cache of per-document conversion results, consulted
+            by the workers.
+        regex_paths: Whether to read ImplementationSpecific paths as
+            ingress-nginx regexes and GCE or ALB wildcards.
+
+    Yields:
+        A ConversionResult for each Ingress in input order.
+    """
+    if not isinstance(content, str) and not content.seekable():
+        content = content.read()
+
+    if serializer.is_json_input(content):
+        yield from _convert(
+            content, provider, detect_grpc, do_validate, on_skip, selector, cache, regex_paths
+        )
+        return
+
+    worker = partial(
+        _convert_chunk,
+        provider=provider,
+        detect_grpc=detect_grpc,
+        do_validate=do_validate,
+        selector=selector,
+        cache=cache,
+        regex_paths=regex_paths,
+    )
+    chunks = _iter_chunks(content, selector, on_skip, chunk_bytes)
+
+    max_workers = jobs or os.cpu_count() or 1
+    with _process_pool(max_workers) as executor:
+        for results, skipped in _ordered_map(executor, worker, chunks, max_workers * 2):
+            if on_skip is not None:
+                for kind in skipped:
+                    on_skip(kind)
+            yield from results
+
+
+def _iter_chunks(
+    content: str | IO[str],
+    selector: Selector | None,
+    on_skip: Callable[[str], None] | None,
+    chunk_bytes: int,
+) -> Iterator[str]:
+    """Group selected raw documents into chunks of roughly chunk_bytes."""
+    chunk: list[str] = []
+    size = 0
+    for raw in select_raw_documents(iter_raw_documents(content), selector, on_skip):
+        # Each raw document keeps its own marker; make sure it starts one
+        chunk.append(raw if raw.startswith("---") else "---\n" + raw)
+        size += len(raw)
+        if size >= chunk_bytes:
+            yield "".join(chunk)
+            chunk = []
+            size = 0
+
+    if chunk:
+        yield "".join(chunk)
+
+
+def _convert_chunk(
+    chunk: str,
+    provider: str,
+    detect_grpc: bool,
+    do_validate: bool,
+    selector: Selector | None,
+    cache: ConversionCache | None,
+    regex_paths: bool = False,
+) -> tuple[list[ConversionResult], list[str]]:
+    """Convert one chunk of raw documents in a worker process."""
+    skipped: list[str] = []
+    results = list(
+        _convert(
+            chunk, provider, detect_grpc, do_validate, skipped.append, selector, cache, regex_paths
+        )
+    )
+    return results, skipped
+
+
+def _ordered_map(
+    executor: Executor,
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    window: int,
+) -> Iterator[Any]:
+    """Map fn over items in an executor, yielding results in input order.
+
+    Unlike Executor.map, items are submitted lazily so that at most window
+    tasks are pending at any time.
+    """
+    pending: deque[Future] = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Create a process pool whose workers enforce this process's parse limits."""
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=serializer.set_limits,
+        initargs=(serializer.get_limits(),),
+    )
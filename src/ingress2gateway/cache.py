@@ -0,0 +1,341 @@
+"""Content-addressed on-disk conversion cache.
+
+CI pipelines tend to convert the same, mostly unchanged, manifests on every
+run. This module caches the conversion result of each input document under a
+key derived from the document text, the conversion options and the package
+version, so a repeated conversion only has to split the input, hash each
+document and read the cached results back.
+
+Entries are stored as JSON files below the cache directory. Reading an entry
+refreshes its modification time, and evict() removes the least recently used
+entries once the cache grows beyond its size limit.
+
+A Checkpoint stores the same entries in a single append-only journal file,
+so that an interrupted or partly failed conversion can be resumed.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from . import __version__, serializer
+from .pipeline import ConversionResult, ConversionSession
+from .splitter import Selector, iter_raw_documents, select_raw_documents
+
+# Default size limit of the cache directory in bytes
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+_MARKER_RE = re.compile(r"\A---[ \t]*(?:#.*)?\n")
+
+
+def default_cache_dir() -> Path:
+    """Return the default cache directory.
+
+    Follows the XDG base directory specification: ``$XDG_CACHE_HOME`` if set,
+    otherwise ``~/.cache``.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ingress2gateway"
+
+
+def document_key(
+    text: str,
+    provider: str,
+    detect_grpc: bool,
+    do_validate: bool,
+    selector: Selector | None = None,
+    regex_paths: bool = False,
+) -> str:
+    """Compute the cache key of a document converted with the given options.
+
+    Args:
+        text: Normalized document text.
+        provider: Gateway provider preset.
+        detect_grpc: Whether gRPC backends are converted to GRPCRoutes.
+        do_validate: Whether the input Ingress is validated.
+        selector: Optional selector applied to the document.
+        regex_paths: Whether ImplementationSpecific paths are read as
+            ingress-nginx regexes and GCE or ALB wildcards.
+
+    Returns:
+        A hex digest identifying the conversion.
+    """
+    options = [__version__, provider, detect_grpc, do_validate]
+    if regex_paths:
+        options.append("regex-paths")
+    if selector is not None:
+        options += [
+            sorted(selector.kinds),
+            sorted(selector.namespaces),
+            sorted(selector.ingress_classes),
+        ]
+    digest = hashlib.sha256(json.dumps(options).encode())
+    digest.update(b"\0")
+    digest.update(text.encode())
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """A size-limited, content-addressed store of conversion results.
+
+    Instances only hold the cache location and limit, so they can be passed
+    to worker processes. Writes are atomic, so concurrent writers never
+    expose partially written entries.
+
+    Attributes:
+        directory: Directory the entries are stored in.
+        max_size: Size limit in bytes enforced by evict().
+    """
+
+    def __init__(self, directory: str | Path | None = None, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_size = max_size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Read an entry and mark it as recently used.
+
+        Returns:
+            The entry, or None if it is missing or unreadable.
+        """
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_bytes())
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        """Store an entry, ignoring errors such as a read-only cache directory."""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as temp_file:
+                temp_file.write(json.dumps(entry, separators=(",", ":")))
+            os.replace(temp_path, path)
+        except OSError:
+            return
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits max_size.
+
+        Returns:
+            The number of entries removed.
+        """
+        entries = []
+        total = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+class MemoryCache:
+    """An in-process cache holding the entries of one conversion pass.
+
+    Used to re-convert a file incrementally: entries that were not used
+    during a pass are dropped by sweep(), so memory is bounded by the size
+    of the most recent conversion.
+
+    Attributes:
+        hits: Lookups answered from the cache since the last sweep.
+        misses: Lookups that missed since the last sweep.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._used: dict[str, dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        entry = self._used.get(key) or self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._used[key] = entry
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        self._used[key] = entry
+
+    def sweep(self) -> None:
+        """Keep only the entries used since the last sweep and reset counters."""
+        self._entries = self._used
+        self._used = {}
+        self.hits = 0
+        self.misses = 0
+
+
+class Checkpoint:
+    """A journal of converted documents for resuming a conversion.
+
+    Every successfully converted document is appended to the journal as one
+    line holding its key and entry, and flushed immediately. When the same
+    journal is used again, journaled documents are replayed instead of being
+    converted, so only the documents that were not reached, or that failed
+    validation and have since been fixed, are converted. A line cut short by
+    an interruption is ignored.
+
+    Only the keys and their offsets in the file are held in memory.
+
+    Attributes:
+        path: The journal file.
+        cache: Optional cache consulted for documents not in the journal.
+        replayed: Number of documents replayed from the journal.
+    """
+
+    def __init__(self, path: str | Path, cache: ConversionCache | None = None):
+        self.path = Path(path)
+        self.cache = cache
+        self.replayed = 0
+        self._offsets: dict[str, int] = {}
+        self._journal = open(self.path, "a+b")
+        self._journal.seek(0)
+        end = 0
+        line = b""
+        for line in self._journal:
+            key, tab, _ = line.partition(b"\t")
+            if tab and line.endswith(b"\n"):
+                self._offsets[key.decode()] = end
+            end += len(line)
+        # Start a new line after a truncated one
+        self._separator = b"" if not line or line.endswith(b"\n") else b"\n"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Replay an entry from the journal, falling back to the cache."""
+        offset = self._offsets.get(key)
+        if offset is not None:
+            self._journal.seek(offset)
+            try:
+                entry = json.loads(self._journal.readline().partition(b"\t")[2])
+            except ValueError:
+                entry = None
+            if entry is not None:
+                self.replayed += 1
+                return entry
+
+        entry = self.cache.get(key) if self.cache is not None else None
+        if entry is not None and _succeeded(entry):
+            self._append(key, entry)
+        return entry
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        """Journal an entry, unless one of its documents failed validation."""
+        if self.cache is not None:
+            self.cache.put(key, entry)
+        if _succeeded(entry):
+            self._append(key, entry)
+
+    def _append(self, key: str, entry: dict[str, Any]) -> None:
+        self._journal.seek(0, os.SEEK_END)
+        line = f"{key}\t{json.dumps(entry, separators=(',', ':'))}\n".encode()
+        self._journal.write(self._separator + line)
+        self._journal.flush()
+        self._offsets[key] = self._journal.tell() - len(line)
+        self._separator = b""
+
+    def close(self) -> None:
+        self._journal.close()
+
+
+def _succeeded(entry: dict[str, Any]) -> bool:
+    """Check whether every document of a cache entry passed validation."""
+    return all(not result["errors"] for result in entry["results"])
+
+
+def convert_cached(
+    content: str | IO[str],
+    provider: str,
+    detect_grpc: bool = False,
+    do_validate: bool = True,
+    on_skip: Callable[[str], None] | None = None,
+    selector: Selector | None = None,
+    cache: ConversionCache | MemoryCache | Checkpoint | None = None,
+    regex_paths: bool = False,
+) -> Iterator[ConversionResult]:
+    """Convert multi-document input, reusing cached per-document results.
+
+    YAML input is split into raw documents without parsing; each document
+    the selector may match is hashed and looked up, and only cache misses
+    are parsed, validated and converted. JSON input has to be parsed, but
+    conversion and validation are still skipped on a hit.
+
+    Args:
+        content: A YAML or JSON string, or an open text stream.
+        provider: Gateway provider preset.
+        detect_grpc: Whether to detect and convert gRPC backends to GRPCRoutes.
+        do_validate: Whether to validate each input Ingress.
+        on_skip: Optional callback invoked with the kind of each skipped
+            non-Ingress document.
+        selector: Optional selector documents must match.
+        cache: The cache to use; defaults to the default cache directory.
+        regex_paths: Whether to read ImplementationSpecific paths as
+            ingress-nginx regexes and GCE or ALB wildcards.
+
+    Yields:
+        A ConversionResult for each Ingress in input order, as convert_stream.
+    """
+    cache = cache or ConversionCache()
+    session = ConversionSession(provider, detect_grpc, do_validate, regex_paths=regex_paths)
+
+    for text in _iter_normalized(content, selector, on_skip):
+        key = document_key(text, provider, detect_grpc, do_validate, selector, regex_paths)
+        entry = cache.get(key)
+        if entry is None:
+            skipped: list[str] = []
+            results = list(session.convert_stream(text, selector, skipped.append))
+            cache.put(key, {"results": [r.to_dict() for r in results], "skipped": skipped})
+        else:
+            results = [ConversionResult.from_dict(data) for data in entry["results"]]
+            skipped = entry["skipped"]
+
+        if on_skip is not None:
+            for kind in skipped:
+                on_skip(kind)
+        yield from results
+
+
+def _iter_normalized(
+    content: str | IO[str],
+    selector: Selector | None,
+    on_skip: Callable[[str], None] | None,
+) -> Iterator[str]:
+    """Split input into normalized, self-contained document texts.
+
+    YAML documents are cut without parsing and lose their leading ``---``
+    marker; whitespace is otherwise kept since it is significant in block
+    scalars. JSON documents are parsed and re-serialized compactly.
+    """
+    if not isinstance(content, str) and not content.seekable():
+        content = content.read()
+
+    if serializer.is_json_input(content):
+        for doc in serializer.expand_lists(serializer.load_documents(content)):
+            yield json.dumps(doc, separators=(",", ":"))
+        return
+
+    for raw in select_raw_documents(iter_raw_documents(content), selector, on_skip):
+        yield _MARKER_RE.sub("", raw.replace("\r\n", "\n"), count=1)
@@ -0,0 +1,54 @@
+"""Canonical ordering of generated resources.
+
+The converter emits resources in input order, so reordering Ingresses in the
+input, or their listeners and hosts, changes the output even though the
+resulting configuration is the same. canonicalize() puts the documents and
+their order-insensitive lists into a fixed order; serializing with sorted
+keys then gives byte-identical output for equivalent input, which keeps
+re-generated GitOps trees free of spurious diffs.
+
+Route rules are deliberately left alone: their order can decide which rule
+a request matches when several rules are equally specific.
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+# Documents are ordered by kind first, in the order they are applied
+KIND_ORDER = ["Gateway", "ReferenceGrant", "HTTPRoute", "GRPCRoute", "TCPRoute", "UDPRoute"]
+
+
+def canonicalize(documents: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return documents in canonical order.
+
+    Documents are sorted by kind, namespace and name. Gateway listeners are
+    sorted by name and route hostnames alphabetically. The input documents
+    are not modified.
+
+    Args:
+        documents: Generated Gateway API resources.
+
+    Returns:
+        The canonically ordered documents.
+    """
+    return sorted((_canonical_document(doc) for doc in documents), key=_document_key)
+
+
+def _document_key(document: dict[str, Any]) -> tuple[int, str, str]:
+    kind = document.get("kind", "")
+    rank = KIND_ORDER.index(kind) if kind in KIND_ORDER else len(KIND_ORDER)
+    metadata = document.get("metadata") or {}
+    return rank, metadata.get("namespace") or "", metadata.get("name") or ""
+
+
+def _canonical_document(document: dict[str, Any]) -> dict[str, Any]:
+    spec = document.get("spec")
+    if not isinstance(spec, dict):
+        return document
+
+    spec = dict(spec)
+    if isinstance(spec.get("listeners"), list):
+        spec["listeners"] = sorted(spec["listeners"], key=lambda listener: listener.get("name", ""))
+    if isinstance(spec.get("hostnames"), list):
+        spec["hostnames"] = sorted(spec["hostnames"])
+    return {**document, "spec": spec}
@@ -5,9 +5,13 @@ to Gateway API resources. It supports multiple providers, validation,
 gRPC detection, and migration report generation.
 """
 
+import json
+import os
 import sys
+from collections.abc import Iterable, Iterator
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 import click
 import yaml
@@ -16,30 +20,109 @@ from rich.panel import Panel
 from rich.syntax import Syntax
 from rich.table import Table
 
-from .annotations import get_annotation_warnings, parse_annotations
-from .converter import convert_ingress_to_gateway, parse_ingress, resources_to_yaml
-from .grpc import convert_to_grpc_routes, is_grpc_backend
-from .providers import apply_provider_defaults
+from . import serializer
+from .batch import (
+    INPUT_SUFFIXES,
+    OUTPUT_SUFFIXES,
+    FileResult,
+    convert_parallel,
+    expand_inputs,
+    output_paths,
+    run_batch,
+)
+from .cache import DEFAULT_MAX_SIZE, Checkpoint, ConversionCache, convert_cached
+from .canonical import canonicalize
+from .conflicts import find_path_conflicts
+from .consolidate import GatewayConsolidator
+from .git import changed_files, filter_changed
+from .layout import LAYOUTS, iter_layout, write_layout
+from .pipeline import (
+    ConversionResult,
+    convert_stream,
+    iter_documents,
+    merge_results,
+    skip_failures,
+)
+from .reference_grant import (
+    detect_cross_namespace_refs,
+    generate_reference_grants,
+    group_reference_grants,
+)
 from .report import generate_migration_report
 from .reverse import (
-    gateway_resources_to_ingress_yaml,
+    convert_gateway_to_ingress,
     parse_gateway_resources,
 )
-from .validation import validate_conversion_output, validate_ingress
+from .route_merge import merge_httproutes
+from .route_optimize import optimize_httproute, optimize_httproutes
+from .sink import FLUSH_POLICIES, BundleSink, FileSink, OutputSink
+from .splitter import Selector
+from .store import ResourceStore
+from .validation import ValidationResult, validate_conversion_output, validate_ingress
+from .watch import iter_watch
 
 console = Console()
 
 
+# Parse limits applied by 'serve' unless configured otherwise
+SERVER_LIMITS = serializer.ParseLimits(
+    max_document_size=1024 * 1024,
+    max_documents=1000,
+    max_alias_nodes=10_000,
+    max_depth=100,
+)
+
+
 @click.group()
 @click.version_option(version="0.2.0", prog_name="ingress2gateway")
-def main():
+@click.option(
+    "--max-document-size",
+    type=click.IntRange(min=1),
+    envvar="I2G_MAX_DOCUMENT_SIZE",
+    metavar="BYTES",
+    help="Reject input documents larger than this",
+)
+@click.option(
+    "--max-documents",
+    type=click.IntRange(min=1),
+    envvar="I2G_MAX_DOCUMENTS",
+    metavar="N",
+    help="Reject inputs with more documents than this",
+)
+@click.option(
+    "--max-alias-nodes",
+    type=click.IntRange(min=0),
+    envvar="I2G_MAX_ALIAS_NODES",
+    metavar="N",
+    help="Reject documents whose YAML aliases expand to more nodes than this",
+)
+@click.option(
+    "--max-depth",
+    type=click.IntRange(min=1),
+    envvar="I2G_MAX_DEPTH",
+    metavar="N",
+    help="Reject documents nested deeper than this",
+)
+def main(
+    max_document_size: int | None,
+    max_documents: int | None,
+    max_alias_nodes: int | None,
+    max_depth: int | None,
+):
     """Convert Kubernetes Ingress objects to Gateway API resources."""
-    pass
+    serializer.set_limits(
+        serializer.ParseLimits(max_document_size, max_documents, max_alias_nodes, max_depth)
+    )
 
 
 @main.command()
-@click.argument("input_file", type=click.Path(exists=True))
-@click.option("-o", "--output", type=click.Path(), help="Output file (default: stdout)")
+@click.argument("input_files", nargs=-1, required=True)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(),
+    help="Output file (default: stdout); output directory for multiple inputs",
+)
 @click.option(
     "-p",
     "--provider",
@@ -51,57 +134,444 @@ def main():
 @click.option("--validate/--no-validate", default=True, help="Validate output")
 @click.option("--report", type=click.Path(), help="Generate migration report to file")
 @click.option("-q", "--quiet", is_flag=True, help="Suppress informational output")
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Convert and write one document at a time with bounded memory",
+)
+@click.option(
+    "-f",
+    "--output-format",
+    type=click.Choice(serializer.OUTPUT_FORMATS),
+    default="yaml",
+    help="Output format",
+)
+@click.option(
+    "-n",
+    "--namespace",
+    "namespaces",
+    multiple=True,
+    help="Only convert Ingresses in this namespace (repeatable)",
+)
+@click.option(
+    "--ingress-class",
+    "ingress_classes",
+    multiple=True,
+    help="Only convert Ingresses with this ingress class (repeatable)",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Worker processes for multiple inputs or a large single input (0: one per CPU)",
+)
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=False,
+    help="Reuse cached conversion results of unchanged documents",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    help="Cache directory; implies --cache (default: $XDG_CACHE_HOME/ingress2gateway)",
+)
+@click.option(
+    "--cache-max-size",
+    type=click.IntRange(min=0),
+    default=DEFAULT_MAX_SIZE // (1024 * 1024),
+    help="Cache size limit in MiB; least recently used entries are evicted",
+)
+@click.option(
+    "-w",
+    "--watch",
+    is_flag=True,
+    help="Keep running and re-convert inputs when they change",
+)
+@click.option(
+    "--flush",
+    type=click.Choice(FLUSH_POLICIES),
+    default="auto",
+    help="When to flush output: after every document, when idle, or at the end "
+    "(auto: when idle for pipes and terminals, at the end for files)",
+)
+@click.option(
+    "--canonical",
+    is_flag=True,
+    help="Write resources in canonical order with sorted keys",
+)
+@click.option(
+    "--changed-since",
+    metavar="REF",
+    help="Only convert input files changed since this git revision",
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    help="Write one file per resource into this directory",
+)
+@click.option(
+    "--layout",
+    type=click.Choice(LAYOUTS),
+    help="Directory layout for --output-dir and --bundle (default: flat)",
+)
+@click.option(
+    "--shards",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Spread resources over this many shard directories with --output-dir or --bundle",
+)
+@click.option(
+    "--bundle",
+    type=click.Path(dir_okay=False),
+    help="Write one file per resource, and the report, into a .tar.gz archive",
+)
+@click.option(
+    "-k",
+    "--keep-going",
+    is_flag=True,
+    help="Skip Ingresses that fail validation instead of aborting; exit with status 1 at the end",
+)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False),
+    help="Journal converted documents to this file and resume from it",
+)
+@click.option(
+    "--max-memory",
+    type=click.IntRange(min=1),
+    help="Keep generated resources in an on-disk store using at most this many MiB of cache",
+)
+@click.option(
+    "--consolidate",
+    is_flag=True,
+    help="Merge the listeners of all Ingresses into shared Gateways of at most 64 listeners",
+)
+@click.option(
+    "--minimize-listeners",
+    is_flag=True,
+    help="Fold listeners into shared wildcard or hostname-less listeners; implies --consolidate",
+)
+@click.option(
+    "--merge-routes",
+    is_flag=True,
+    help="Merge HTTPRoutes with the same parents and hostnames, at most 16 rules each",
+)
+@click.option(
+    "--check-conflicts",
+    is_flag=True,
+    help="Fail on routes that send the same host and path to different backends",
+)
+@click.option(
+    "--optimize-routes",
+    is_flag=True,
+    help="Convert regex and '/*' paths, demote them to prefix and exact matches where "
+    "possible, then order and merge rules",
+)
 def convert(
-    input_file: str,
+    input_files: tuple[str, ...],
     output: str | None,
     provider: str,
     grpc: bool,
     validate: bool,
     report: str | None,
     quiet: bool,
+    stream: bool,
+    output_format: str,
+    namespaces: tuple[str, ...],
+    ingress_classes: tuple[str, ...],
+    jobs: int,
+    use_cache: bool,
+    cache_dir: str | None,
+    cache_max_size: int,
+    watch: bool,
+    flush: str,
+    canonical: bool,
+    changed_since: str | None,
+    output_dir: str | None,
+    layout: str | None,
+    shards: int,
+    bundle: str | None,
+    keep_going: bool,
+    checkpoint: str | None,
+    max_memory: int | None,
+    consolidate: bool,
+    minimize_listeners: bool,
+    merge_routes: bool,
+    check_conflicts: bool,
+    optimize_routes: bool,
 ):
-    """Convert Ingress YAML to Gateway API resources."""
+    """Convert Ingress YAML to Gateway API resources.
+
+    INPUT_FILES may be a single file, several files, directories (searched
+    recursively for .yaml, .yml and .json files) or glob patterns.
+    """
+    consolidate = consolidate or minimize_listeners
+    if stream and report:
+        raise click.UsageError("--report cannot be combined with --stream")
+    if stream and canonical:
+        raise click.UsageError(
+            "--canonical needs the complete output and cannot be used with --stream"
+        )
+
+    if (layout or shards) and not (output_dir or bundle):
+        raise click.UsageError("--layout and --shards require --output-dir or --bundle")
+    if output_dir and (output or stream or watch):
+        raise click.UsageError("--output-dir cannot be combined with --output, --stream or --watch")
+    if bundle and (output or output_dir or watch):
+        raise click.UsageError("--bundle cannot be combined with --output, --output-dir or --watch")
+
+    if checkpoint and jobs != 1:
+        raise click.UsageError("--checkpoint cannot be combined with --jobs")
+    if max_memory and stream:
+        raise click.UsageError("--stream already runs in bounded memory; drop --max-memory")
+    if consolidate and stream:
+        raise click.UsageError(
+            "--consolidate needs the Gateways of all Ingresses and cannot be used with --stream"
+        )
+    if merge_routes and (stream or max_memory):
+        raise click.UsageError(
+            "--merge-routes holds all routes in memory and cannot be combined with "
+            "--stream or --max-memory"
+        )
+    if optimize_routes and max_memory:
+        raise click.UsageError("--optimize-routes cannot be combined with --max-memory")
+    if check_conflicts and stream:
+        raise click.UsageError(
+            "--check-conflicts needs the routes of all Ingresses and cannot be used with --stream"
+        )
+
+    # Diagnostics must not end up in documents written to standard output
+    if (stream or quiet) and not (output or output_dir or bundle or watch):
+        console.stderr = True
+        click.get_current_context().call_on_close(lambda: setattr(console, "stderr", False))
+
+    if watch:
+        if (
+            stream
+            or report
+            or use_cache
+            or cache_dir
+            or jobs != 1
+            or changed_since
+            or checkpoint
+            or max_memory
+            or consolidate
+            or merge_routes
+            or check_conflicts
+            or optimize_routes
+        ):
+            raise click.UsageError(
+                "--stream, --report, --cache, --jobs, --changed-since, --checkpoint, "
+                "--max-memory, --consolidate, --merge-routes, --check-conflicts and "
+                "--optimize-routes cannot be combined with --watch"
+            )
+        # With a single input file, --output names the output file as it
+        # does without --watch; otherwise it is the directory outputs go to
+        single = len(input_files) == 1 and Path(input_files[0]).is_file()
+        if output and not single and _is_file_path(output):
+            raise click.UsageError(
+                "--watch with several inputs writes one file per input; "
+                "--output must name a directory"
+            )
+        _watch(
+            list(input_files),
+            None if single else output,
+            quiet,
+            output_file=output if single else None,
+            provider=provider,
+            detect_grpc=grpc,
+            do_validate=validate,
+            output_format=output_format,
+            namespaces=namespaces,
+            ingress_classes=ingress_classes,
+            canonical=canonical,
+        )
+        return
+
+    cache = None
+    if use_cache or cache_dir:
+        cache = ConversionCache(cache_dir, cache_max_size * 1024 * 1024)
+        click.get_current_context().call_on_close(cache.evict)
+
+    changed = _changed_files(changed_since) if changed_since else None
+
+    if len(input_files) > 1 or not Path(input_files[0]).is_file():
+        if stream or report or output_dir or bundle or checkpoint or max_memory:
+            raise click.UsageError(
+                "--stream, --report, --output-dir, --bundle, --checkpoint and --max-memory "
+                "require a single input file"
+            )
+        _convert_batch(
+            list(input_files),
+            output,
+            jobs,
+            quiet,
+            provider=provider,
+            detect_grpc=grpc,
+            do_validate=validate,
+            output_format=output_format,
+            namespaces=namespaces,
+            ingress_classes=ingress_classes,
+            canonical=canonical,
+            cache=cache,
+            changed=changed,
+            consolidate=consolidate,
+            minimize_listeners=minimize_listeners,
+            merge_routes=merge_routes,
+            check_conflicts=check_conflicts,
+            optimize_routes=optimize_routes,
+            keep_going=keep_going,
+        )
+        return
+
+    input_file = input_files[0]
+    if changed is not None and Path(input_file).resolve() not in changed:
+        if not quiet:
+            console.print(f"{input_file} has not changed since {changed_since}")
+        return
+
+    # Non-Ingress and unselected documents are skipped before being parsed
+    selector = Selector(["Ingress"], namespaces, ingress_classes)
+
+    # A checkpoint replays journaled documents and consults the cache for the rest
+    if checkpoint:
+        cache = Checkpoint(checkpoint, cache)
+        click.get_current_context().call_on_close(cache.close)
+    failures: list[ConversionResult] | None = [] if keep_going else None
+
     try:
-        # Read input file
-        input_path = Path(input_file)
-        yaml_content = input_path.read_text()
+        if stream:
+            with (
+                open(input_file) as input_stream,
+                _open_sink(output, flush, bundle) as sink,
+            ):
+                ok = _stream_convert(
+                    input_stream,
+                    sink,
+                    provider,
+                    grpc,
+                    validate,
+                    quiet,
+                    output_format,
+                    selector,
+                    jobs,
+                    cache,
+                    layout or "flat",
+                    shards,
+                    failures,
+                    optimize_routes,
+                )
+                if not ok and (output or bundle):
+                    # Keep the previous output rather than a truncated one
+                    sink.discard()
+            if not ok:
+                sys.exit(1)
+            if (output or bundle) and not quiet:
+                _print_written(bundle or output, sink.written)
+            _exit_on_failures(failures)
+            return
+
+        # With --max-memory, generated routes are spilled to an on-disk store
+        store = ResourceStore(max_memory=max_memory * 1024 * 1024) if max_memory else None
+        if store is not None:
+            click.get_current_context().call_on_close(store.close)
+        consolidator = GatewayConsolidator(minimize=minimize_listeners) if consolidate else None
 
-        # Parse and convert
-        result = _convert_yaml(yaml_content, provider, grpc, validate, quiet)
+        # Parse and convert; the file is memory-mapped and split before parsing,
+        # and with --jobs the documents are converted across worker processes
+        with open(input_file) as input_stream:
+            result = _convert_yaml(
+                input_stream,
+                provider,
+                grpc,
+                validate,
+                quiet,
+                selector,
+                jobs,
+                cache,
+                failures,
+                store,
+                consolidator,
+                merge_routes,
+                check_conflicts,
+                optimize_routes,
+            )
 
         if result is None:
             sys.exit(1)
 
         resources, ingress, warnings, unsupported = result
 
-        # Generate output YAML
-        output_yaml = resources_to_yaml(resources)
-
-        # Add GRPCRoutes if any
-        if resources.get("grpcroutes"):
-            for grpc_route in resources["grpcroutes"]:
-                output_yaml += "---\n" + yaml.dump(
-                    grpc_route, default_flow_style=False, sort_keys=False
+        # Write output; documents are serialized one at a time and written by
+        # a background thread, except for the highlighted console preview
+        gateways = resources.get("gateways") or [resources["gateway"]]
+        # The bundle is meant to be applied as is, and consolidation points
+        # routes and certificates at other namespaces, so both carry the
+        # ReferenceGrants that cross-namespace references need
+        grants: list[dict[str, Any]] = []
+        if bundle or consolidator is not None:
+            if store is not None and consolidator is None:
+                # The store indexes the routes that reference another namespace
+                grants = generate_reference_grants(
+                    gateways, store.iter_documents(cross_namespace=True)
+                )
+            else:
+                grants = generate_reference_grants(
+                    gateways, resources["httproutes"], resources["grpcroutes"]
                 )
+        documents: Iterable[dict[str, Any]]
+        if canonical and store is not None:
+            # The store sorts the routes; the Gateways and grants rank before them
+            routes = store.iter_documents(canonical=True)
+            if consolidator is not None:
+                routes = map(consolidator.rewrite, routes)
+            documents = chain(canonicalize([*gateways, *grants]), routes)
+        else:
+            documents = chain(gateways, grants, resources["httproutes"], resources["grpcroutes"])
+            if canonical:
+                documents = canonicalize(documents)
+        report_content = (
+            generate_migration_report(ingress, resources, warnings, unsupported) if report else None
+        )
 
-        # Write output
-        if output:
-            Path(output).write_text(output_yaml)
+        if bundle:
+            with BundleSink(bundle) as sink:
+                sink.add_all(
+                    iter_layout(documents, layout or "flat", output_format, shards, canonical)
+                )
+                if report and report_content is not None:
+                    sink.add(Path(report).name, report_content)
             if not quiet:
-                console.print(f"[green]✓[/green] Output written to {output}")
-        else:
+                _print_written(bundle, sink.written)
+        elif output_dir:
+            files = iter_layout(documents, layout or "flat", output_format, shards, canonical)
+            written, unchanged = write_layout(files, output_dir)
             if not quiet:
-                console.print(Panel(Syntax(output_yaml, "yaml", theme="monokai"), title="Output"))
-            else:
-                click.echo(output_yaml)
+                console.print(
+                    f"[green]✓[/green] {written + unchanged} files in {output_dir} "
+                    f"({written} written, {unchanged} unchanged)"
+                )
+        elif output or quiet:
+            with _open_sink(output, flush) as sink:
+                sink.write_all(serializer.iter_serialized(documents, output_format, canonical))
+            if output and not quiet:
+                _print_written(output, sink.written)
+        else:
+            output_text = serializer.dump_documents(documents, output_format, canonical)
+            console.print(
+                Panel(Syntax(output_text, _lexer(output_format), theme="monokai"), title="Output")
+            )
 
         # Generate report if requested
-        if report:
-            report_content = generate_migration_report(ingress, resources, warnings, unsupported)
+        if report and report_content is not None:
             Path(report).write_text(report_content)
             if not quiet:
                 console.print(f"[green]✓[/green] Migration report written to {report}")
 
+        _exit_on_failures(failures)
+
     except Exception as e:
         console.print(f"[red]Error:[/red] {e}")
         sys.exit(1)
@@ -111,33 +581,63 @@ def convert(
 @click.argument("input_file", type=click.Path(exists=True))
 @click.option("-o", "--output", type=click.Path(), help="Output file (default: stdout)")
 @click.option("-q", "--quiet", is_flag=True, help="Suppress informational output")
-def reverse(input_file: str, output: str | None, quiet: bool):
+@click.option(
+    "-f",
+    "--output-format",
+    type=click.Choice(serializer.OUTPUT_FORMATS),
+    default="yaml",
+    help="Output format",
+)
+@click.option(
+    "--kind",
+    "kinds",
+    multiple=True,
+    help="Only read resources of this kind (repeatable; default: Gateway, HTTPRoute, GRPCRoute)",
+)
+@click.option(
+    "-n",
+    "--namespace",
+    "namespaces",
+    multiple=True,
+    help="Only read resources in this namespace (repeatable)",
+)
+def reverse(
+    input_file: str,
+    output: str | None,
+    quiet: bool,
+    output_format: str,
+    kinds: tuple[str, ...],
+    namespaces: tuple[str, ...],
+):
     """Convert Gateway API resources back to Ingress (reverse conversion)."""
     try:
-        # Read input file
-        input_path = Path(input_file)
-        yaml_content = input_path.read_text()
-
-        # Parse Gateway resources
-        gateway, httproutes = parse_gateway_resources(yaml_content)
+        # Parse Gateway resources, skipping unselected documents before parsing
+        selector = Selector(kinds or ["Gateway", "HTTPRoute", "GRPCRoute"], namespaces)
+        with open(input_file) as input_stream:
+            gateway, httproutes = parse_gateway_resources(input_stream, selector)
 
         if not gateway:
             console.print("[red]Error:[/red] No Gateway resource found in input")
             sys.exit(1)
 
         # Convert to Ingress
-        output_yaml = gateway_resources_to_ingress_yaml(gateway, httproutes)
+        ingress = convert_gateway_to_ingress(gateway, httproutes)
+        output_text = serializer.dump_documents([ingress], output_format)
 
         # Write output
         if output:
-            Path(output).write_text(output_yaml)
+            Path(output).write_text(output_text)
             if not quiet:
                 console.print(f"[green]✓[/green] Output written to {output}")
         else:
             if not quiet:
-                console.print(Panel(Syntax(output_yaml, "yaml", theme="monokai"), title="Ingress"))
+                console.print(
+                    Panel(
+                        Syntax(output_text, _lexer(output_format), theme="monokai"), title="Ingress"
+                    )
+                )
             else:
-                click.echo(output_yaml)
+                click.echo(output_text)
 
     except Exception as e:
         console.print(f"[red]Error:[/red] {e}")
@@ -145,37 +645,100 @@ def reverse(input_file: str, output: str | None, quiet: bool):
 
 
 @main.command()
-@click.argument("input_file", type=click.Path(exists=True))
-def validate_cmd(input_file: str):
-    """Validate an Ingress YAML file."""
+@click.argument("input_files", nargs=-1, required=True)
+@click.option(
+    "--changed-since",
+    metavar="REF",
+    help="Only validate input files changed since this git revision",
+)
+def validate_cmd(input_files: tuple[str, ...], changed_since: str | None):
+    """Validate Ingress YAML files.
+
+    INPUT_FILES may be files, directories (searched recursively for .yaml,
+    .yml and .json files) or glob patterns. Every Ingress in every file is
+    validated.
+    """
     try:
-        input_path = Path(input_file)
-        yaml_content = input_path.read_text()
+        files = expand_inputs(list(input_files))
+    except FileNotFoundError as e:
+        raise click.UsageError(str(e))
 
-        ingress = parse_ingress(yaml_content)
-        result = validate_ingress(ingress)
+    if changed_since:
+        files = filter_changed(files, _changed_files(changed_since))
+        if not files:
+            console.print(f"No input files have changed since {changed_since}")
+            return
 
-        if result.is_valid:
-            console.print("[green]✓[/green] Ingress is valid")
-        else:
-            console.print("[red]✗[/red] Validation failed")
+    valid = True
+    for input_path in files:
+        try:
+            with open(input_path) as input_stream:
+                ingresses = list(iter_documents(input_stream, Selector(["Ingress"])))
+        except Exception as e:
+            label = f"{input_path}: " if len(files) > 1 else ""
+            console.print(f"[red]Error:[/red] {label}{e}")
+            valid = False
+            continue
 
-        if result.errors:
-            console.print("\n[red]Errors:[/red]")
-            for error in result.errors:
-                console.print(f"  • {error.path}: {error.message}")
+        if not ingresses:
+            if len(files) == 1:
+                console.print("[red]✗[/red] No Ingress resources found")
+                valid = False
+            else:
+                console.print(f"[dim]- {input_path}: no Ingress resources[/dim]")
+            continue
 
-        if result.warnings:
-            console.print("\n[yellow]Warnings:[/yellow]")
-            for warning in result.warnings:
-                console.print(f"  • {warning.path}: {warning.message}")
+        for ingress in ingresses:
+            label = ""
+            if len(files) > 1 or len(ingresses) > 1:
+                name = ingress.get("metadata", {}).get("name", "")
+                label = f"{input_path} ({name})" if len(ingresses) > 1 else str(input_path)
+            valid &= _print_validation(validate_ingress(ingress), label)
+
+    sys.exit(0 if valid else 1)
 
-        sys.exit(0 if result.is_valid else 1)
 
+@main.command()
+@click.argument("input_files", nargs=-1, required=True)
+@click.option("-q", "--quiet", is_flag=True, help="Only report conflicts")
+@click.option(
+    "-n",
+    "--namespace",
+    "namespaces",
+    multiple=True,
+    help="Only read HTTPRoutes in this namespace (repeatable)",
+)
+def conflicts(input_files: tuple[str, ...], quiet: bool, namespaces: tuple[str, ...]):
+    """Check Gateway API HTTPRoutes for conflicting paths.
+
+    INPUT_FILES may be files, directories (searched recursively for .yaml,
+    .yml and .json files) or glob patterns. The HTTPRoutes of all files are
+    checked together, per hostname.
+    """
+    try:
+        files = expand_inputs(list(input_files), include_outputs=True)
+    except FileNotFoundError as e:
+        raise click.UsageError(str(e))
+
+    selector = Selector(["HTTPRoute"], namespaces)
+    routes: list[dict[str, Any]] = []
+    try:
+        for input_path in files:
+            with open(input_path) as input_stream:
+                routes.extend(iter_documents(input_stream, selector))
     except Exception as e:
         console.print(f"[red]Error:[/red] {e}")
         sys.exit(1)
 
+    if not routes:
+        console.print("[red]✗[/red] No HTTPRoute resources found")
+        sys.exit(1)
+
+    result = find_path_conflicts(routes)
+    if result.is_valid and not quiet:
+        console.print(f"[green]✓[/green] No path conflicts in {len(routes)} HTTPRoute(s)")
+    sys.exit(0 if _print_conflicts(result, quiet) else 1)
+
 
 @main.command()
 def providers():
@@ -206,9 +769,19 @@ def providers():
 @click.option("--port", default=8000, help="Port to bind to")
 @click.option("--reload", is_flag=True, help="Enable auto-reload")
 def serve(host: str, port: int, reload: bool):
-    """Start the web UI server."""
+    """Start the web UI server.
+
+    Uploaded input is parsed with limits: the --max-* options given before
+    the command, or their I2G_* environment variables, default to 1 MiB per
+    document, 1000 documents, 10000 alias nodes and a depth of 100.
+    """
     import uvicorn
 
+    limits = serializer.get_limits().with_defaults(SERVER_LIMITS)
+    serializer.set_limits(limits)
+    # The app may be imported in a reloader subprocess, which reads them back
+    os.environ.update(limits.to_env())
+
     console.print(f"[green]Starting server at http://{host}:{port}[/green]")
     uvicorn.run(
         "ingress2gateway.main:app",
@@ -218,12 +791,274 @@ def serve(host: str, port: int, reload: bool):
     )
 
 
+def _convert_batch(
+    patterns: list[str],
+    output_dir: str | None,
+    jobs: int,
+    quiet: bool,
+    changed: set[Path] | None = None,
+    **options: Any,
+) -> None:
+    """Convert many input files and print an aggregated summary.
+
+    Files are fanned out across a process pool when jobs is not 1. Each
+    output is written next to its input, or into a mirrored tree below
+    output_dir. Exits with status 1 if any file failed, or if keep_going
+    skipped any Ingress.
+
+    Args:
+        patterns: Input files, directories or glob patterns.
+        output_dir: Optional directory to mirror outputs into.
+        jobs: Number of worker processes (0: one per CPU).
+        quiet: Whether to suppress informational console output.
+        changed: If given, only files in this set of resolved paths are
+            converted.
+        **options: Conversion options passed to the batch workers.
+    """
+    try:
+        files = expand_inputs(patterns, output_dir)
+    except FileNotFoundError as e:
+        raise click.UsageError(str(e))
+
+    # Outputs are placed relative to all inputs, so they do not move depending
+    # on which files changed
+    outputs = output_paths(files, output_dir, options["output_format"])
+    if changed is not None:
+        selected = [(f, o) for f, o in zip(files, outputs) if f.resolve() in changed]
+        if not selected:
+            if not quiet:
+                console.print("No input files have changed")
+            return
+        files = [f for f, _ in selected]
+        outputs = [o for _, o in selected]
+    counts = {"converted": 0, "skipped": 0, "failed": 0, "unchanged": 0}
+    failures = []
+    # Files converted without the Ingresses skipped by --keep-going
+    partial = []
+
+    for result in run_batch(files, outputs, jobs, **options):
+        counts[result.status] += 1
+        if result.status == "failed":
+            failures.append(result)
+        elif result.status == "converted":
+            counts["unchanged"] += result.unchanged
+            if result.failures:
+                partial.append(result)
+            if not quiet:
+                _print_converted(result)
+
+    if failures:
+        table = Table(title="Failed Files")
+        table.add_column("File", style="cyan")
+        table.add_column("Error", style="red")
+        for result in failures:
+            table.add_row(result.input_path, result.message)
+        console.print(table)
+
+    if partial:
+        table = Table(title="Skipped Ingresses")
+        table.add_column("File", style="cyan")
+        table.add_column("Ingress", style="red")
+        for result in partial:
+            for failure in result.failures:
+                table.add_row(result.input_path, failure)
+        console.print(table)
+
+    if not quiet or failures:
+        console.print(
+            f"{len(files)} files: [green]{counts['converted']} converted[/green] "
+            f"({counts['converted'] - counts['unchanged']} written, "
+            f"{counts['unchanged']} unchanged), "
+            f"{counts['skipped']} skipped (no Ingress), "
+            f"[red]{counts['failed']} failed[/red]"
+        )
+
+    if failures or partial:
+        sys.exit(1)
+
+
+def _watch(patterns: list[str], output_dir: str | None, quiet: bool, **options: Any) -> None:
+    """Convert input files and keep re-converting them as they change.
+
+    Runs until interrupted. Each input is converted in-process and keeps a
+    per-document cache, so only edited documents are converted again.
+
+    Args:
+        patterns: Input files, directories or glob patterns.
+        output_dir: Optional directory to mirror outputs into.
+        quiet: Whether to suppress informational console output.
+        **options: Conversion options passed to iter_watch.
+    """
+    if not quiet:
+        console.print(f"[cyan]Watching {', '.join(patterns)} (press Ctrl+C to stop)[/cyan]")
+
+    try:
+        for results in iter_watch(patterns, output_dir, **options):
+            for result in results:
+                if result.status == "failed":
+                    console.print(f"[red]✗[/red] {result.input_path}: {result.message}")
+                elif quiet:
+                    continue
+                elif result.status == "converted":
+                    _print_converted(result)
+                elif result.status == "removed":
+                    console.print(f"[yellow]Removed {result.input_path}[/yellow]")
+    except KeyboardInterrupt:
+        pass
+
+
+def _is_file_path(path: str) -> bool:
+    """Check whether a path is an existing file or has an input or output suffix."""
+    suffixes = {*INPUT_SUFFIXES, *OUTPUT_SUFFIXES.values()}
+    return Path(path).is_file() or Path(path).suffix.lower() in suffixes
+
+
+def _changed_files(ref: str) -> set[Path]:
+    """Look up the files changed since a git revision, as a usage error if impossible."""
+    try:
+        return changed_files(ref)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+
+def _print_validation(result: ValidationResult, label: str = "") -> bool:
+    """Print the validation result of one Ingress and return whether it is valid."""
+    prefix = f"{label}: " if label else ""
+    if result.is_valid:
+        console.print(f"[green]✓[/green] {prefix}Ingress is valid")
+    else:
+        console.print(f"[red]✗[/red] {prefix}Validation failed")
+
+    if result.errors:
+        console.print("\n[red]Errors:[/red]")
+        for error in result.errors:
+            console.print(f"  • {error.path}: {error.message}")
+
+    if result.warnings:
+        console.print("\n[yellow]Warnings:[/yellow]")
+        for warning in result.warnings:
+            console.print(f"  • {warning.path}: {warning.message}")
+
+    return result.is_valid
+
+
+def _print_conflicts(result: ValidationResult, quiet: bool = False) -> bool:
+    """Print path conflicts and shadowed matches and return whether there are no conflicts."""
+    if result.errors:
+        _print_errors("Path conflicts", result.errors)
+    if result.warnings and not quiet:
+        console.print("[yellow]Shadowed paths:[/yellow]")
+        for warning in result.warnings:
+            console.print(f"  • {warning.path}: {warning.message}")
+    return result.is_valid
+
+
+def _print_converted(result: FileResult) -> None:
+    """Report a converted file and whether its output was rewritten."""
+    notes = [result.message] if result.message else []
+    if result.unchanged:
+        notes.append("unchanged")
+    note = f" ({', '.join(notes)})" if notes else ""
+    console.print(f"[green]✓[/green] {result.input_path} → {result.output_path}{note}")
+
+
+def _print_failures(failures: list[ConversionResult]) -> None:
+    """Report the Ingresses skipped by --keep-going."""
+    console.print(f"[red]✗[/red] {len(failures)} Ingress(es) failed validation and were skipped:")
+    for result in failures:
+        _print_errors(result.name, result.errors)
+
+
+def _exit_on_failures(failures: list[ConversionResult] | None) -> None:
+    """Exit with status 1 after reporting Ingresses skipped by --keep-going."""
+    if failures:
+        _print_failures(failures)
+        sys.exit(1)
+
+
+def _open_sink(output: str | None, flush: str, bundle: str | None = None) -> OutputSink:
+    """Open a sink for a bundle, an output file or standard output."""
+    if bundle:
+        return BundleSink(bundle)
+    if output:
+        return FileSink(output, flush)
+    return OutputSink(sys.stdout, flush)
+
+
+def _print_written(output: str, written: bool) -> None:
+    """Report a single output file, which is not rewritten if unchanged."""
+    if written:
+        console.print(f"[green]✓[/green] Output written to {output}")
+    else:
+        console.print(f"[green]✓[/green] Output unchanged: {output}")
+
+
+def _lexer(output_format: str) -> str:
+    """Return the syntax highlighting lexer for an output format."""
+    return "yaml" if output_format == "yaml" else "json"
+
+
+def _print_skip(kind: str) -> None:
+    """Report a skipped non-Ingress document."""
+    console.print(f"[yellow]Skipping non-Ingress resource: {kind}[/yellow]")
+
+
+def _print_errors(title: str, errors: list[Any]) -> None:
+    """Print a list of validation errors under a heading."""
+    console.print(f"[red]{title}:[/red]")
+    for error in errors:
+        console.print(f"  • {error.path}: {error.message}")
+
+
+def _iter_results(
+    content: str | IO[str],
+    provider: str,
+    detect_grpc: bool,
+    do_validate: bool,
+    quiet: bool,
+    selector: Selector | None,
+    jobs: int,
+    cache: ConversionCache | Checkpoint | None,
+    regex_paths: bool = False,
+) -> Iterator[ConversionResult]:
+    """Convert input in-process, or split across worker processes if jobs != 1."""
+    on_skip = None if quiet else _print_skip
+    if jobs != 1:
+        return convert_parallel(
+            content,
+            provider,
+            detect_grpc,
+            do_validate,
+            on_skip,
+            selector,
+            jobs,
+            cache=cache,
+            regex_paths=regex_paths,
+        )
+    if cache is not None:
+        return convert_cached(
+            content, provider, detect_grpc, do_validate, on_skip, selector, cache, regex_paths
+        )
+    return convert_stream(
+        content, provider, detect_grpc, do_validate, on_skip, selector, regex_paths
+    )
+
+
 def _convert_yaml(
-    yaml_content: str,
+    yaml_content: str | IO[str],
     provider: str,
     detect_grpc: bool,
     do_validate: bool,
     quiet: bool,
+    selector: Selector | None = None,
+    jobs: int = 1,
+    cache: ConversionCache | Checkpoint | None = None,
+    failures: list[ConversionResult] | None = None,
+    store: ResourceStore | None = None,
+    consolidator: GatewayConsolidator | None = None,
+    merge_routes: bool = False,
+    check_conflicts: bool = False,
+    optimize_routes: bool = False,
 ) -> tuple[dict[str, Any], dict[str, Any], list[str], list[dict[str, str]]] | None:
     """Convert YAML content and return Gateway API resources.
 
@@ -231,86 +1066,100 @@ def _convert_yaml(
     validates input/output, parses annotations, and applies provider defaults.
 
     Args:
-        yaml_content: Raw YAML string containing one or more Ingress resources.
+        yaml_content: Raw YAML or JSON string, or an open file, containing one
+            or more Ingress resources.
         provider: Gateway provider preset (e.g., 'istio', 'nginx', 'envoy').
         detect_grpc: Whether to detect and convert gRPC backends to GRPCRoutes.
         do_validate: Whether to validate input and output resources.
         quiet: Whether to suppress informational console output.
+        selector: Optional selector pushed down to the document splitter.
+        jobs: Worker processes to split the input across (0: one per CPU).
+        cache: Optional cache of per-document conversion results.
+        failures: If given, Ingresses that fail validation are skipped and
+            collected into this list instead of failing the conversion.
+        store: Optional on-disk store the merged routes are spilled into.
+        consolidator: Optional consolidator that merges the Gateways of all
+            Ingresses instead of keeping only the first.
+        merge_routes: Whether to merge HTTPRoutes with the same parents and
+            hostnames.
+        check_conflicts: Whether to fail on HTTPRoute matches that conflict
+            with others for the same host and path.
+        optimize_routes: Whether to read ImplementationSpecific paths as
+            ingress-nginx regexes and GCE or ALB wildcards, then demote regex
+            matches and order and merge the rules of each HTTPRoute.
 
     Returns:
         A tuple of (resources, ingress, warnings, unsupported) on success,
         or None if conversion fails. Resources contains 'gateway', 'httproutes',
-        and 'grpcroutes' keys.
+        and 'grpcroutes' keys, and 'gateways' when consolidating.
     """
-    # Handle multi-document YAML
+    results = _iter_results(
+        yaml_content,
+        provider,
+        detect_grpc,
+        do_validate,
+        quiet,
+        selector,
+        jobs,
+        cache,
+        optimize_routes,
+    )
+    if failures is not None:
+        results = skip_failures(results, do_validate, failures)
     try:
-        documents = list(yaml.safe_load_all(yaml_content))
-    except yaml.YAMLError as e:
-        console.print(f"[red]Error parsing YAML:[/red] {e}")
+        merged = merge_results(results, store, consolidator)
+    except (yaml.YAMLError, json.JSONDecodeError, serializer.LimitExceeded) as e:
+        console.print(f"[red]Error parsing input:[/red] {e}")
         return None
 
-    all_resources: dict[str, Any] = {"gateway": None, "httproutes": [], "grpcroutes": []}
-    all_warnings: list[str] = []
-    all_unsupported: list[dict[str, str]] = []
-    first_ingress = None
+    if merged is None:
+        if failures:
+            _print_failures(failures)
+        else:
+            console.print("[red]Error:[/red] No Ingress resources found in input")
+        return None
 
-    for doc in documents:
-        if not doc:
-            continue
+    if not merged.is_valid:
+        _print_errors("Input validation failed", merged.errors)
+        return None
 
-        kind = doc.get("kind", "")
-        if kind != "Ingress":
-            if not quiet:
-                console.print(f"[yellow]Skipping non-Ingress resource: {kind}[/yellow]")
-            continue
+    all_resources = merged.resources
+    all_warnings = merged.warnings
 
-        if first_ingress is None:
-            first_ingress = doc
-
-        # Validate input
-        if do_validate:
-            validation = validate_ingress(doc)
-            if not validation.is_valid:
-                console.print("[red]Input validation failed:[/red]")
-                for error in validation.errors:
-                    console.print(f"  • {error.path}: {error.message}")
-                return None
-
-        # Parse annotations
-        annotations = doc.get("metadata", {}).get("annotations", {})
-        parsed_annotations = parse_annotations(annotations)
-        all_warnings.extend(get_annotation_warnings(parsed_annotations))
-        all_unsupported.extend(parsed_annotations.get("unsupported", []))
-
-        # Convert
-        resources = convert_ingress_to_gateway(doc)
-
-        # Apply provider defaults
-        resources["gateway"] = apply_provider_defaults(resources["gateway"], provider)
-
-        # Handle gRPC detection
-        if detect_grpc and is_grpc_backend(annotations):
-            http_routes, grpc_routes = convert_to_grpc_routes(resources["httproutes"], annotations)
-            resources["httproutes"] = http_routes
-            resources["grpcroutes"] = grpc_routes
-
-        # Merge resources
-        if all_resources["gateway"] is None:
-            all_resources["gateway"] = resources["gateway"]
-        all_resources["httproutes"].extend(resources["httproutes"])
-        all_resources["grpcroutes"].extend(resources.get("grpcroutes", []))
-
-    if first_ingress is None:
-        console.print("[red]Error:[/red] No Ingress resources found in input")
+    if consolidator is not None and not quiet:
+        gateways = all_resources["gateways"]
+        listeners = sum(len(gateway["spec"]["listeners"]) for gateway in gateways)
+        console.print(
+            f"Consolidated {consolidator.listeners_added} listeners into {listeners} "
+            f"on {len(gateways)} Gateway(s), saving {consolidator.listeners_added - listeners}"
+        )
+
+    if merge_routes:
+        count = len(all_resources["httproutes"])
+        all_resources["httproutes"] = merge_httproutes(all_resources["httproutes"])
+        if not quiet:
+            console.print(f"Merged {count} HTTPRoutes into {len(all_resources['httproutes'])}")
+
+    if optimize_routes:
+        routes = all_resources["httproutes"]
+        count = sum(len(route["spec"].get("rules") or []) for route in routes)
+        all_resources["httproutes"] = optimize_httproutes(routes)
+        if not quiet:
+            optimized = sum(
+                len(route["spec"].get("rules") or []) for route in all_resources["httproutes"]
+            )
+            console.print(f"Optimized {count} HTTPRoute rules into {optimized}")
+
+    if check_conflicts and not _print_conflicts(
+        find_path_conflicts(all_resources["httproutes"]), quiet
+    ):
         return None
 
     # Validate output
     if do_validate:
         output_validation = validate_conversion_output(all_resources)
         if not output_validation.is_valid:
-            console.print("[red]Output validation failed:[/red]")
-            for error in output_validation.errors:
-                console.print(f"  • {error.path}: {error.message}")
+            _print_errors("Output validation failed", output_validation.errors)
             return None
 
         if output_validation.warnings and not quiet:
@@ -324,7 +1173,136 @@ def _convert_yaml(
         for warning in all_warnings:
             console.print(f"  • {warning}")
 
-    return all_resources, first_ingress, all_warnings, all_unsupported
+    return all_resources, merged.ingress, all_warnings, merged.unsupported
+
+
+def _stream_convert(
+    input_stream: IO[str],
+    sink: OutputSink,
+    provider: str,
+    detect_grpc: bool,
+    do_validate: bool,
+    quiet: bool,
+    output_format: str = "yaml",
+    selector: Selector | None = None,
+    jobs: int = 1,
+    cache: ConversionCache | Checkpoint | None = None,
+    layout: str = "flat",
+    shards: int = 0,
+    failures: list[ConversionResult] | None = None,
+    optimize_routes: bool = False,
+) -> bool:
+    """Convert and write Ingress documents one at a time.
+
+    Each Ingress is parsed, validated, converted and written before the next
+    one is read, so memory stays bounded by the largest single document and
+    output starts as soon as the first Ingress has been converted; how soon
+    it reaches the reader depends on the sink's flush policy. Output is
+    validated per Ingress instead of once over the combined resources.
+
+    Args:
+        input_stream: Open text stream containing one or more Ingress resources.
+        sink: Output sink the generated documents are written to.
+        provider: Gateway provider preset (e.g., 'istio', 'nginx', 'envoy').
+        detect_grpc: Whether to detect and convert gRPC backends to GRPCRoutes.
+        do_validate: Whether to validate input and output resources.
+        quiet: Whether to suppress informational console output.
+        output_format: Output format ('yaml', 'json' or 'ndjson').
+        selector: Optional selector pushed down to the document splitter.
+        jobs: Worker processes to split the input across (0: one per CPU).
+        cache: Optional cache of per-document conversion results.
+        layout: File layout used when the sink is a BundleSink.
+        shards: Number of shard directories used when the sink is a BundleSink.
+        failures: If given, Ingresses that fail validation are skipped and
+            collected into this list instead of stopping the conversion.
+        optimize_routes: Whether to read ImplementationSpecific paths as
+            ingress-nginx regexes and GCE or ALB wildcards, then demote regex
+            matches and order and merge the rules of each HTTPRoute.
+
+    Returns:
+        True on success, False if conversion failed. Documents converted
+        before a failure have already been written.
+    """
+    failed = False
+    gateway_written = False
+
+    def documents() -> Iterator[dict[str, Any]]:
+        nonlocal failed, gateway_written
+
+        results = _iter_results(
+            input_stream,
+            provider,
+            detect_grpc,
+            do_validate,
+            quiet,
+            selector,
+            jobs,
+            cache,
+            optimize_routes,
+        )
+        if failures is not None:
+            results = skip_failures(results, do_validate, failures)
+        for result in results:
+            if not result.is_valid:
+                _print_errors("Input validation failed", result.errors)
+                failed = True
+                return
+
+            resources = result.resources
+            if do_validate and failures is None:
+                output_validation = validate_conversion_output(resources)
+                if not output_validation.is_valid:
+                    _print_errors("Output validation failed", output_validation.errors)
+                    failed = True
+                    return
+
+            if not quiet:
+                for warning in result.warnings:
+                    console.print(f"[yellow]Annotation warning:[/yellow] {warning}")
+
+            # Only the first Gateway is kept, as in the combined output mode
+            if not gateway_written:
+                gateway_written = True
+                yield resources["gateway"]
+            if optimize_routes:
+                yield from map(optimize_httproute, resources["httproutes"])
+            else:
+                yield from resources["httproutes"]
+            yield from resources["grpcroutes"]
+
+    # Distinct cross-namespace references of the written documents, for the
+    # ReferenceGrants that follow them in a bundle
+    refs: dict[tuple[str, ...], dict[str, str]] = {}
+
+    def with_grants(documents: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        for document in documents:
+            if document.get("kind") == "Gateway":
+                found = detect_cross_namespace_refs(document, [])
+            else:
+                found = detect_cross_namespace_refs([], [document])
+            for ref in found:
+                refs.setdefault(tuple(ref.values()), ref)
+            yield document
+        if not failed:
+            yield from group_reference_grants(refs.values())
+
+    try:
+        if isinstance(sink, BundleSink):
+            sink.add_all(iter_layout(with_grants(documents()), layout, output_format, shards))
+        else:
+            sink.write_all(serializer.iter_serialized(documents(), output_format))
+    except (yaml.YAMLError, json.JSONDecodeError, serializer.LimitExceeded) as e:
+        console.print(f"[red]Error parsing input:[/red] {e}")
+        return False
+
+    if failed:
+        return False
+
+    if not gateway_written and not failures:
+        console.print("[red]Error:[/red] No Ingress resources found in input")
+        return False
+
+    return True
 
 
 if __name__ == "__main__":
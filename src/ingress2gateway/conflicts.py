@@ -0,0 +1,172 @@
+"""Path conflict detection for HTTPRoutes.
+
+Ingresses in different namespaces often claim the same host and path. That
+goes unnoticed while each Ingress has a load balancer of its own, but once
+their routes share a Gateway, the Gateway API's precedence rules silently
+decide which backend serves the traffic. find_path_conflicts() inserts every
+PathPrefix and Exact match into a trie of path segments per hostname, so
+identical and nested matches meet in the same branch and are found in one
+pass over all paths instead of by comparing routes pairwise.
+
+Matches are compared per hostname regardless of parentRefs, since the hosts
+of a fleet end up behind the same Gateways. Routes without hostnames are
+only compared with each other, and RegularExpression matches are not
+analysed.
+"""
+
+import json
+from collections.abc import Iterable
+from typing import Any
+
+from .validation import ValidationResult
+
+# Trie key of a PathPrefix match without other conditions
+_PREFIX = ("PathPrefix", "", "{}")
+
+
+class _Claim:
+    """One match of a route rule, inserted into the trie of one hostname."""
+
+    __slots__ = ("rank", "namespace", "path", "rule", "action")
+
+    def __init__(self, rank: tuple, namespace: str, path: str, rule: tuple[int, int], action: str):
+        self.rank = rank
+        self.namespace = namespace
+        self.path = path
+        self.rule = rule
+        self.action = action
+
+
+class _Node:
+    """A path segment, with the matches ending at it."""
+
+    __slots__ = ("children", "claims")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        # Keyed by (path type, Exact value, other match conditions)
+        self.claims: dict[tuple[str, str, str], list[_Claim]] = {}
+
+
+def find_path_conflicts(routes: Iterable[dict[str, Any]]) -> ValidationResult:
+    """Find conflicting, duplicate and unreachable path matches of HTTPRoutes.
+
+    Of several identical matches for a hostname, the Gateway API gives
+    precedence to the oldest route, then to the first route by
+    '<namespace>/<name>', then to the first rule. The others never match:
+
+    - An error is reported for each of them whose rule sends traffic
+      elsewhere (other backendRefs or filters).
+    - A warning is reported for each of them whose rule does the same.
+    - A warning is reported for each rule none of whose matches is ever used.
+
+    A warning is also reported where a more specific match takes part of a
+    PathPrefix match of another namespace, such as '/api/v1' of one team
+    under '/api' of another.
+
+    Args:
+        routes: Routes to check; documents of other kinds are ignored.
+
+    Returns:
+        ValidationResult whose paths name the route as '<namespace>/<name>'
+        followed by the rule or match, e.g. 'shop/web.spec.rules[0].matches[1]'.
+    """
+    result = ValidationResult()
+    tries: dict[str, _Node] = {}
+    # Matches inserted and matches shadowed per rule, and rules with regex matches
+    inserted: dict[tuple[int, int], int] = {}
+    shadowed: dict[tuple[int, int], int] = {}
+    partial: set[tuple[int, int]] = set()
+    labels: dict[tuple[int, int], str] = {}
+
+    for index, route in enumerate(routes):
+        if route.get("kind") != "HTTPRoute":
+            continue
+        metadata = route.get("metadata") or {}
+        spec = route.get("spec") or {}
+        namespace = metadata.get("namespace", "default")
+        name = f"{namespace}/{metadata.get('name', '')}"
+        created = metadata.get("creationTimestamp") or ""
+        hostnames = dict.fromkeys(spec.get("hostnames") or [""])
+
+        for i, rule in enumerate(spec.get("rules") or []):
+            rule_id = (index, i)
+            labels[rule_id] = f"{name}.spec.rules[{i}]"
+            action = _dump({k: v for k, v in rule.items() if k != "matches"})
+            # A rule without matches matches every path
+            for j, match in enumerate(rule.get("matches") or [{}]):
+                path = match.get("path") or {}
+                path_type = path.get("type", "PathPrefix")
+                if path_type not in ("PathPrefix", "Exact"):
+                    partial.add(rule_id)
+                    continue
+                value = path.get("value", "/")
+                conditions = _dump({k: v for k, v in match.items() if k != "path"})
+                key = (path_type, value if path_type == "Exact" else "", conditions)
+                claim = _Claim(
+                    (not created, created, name, index, i, j),
+                    namespace,
+                    f"{labels[rule_id]}.matches[{j}]",
+                    rule_id,
+                    action,
+                )
+                for hostname in hostnames:
+                    node = tries.get(hostname)
+                    if node is None:
+                        node = tries[hostname] = _Node()
+                    # PathPrefix matching ignores empty segments and trailing slashes
+                    for segment in value.split("/"):
+                        if segment:
+                            child = node.children.get(segment)
+                            if child is None:
+                                child = node.children[segment] = _Node()
+                            node = child
+                    node.claims.setdefault(key, []).append(claim)
+                    inserted[rule_id] = inserted.get(rule_id, 0) + 1
+
+    for hostname, root in tries.items():
+        host = hostname or "any host"
+        # Each entry holds a node and the PathPrefix match covering it from above
+        stack: list[tuple[_Node, _Claim | None]] = [(root, None)]
+        while stack:
+            node, cover = stack.pop()
+            winners = {}
+            for key, claims in node.claims.items():
+                winner = winners[key] = min(claims, key=lambda claim: claim.rank)
+                for claim in claims:
+                    if claim is winner:
+                        continue
+                    shadowed[claim.rule] = shadowed.get(claim.rule, 0) + 1
+                    match = f"{key[0]} match on {host}"
+                    if claim.action == winner.action:
+                        result.add_warning(claim.path, f"{match} duplicates {winner.path}")
+                    else:
+                        result.add_error(
+                            claim.path,
+                            f"{match} conflicts with {winner.path}, which takes precedence",
+                        )
+
+            inner = winners.get(_PREFIX, cover)
+            for key, winner in winners.items():
+                outer = cover if key == _PREFIX else inner
+                if (
+                    outer is not None
+                    and outer is not winner
+                    and outer.namespace != winner.namespace
+                ):
+                    result.add_warning(
+                        winner.path,
+                        f"{key[0]} match on {host} takes requests from {outer.path} "
+                        f"in namespace {outer.namespace}",
+                    )
+            stack.extend((child, inner) for child in reversed(node.children.values()))
+
+    for rule_id, count in inserted.items():
+        if rule_id not in partial and shadowed.get(rule_id, 0) == count:
+            result.add_warning(labels[rule_id], "Rule is unreachable: all its matches are shadowed")
+
+    return result
+
+
+def _dump(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
@@ -0,0 +1,352 @@
+"""Fleet-level Gateway consolidation.
+
+Every Ingress is converted to a Gateway of its own. Deployed as is, that is
+one load balancer per Ingress; merging the conversions of a fleet normally
+keeps only the first Gateway, dropping the listeners of every other Ingress.
+A GatewayConsolidator instead merges the listeners of all Gateways into one,
+through an index of listeners by (hostname, port, protocol), and rewrites
+the parentRefs of the routes to match.
+
+The Gateway API allows at most 64 listeners per Gateway. Beyond that the
+listeners are spread over several Gateways: listeners are grouped by
+hostname, so that the HTTP and HTTPS listeners of a host stay together, and
+the groups are packed in order of first appearance. The first Gateway keeps
+its name and the others are numbered, so the same input always gives the
+same Gateways.
+
+Routes are attached to the listeners their own Gateway had, by sectionName,
+so a route without hostnames does not pick up the hosts of other Ingresses.
+
+Listeners can also be minimized, as fewer listeners mean fewer filter chains
+in the proxy. On a port whose routes all carry hostnames, the listeners are
+folded into one listener without a hostname that holds every certificate;
+the proxy then picks the certificate by SNI. Elsewhere, HTTPS hosts are
+folded into a wildcard listener that covers them and holds their
+certificates, or hosts sharing their certificates into a new wildcard
+listener of their parent domain. Hosts are only folded where no route
+without hostnames could start receiving requests for other hosts.
+"""
+
+import copy
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from .hostnames import HostnameIndex, intersects
+from .ir import Route
+from .validation import MAX_LISTENERS
+
+# The Gateway API allows at most this many parentRefs per route
+MAX_PARENT_REFS = 32
+
+ListenerKey = tuple[str | None, int, str]
+
+
+class GatewayConsolidator:
+    """Merges the Gateways of many Ingresses into as few Gateways as possible.
+
+    Gateways are added with add(); gateways() then returns the merged
+    Gateways and rewrite() points a route at them. The consolidated Gateways
+    take their name, namespace, class and metadata from the first Gateway
+    added.
+
+    Attributes:
+        max_listeners: Listeners per Gateway before another one is started.
+        minimize: Whether to fold listeners together where routes allow it.
+        listeners_added: Number of listeners of all Gateways added.
+    """
+
+    def __init__(self, max_listeners: int = MAX_LISTENERS, minimize: bool = False):
+        if max_listeners < 1:
+            raise ValueError("max_listeners must be at least 1")
+        self.max_listeners = max_listeners
+        self.minimize = minimize
+        self.listeners_added = 0
+        self._base: dict[str, Any] | None = None
+        self._listeners: dict[ListenerKey, dict[str, Any]] = {}
+        # Listeners that routes without hostnames attach to
+        self._hostless: set[ListenerKey] = set()
+        # Listener keys of every original Gateway, by (namespace, name)
+        self._sources: dict[tuple[str, str], list[ListenerKey]] = {}
+        self._gateways: list[dict[str, Any]] | None = None
+        # Gateway name and listener name of every listener key
+        self._placement: dict[ListenerKey, tuple[str, str]] = {}
+
+    def add(
+        self, gateway: dict[str, Any], routes: Iterable[Route | dict[str, Any]] | None = None
+    ) -> None:
+        """Merge a Gateway's listeners into the consolidated Gateways.
+
+        Listeners with the same hostname, port and protocol as an earlier one
+        are merged into it, adding any certificates it does not have yet.
+        Listeners and certificates from another namespace than the
+        consolidated Gateways' are adjusted to keep working there.
+
+        Args:
+            gateway: A Gateway generated for one Ingress.
+            routes: The routes generated with it, as dictionaries or IR
+                Route objects. When minimizing, only
+                listeners whose routes are known to carry hostnames are
+                folded; without routes, none of the Gateway's are.
+        """
+        if self._base is None:
+            self._base = copy.deepcopy(gateway)
+        self._gateways = None
+
+        metadata = gateway.get("metadata") or {}
+        namespace = metadata.get("namespace") or "default"
+        keys = self._sources.setdefault((namespace, metadata.get("name", "")), [])
+        foreign = namespace != self.namespace
+
+        for listener in (gateway.get("spec") or {}).get("listeners") or []:
+            key = (listener.get("hostname"), listener.get("port"), listener.get("protocol"))
+            merged = self._listeners.get(key)
+            if merged is None:
+                merged = self._listeners[key] = copy.deepcopy(listener)
+                merged.get("tls", {}).pop("certificateRefs", None)
+            if key not in keys:
+                keys.append(key)
+            _merge_listener(merged, listener, namespace if foreign else None)
+            self.listeners_added += 1
+
+        # Routes without hostnames are attached to all listeners of their Gateway
+        if routes is None or any(not _hostnames(route) for route in routes):
+            self._hostless.update(keys)
+
+    @property
+    def namespace(self) -> str:
+        """The namespace of the consolidated Gateways."""
+        metadata = (self._base or {}).get("metadata") or {}
+        return metadata.get("namespace") or "default"
+
+    def gateways(self) -> list[dict[str, Any]]:
+        """Return the consolidated Gateways, at most max_listeners listeners each."""
+        if self._gateways is None:
+            self._gateways = self._assign()
+        return self._gateways
+
+    def rewrite(self, route: dict[str, Any]) -> dict[str, Any]:
+        """Point a route's parentRefs at the consolidated Gateways.
+
+        References to Gateways that were added are replaced by one reference
+        per listener of that Gateway which can serve the route's hostnames.
+        Should that exceed the parentRefs limit, the route references each
+        consolidated Gateway holding such a listener instead. Other
+        references are kept.
+
+        Returns:
+            The rewritten route; the given route is not modified.
+        """
+        self.gateways()
+        spec = route.get("spec") or {}
+        parent_refs = spec.get("parentRefs")
+        if not parent_refs:
+            return route
+
+        route_namespace = (route.get("metadata") or {}).get("namespace") or "default"
+        hostnames = spec.get("hostnames") or []
+        rewritten: list[dict[str, Any]] = []
+        for ref in parent_refs:
+            keys = self._sources.get((ref.get("namespace") or route_namespace, ref.get("name")))
+            if keys is None:
+                rewritten.append(ref)
+                continue
+            serving = [
+                key
+                for key in keys
+                if not hostnames or any(intersects(key[0], h) for h in hostnames)
+            ] or keys
+            refs = [
+                {"name": gateway, "namespace": self.namespace, "sectionName": listener}
+                for gateway, listener in dict.fromkeys(self._placement[key] for key in serving)
+            ]
+            if len(refs) > MAX_PARENT_REFS:
+                gateways = dict.fromkeys(self._placement[key][0] for key in serving)
+                refs = [{"name": gateway, "namespace": self.namespace} for gateway in gateways]
+            rewritten.extend(ref for ref in refs if ref not in rewritten)
+
+        return {**route, "spec": {**spec, "parentRefs": rewritten}}
+
+    def routes(self, routes: Iterable[dict[str, Any]]) -> "ConsolidatedRoutes":
+        """Return a list-like view of routes rewritten with rewrite()."""
+        return ConsolidatedRoutes(self, routes)
+
+    def _assign(self) -> list[dict[str, Any]]:
+        """Pack the listeners into Gateways and record where each one went."""
+        if self._base is None:
+            return []
+
+        targets = self._fold() if self.minimize else {key: key for key in self._listeners}
+        folded: dict[ListenerKey, dict[str, Any]] = {}
+        for key, target in targets.items():
+            listener = folded.get(target)
+            if listener is None:
+                if target in self._listeners:
+                    listener = copy.deepcopy(self._listeners[target])
+                else:
+                    listener = copy.deepcopy(self._listeners[key])
+                    listener["name"] = _listener_name(target)
+                    listener.pop("hostname", None)
+                    if target[0] is not None:
+                        listener = {"name": listener.pop("name"), "hostname": target[0], **listener}
+                folded[target] = listener
+            if key != target:
+                _merge_listener(listener, self._listeners[key])
+
+        groups: dict[str | None, list[ListenerKey]] = {}
+        for key in folded:
+            groups.setdefault(key[0], []).append(key)
+
+        shards: list[list[ListenerKey]] = [[]]
+        for group in groups.values():
+            for start in range(0, len(group), self.max_listeners):
+                chunk = group[start : start + self.max_listeners]
+                if len(shards[-1]) + len(chunk) > self.max_listeners:
+                    shards.append([])
+                shards[-1].extend(chunk)
+
+        name = self._base["metadata"].get("name", "gateway")
+        gateways = []
+        self._placement = {}
+        for index, keys in enumerate(shards):
+            gateway = copy.deepcopy(self._base)
+            gateway["metadata"]["name"] = name if index == 0 else f"{name}-{index + 1}"
+            listeners = []
+            names: set[str] = set()
+            for key in keys:
+                listener = folded[key]
+                listener["name"] = _unique(listener.get("name") or "listener", names)
+                listeners.append(listener)
+                self._placement[key] = (gateway["metadata"]["name"], listener["name"])
+            gateway["spec"]["listeners"] = listeners
+            gateways.append(gateway)
+        for key, target in targets.items():
+            self._placement[key] = self._placement[target]
+        return gateways
+
+    def _fold(self) -> dict[ListenerKey, ListenerKey]:
+        """Choose the listener every listener is folded into."""
+        targets = {key: key for key in self._listeners}
+        buckets: dict[tuple[int, str], list[ListenerKey]] = {}
+        for key in self._listeners:
+            buckets.setdefault(key[1:], []).append(key)
+
+        for (port, protocol), keys in buckets.items():
+            if len(keys) < 2:
+                continue
+            hostless = [key for key in keys if key in self._hostless]
+            if not hostless:
+                # Every route filters by hostname, so one listener serves them all
+                for key in keys:
+                    targets[key] = (None, port, protocol)
+                continue
+            if protocol != "HTTPS":
+                continue
+
+            certificates = {key: self._certificates(key) for key in keys}
+            hosts = [
+                key
+                for key in keys
+                if key[0] is not None and not key[0].startswith("*.") and key not in hostless
+            ]
+            wildcards = HostnameIndex()
+            for key in keys:
+                if key[0] and key[0].startswith("*.") and key not in self._hostless:
+                    wildcards.add(key[0], key)
+
+            # The most specific wildcard listener holding a host's certificates
+            # covers the host
+            for key in hosts:
+                for wildcard in wildcards.matches(key[0]):
+                    if certificates[key] <= certificates[wildcard]:
+                        targets[key] = wildcard
+                        break
+
+            # Hosts sharing certificates share a new wildcard listener of their
+            # parent domain, unless that takes hosts from a hostless route
+            if any(key[0] is None or key[0].startswith("*.") for key in hostless):
+                continue
+            shared: dict[tuple[frozenset, str], list[ListenerKey]] = {}
+            for key in hosts:
+                parent = key[0].partition(".")[2]
+                if targets[key] == key and certificates[key] and "." in parent:
+                    shared.setdefault((certificates[key], parent), []).append(key)
+            for (_, parent), group in shared.items():
+                wildcard = (f"*.{parent}", port, protocol)
+                if len(group) > 1 and wildcard not in self._listeners:
+                    if wildcard not in targets.values():
+                        for key in group:
+                            targets[key] = wildcard
+        return targets
+
+    def _certificates(self, key: ListenerKey) -> frozenset:
+        refs = (self._listeners[key].get("tls") or {}).get("certificateRefs") or []
+        return frozenset(tuple(sorted(ref.items())) for ref in refs)
+
+
+class ConsolidatedRoutes:
+    """A list-like view of routes pointed at consolidated Gateways.
+
+    Supports len(), truth testing and repeated iteration, so it can stand in
+    for the route lists of a conversion's resources dictionary.
+    """
+
+    def __init__(self, consolidator: GatewayConsolidator, routes: Iterable[dict[str, Any]]):
+        self.consolidator = consolidator
+        self.routes = routes
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return map(self.consolidator.rewrite, self.routes)
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+
+def _merge_listener(
+    merged: dict[str, Any], listener: dict[str, Any], namespace: str | None = None
+) -> None:
+    """Add a listener's certificates and allowed namespaces to a merged listener.
+
+    Certificates are qualified with namespace if given, for listeners coming
+    from another namespace than the merged listener's Gateway.
+    """
+    refs = (listener.get("tls") or {}).get("certificateRefs") or []
+    if refs:
+        known = merged["tls"].setdefault("certificateRefs", [])
+        for ref in refs:
+            ref = dict(ref)
+            if namespace is not None and "namespace" not in ref:
+                ref["namespace"] = namespace
+            if ref not in known:
+                known.append(ref)
+    if namespace is not None or _allowed_from(listener) == "All":
+        # Routes from the Ingress's namespace must still be able to attach
+        merged["allowedRoutes"] = {"namespaces": {"from": "All"}}
+
+
+def _hostnames(route: Route | dict[str, Any]) -> Iterable[str] | None:
+    if isinstance(route, Route):
+        return route.hostnames
+    return (route.get("spec") or {}).get("hostnames")
+
+
+def _allowed_from(listener: dict[str, Any]) -> str | None:
+    return ((listener.get("allowedRoutes") or {}).get("namespaces") or {}).get("from")
+
+
+def _listener_name(key: ListenerKey) -> str:
+    """Name a listener created by folding others, like the converter would."""
+    hostname, _, protocol = key
+    if hostname is None:
+        return protocol.lower()
+    return f"{protocol.lower()}-{hostname.replace('.', '-').replace('*', 'wildcard')}"
+
+
+def _unique(name: str, names: set[str]) -> str:
+    """Return name, or name with a numeric suffix if it is already taken."""
+    candidate = name
+    count = 2
+    while candidate in names:
+        candidate = f"{name}-{count}"
+        count += 1
+    names.add(candidate)
+    return candidate
@@ -9,6 +9,27 @@ from typing import Any
 
 import yaml
 
+from . import serializer
+from .ir import (
+    BackendRef,
+    CertificateRef,
+    Gateway,
+    Listener,
+    ParentRef,
+    PathMatch,
+    Route,
+    RouteRule,
+)
+
+# Annotations with which ingress-nginx treats ImplementationSpecific paths as
+# regexes; rewrite-target implies use-regex
+_USE_REGEX = "nginx.ingress.kubernetes.io/use-regex"
+_REWRITE_TARGET = "nginx.ingress.kubernetes.io/rewrite-target"
+
+# Characters that make an ImplementationSpecific path a regex when regexes are
+# enabled; '.' is left out as it is common in plain paths
+_REGEX_CHARACTERS = frozenset("^$*+?()[]{}|\\")
+
 
 def _parse_port(port_value: Any) -> int:
     """Parse port value to integer, defaulting to 80.
@@ -37,12 +58,14 @@ def parse_ingress(ingress_yaml: str) -> dict[str, Any]:
         ValueError: If the YAML is invalid or cannot be parsed.
     """
     try:
-        return yaml.safe_load(ingress_yaml)
+        return serializer.load(ingress_yaml)
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML: {e}")
 
 
-def convert_ingress_to_gateway(ingress: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
+def convert_ingress_to_gateway(
+    ingress: dict[str, Any], regex_paths: bool = False
+) -> dict[str, list[dict[str, Any]]]:
     """Convert a Kubernetes Ingress object to Gateway API resources.
 
     This function transforms a Kubernetes Ingress resource into equivalent
@@ -50,6 +73,9 @@ def convert_ingress_to_gateway(ingress: dict[str, Any]) -> dict[str, list[dict[s
 
     Args:
         ingress: A dictionary representing a Kubernetes Ingress resource.
+        regex_paths: Whether to read ImplementationSpecific paths as
+            ingress-nginx regexes and GCE or ALB wildcards; see
+            build_resources().
 
     Returns:
         A dictionary containing:
@@ -64,6 +90,38 @@ def convert_ingress_to_gateway(ingress: dict[str, Any]) -> dict[str, list[dict[s
         >>> resources = convert_ingress_to_gateway(ingress)
         >>> print(resources['gateway']['metadata']['name'])
     """
+    gateway, routes = build_resources(ingress, regex_paths)
+    return {
+        "gateway": gateway.to_dict(),
+        "httproutes": [route.to_dict() for route in routes],
+    }
+
+
+def build_resources(
+    ingress: dict[str, Any], regex_paths: bool = False
+) -> tuple[Gateway, list[Route]]:
+    """Convert a Kubernetes Ingress object to the Gateway API IR.
+
+    ImplementationSpecific paths become PathPrefix matches. With regex_paths,
+    a trailing '/*' wildcard, as GCE and ALB use it, becomes a PathPrefix
+    match on the parent path instead, and paths with regex syntax on
+    Ingresses that enable ingress-nginx regexes become RegularExpression
+    matches. ingress-nginx only anchors those regexes at the start of the
+    path, so '.*' is appended unless the regex ends in '$' or '.*'; unlike
+    ingress-nginx, the Gateway matches them case-sensitively.
+
+    Args:
+        ingress: A dictionary representing a Kubernetes Ingress resource.
+        regex_paths: Whether to read ImplementationSpecific paths as
+            ingress-nginx regexes and GCE or ALB wildcards.
+
+    Returns:
+        The Gateway and the HTTPRoutes, as convert_ingress_to_gateway()
+        returns them before they are turned into dictionaries.
+
+    Raises:
+        ValueError: If the ingress is empty or not of kind 'Ingress'.
+    """
     if not ingress:
         raise ValueError("Empty ingress object")
 
@@ -78,6 +136,11 @@ def convert_ingress_to_gateway(ingress: dict[str, Any]) -> dict[str, list[dict[s
     spec = ingress.get("spec", {})
     ingress_class = spec.get("ingressClassName", "")
 
+    annotations = metadata.get("annotations") or {}
+    use_regex = regex_paths and (
+        str(annotations.get(_USE_REGEX, "")).lower() == "true" or _REWRITE_TARGET in annotations
+    )
+
     # Extract TLS configuration
     tls_hosts = set()
     tls_secrets = {}
@@ -98,74 +161,39 @@ def convert_ingress_to_gateway(ingress: dict[str, Any]) -> dict[str, list[dict[s
 
     # Add HTTPS listeners for TLS hosts
     for host in tls_hosts:
-        listener = {
-            "name": f"https-{host.replace('.', '-').replace('*', 'wildcard')}",
-            "hostname": host if host != "*" else None,
-            "port": 443,
-            "protocol": "HTTPS",
-            "tls": {
-                "mode": "Terminate",
-                "certificateRefs": [
-                    {
-                        "kind": "Secret",
-                        "name": tls_secrets.get(host, f"{name}-tls"),
-                    }
-                ],
-            },
-            "allowedRoutes": {
-                "namespaces": {"from": "Same"},
-            },
-        }
-        if listener["hostname"] is None:
-            del listener["hostname"]
-        listeners.append(listener)
+        listeners.append(
+            Listener(
+                name=f"https-{_host_slug(host)}",
+                hostname=host if host != "*" else None,
+                port=443,
+                protocol="HTTPS",
+                tls_mode="Terminate",
+                certificate_refs=(CertificateRef("Secret", tls_secrets.get(host, f"{name}-tls")),),
+            )
+        )
 
     # Add HTTP listeners for non-TLS hosts
     http_hosts = all_hosts - tls_hosts
     if http_hosts or not tls_hosts:
         for host in http_hosts or ["*"]:
-            listener = {
-                "name": f"http-{host.replace('.', '-').replace('*', 'wildcard')}",
-                "hostname": host if host != "*" else None,
-                "port": 80,
-                "protocol": "HTTP",
-                "allowedRoutes": {
-                    "namespaces": {"from": "Same"},
-                },
-            }
-            if listener["hostname"] is None:
-                del listener["hostname"]
-            listeners.append(listener)
+            listeners.append(
+                Listener(
+                    name=f"http-{_host_slug(host)}",
+                    hostname=host if host != "*" else None,
+                    port=80,
+                    protocol="HTTP",
+                )
+            )
 
     # If no listeners, add a default HTTP listener
     if not listeners:
-        listeners.append(
-            {
-                "name": "http",
-                "port": 80,
-                "protocol": "HTTP",
-                "allowedRoutes": {
-                    "namespaces": {"from": "Same"},
-                },
-            }
-        )
+        listeners.append(Listener(name="http", port=80, protocol="HTTP"))
 
-    # Build Gateway resource
-    gateway = {
-        "apiVersion": "gateway.networking.k8s.io/v1",
-        "kind": "Gateway",
-        "metadata": {
-            "name": name,
-            "namespace": namespace,
-        },
-        "spec": {
-            "gatewayClassName": ingress_class or "istio",
-            "listeners": listeners,
-        },
-    }
+    gateway = Gateway(name, namespace, ingress_class or "istio", listeners)
+    parent_refs = (ParentRef(name, namespace),)
 
     # Build HTTPRoute resources
-    httproutes = []
+    routes = []
 
     for rule in spec.get("rules", []):
         host = rule.get("host")
@@ -178,115 +206,75 @@ def convert_ingress_to_gateway(ingress: dict[str, Any]) -> dict[str, list[dict[s
             path_type = path_config.get("pathType", "Prefix")
             backend = path_config.get("backend", {})
 
-            # Handle both old and new Ingress backend formats
-            service = backend.get("service", backend)
-            service_name = service.get("name", "")
-
-            # Handle port - can be number or name
-            port = service.get("port", {})
-            if isinstance(port, dict):
-                port_value = port.get("number") or port.get("name")
-            else:
-                port_value = port or service.get("servicePort")
-
             # Convert pathType to Gateway API match type
             is_prefix = path_type in ["Prefix", "ImplementationSpecific"]
             match_type = "PathPrefix" if is_prefix else "Exact"
+            if regex_paths and path_type == "ImplementationSpecific" and path:
+                if path.endswith("/*"):
+                    # GCE and ALB style wildcards match the parent path and below
+                    path = path[:-2] or "/"
+                elif use_regex and not _REGEX_CHARACTERS.isdisjoint(path):
+                    match_type = "RegularExpression"
+                    path = _anchor_regex(path)
 
-            rule_config = {
-                "matches": [
-                    {
-                        "path": {
-                            "type": match_type,
-                            "value": path,
-                        },
-                    }
-                ],
-                "backendRefs": [
-                    {
-                        "name": service_name,
-                        "port": _parse_port(port_value),
-                    }
-                ],
-            }
-            rules.append(rule_config)
+            rules.append(RouteRule((PathMatch(match_type, path),), (_backend_ref(backend),)))
 
         if rules:
-            httproute = {
-                "apiVersion": "gateway.networking.k8s.io/v1",
-                "kind": "HTTPRoute",
-                "metadata": {
-                    "name": f"{name}-{host.replace('.', '-') if host else 'default'}",
-                    "namespace": namespace,
-                },
-                "spec": {
-                    "parentRefs": [
-                        {
-                            "name": name,
-                            "namespace": namespace,
-                        }
-                    ],
-                    "rules": rules,
-                },
-            }
-
-            if host:
-                httproute["spec"]["hostnames"] = [host]
-
-            httproutes.append(httproute)
+            routes.append(
+                Route(
+                    "HTTPRoute",
+                    f"{name}-{host.replace('.', '-') if host else 'default'}",
+                    namespace,
+                    parent_refs,
+                    tuple(rules),
+                    (host,) if host else None,
+                )
+            )
 
     # Handle default backend if present
     default_backend = spec.get("defaultBackend", {})
     if default_backend:
-        service = default_backend.get("service", default_backend)
-        service_name = service.get("name", "")
-        port = service.get("port", {})
-        if isinstance(port, dict):
-            port_value = port.get("number") or port.get("name")
-        else:
-            port_value = port or service.get("servicePort")
-
-        if service_name:
-            default_route = {
-                "apiVersion": "gateway.networking.k8s.io/v1",
-                "kind": "HTTPRoute",
-                "metadata": {
-                    "name": f"{name}-default",
-                    "namespace": namespace,
-                },
-                "spec": {
-                    "parentRefs": [
-                        {
-                            "name": name,
-                            "namespace": namespace,
-                        }
-                    ],
-                    "rules": [
-                        {
-                            "matches": [
-                                {
-                                    "path": {
-                                        "type": "PathPrefix",
-                                        "value": "/",
-                                    },
-                                }
-                            ],
-                            "backendRefs": [
-                                {
-                                    "name": service_name,
-                                    "port": _parse_port(port_value),
-                                }
-                            ],
-                        }
-                    ],
-                },
-            }
-            httproutes.append(default_route)
+        backend_ref = _backend_ref(default_backend)
+        if backend_ref.name:
+            routes.append(
+                Route(
+                    "HTTPRoute",
+                    f"{name}-default",
+                    namespace,
+                    parent_refs,
+                    (RouteRule((PathMatch("PathPrefix", "/"),), (backend_ref,)),),
+                )
+            )
 
-    return {
-        "gateway": gateway,
-        "httproutes": httproutes,
-    }
+    return gateway, routes
+
+
+def _anchor_regex(path: str) -> str:
+    """Make an ingress-nginx path regex, anchored at the start only, match whole paths."""
+    if path.endswith((".*", ".*)")) or (path.endswith("$") and not path.endswith("\\$")):
+        return path
+    return path + ".*"
+
+
+def _host_slug(host: str) -> str:
+    """Turn a hostname into a listener name suffix."""
+    return host.replace(".", "-").replace("*", "wildcard")
+
+
+def _backend_ref(backend: dict[str, Any]) -> BackendRef:
+    """Build a backend reference from an Ingress backend."""
+    # Handle both old and new Ingress backend formats
+    service = backend.get("service", backend)
+    service_name = service.get("name", "")
+
+    # Handle port - can be number or name
+    port = service.get("port", {})
+    if isinstance(port, dict):
+        port_value = port.get("number") or port.get("name")
+    else:
+        port_value = port or service.get("servicePort")
+
+    return BackendRef(service_name, _parse_port(port_value))
 
 
 def resources_to_yaml(resources: dict[str, Any]) -> str:
@@ -299,4 +287,4 @@ def resources_to_yaml(resources: dict[str, Any]) -> str:
         A multi-document YAML string with all resources separated by '---'.
     """
     documents = [resources["gateway"]] + resources["httproutes"]
-    return yaml.dump_all(documents, default_flow_style=False, sort_keys=False)
+    return serializer.dump_all(documents)
@@ -0,0 +1,61 @@
+"""Git plumbing helpers.
+
+Used to restrict conversion and validation to the manifests touched since a
+given revision, which keeps pre-commit hooks and pull request pipelines fast
+on large repositories. Only the local ``git`` executable is used; nothing is
+fetched.
+"""
+
+import subprocess
+from collections.abc import Iterable
+from pathlib import Path
+
+
+def changed_files(ref: str, cwd: str | Path | None = None) -> set[Path]:
+    """List the files changed since a revision.
+
+    Changes are taken relative to the merge base of ref and HEAD, as a pull
+    request diff would be, and include uncommitted and untracked files.
+    Deleted files are not included.
+
+    Args:
+        ref: A revision such as 'origin/main' or a commit hash.
+        cwd: A directory inside the repository; defaults to the current one.
+
+    Returns:
+        The resolved paths of the changed files.
+
+    Raises:
+        ValueError: If git is not available, cwd is not inside a repository
+            or ref is not a valid revision.
+    """
+    root = Path(_git(["rev-parse", "--show-toplevel"], cwd).strip())
+    base = _git(["merge-base", ref, "HEAD"], root).strip()
+
+    # Paths are NUL-separated and relative to the repository root
+    diff = _git(["diff", "--name-only", "-z", "--diff-filter=ACMRT", base, "--"], root)
+    untracked = _git(["ls-files", "--others", "--exclude-standard", "-z"], root)
+    return {(root / name).resolve() for name in _split(diff + untracked)}
+
+
+def filter_changed(files: Iterable[Path], changed: set[Path]) -> list[Path]:
+    """Keep the files that are in a set of changed paths, in input order."""
+    return [f for f in files if f.resolve() in changed]
+
+
+def _split(output: str) -> list[str]:
+    return [name for name in output.split("\0") if name]
+
+
+def _git(args: list[str], cwd: str | Path | None) -> str:
+    """Run a git command and return its standard output."""
+    try:
+        completed = subprocess.run(
+            ["git", *args], cwd=cwd, capture_output=True, text=True, check=True
+        )
+    except FileNotFoundError:
+        raise ValueError("git is not installed")
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.strip().splitlines()[-1] if e.stderr.strip() else str(e)
+        raise ValueError(f"git {args[0]} failed: {message}")
+    return completed.stdout
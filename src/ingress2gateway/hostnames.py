@@ -0,0 +1,204 @@
+"""Hostname matching between listeners and routes.
+
+A route attaches to a listener when their hostnames intersect: they are
+equal, one is a wildcard such as '*.example.com' covering the other, or
+either has no hostname at all. A wildcard covers any number of labels in
+front of its suffix, so '*.example.com' covers 'a.b.example.com' but not
+'example.com'.
+
+HostnameIndex stores hostnames in a trie of their DNS labels, last label
+first, so a lookup walks down the labels of one hostname instead of
+comparing it with every hostname in the index. It works in both directions:
+an index of listeners answers which listeners accept a route, and an index
+of routes which routes land on a listener. ListenerIndex builds on it to
+resolve a route's parentRefs to the listeners it attaches to.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from .ir import Route
+
+
+class _Node:
+    """A DNS label, with the values stored for its hostname and wildcard."""
+
+    __slots__ = ("children", "exact", "wildcard")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.exact: list[Any] = []
+        self.wildcard: list[Any] = []
+
+
+class HostnameIndex:
+    """Values stored by hostname and looked up by hostname intersection.
+
+    A value may be stored without a hostname, in which case every lookup
+    returns it.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        # Values stored without a hostname
+        self._any: list[Any] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, hostname: str | None, value: Any) -> None:
+        """Store a value under a hostname, a wildcard hostname or None."""
+        self._size += 1
+        if not hostname:
+            self._any.append(value)
+            return
+        labels, wildcard = _labels(hostname)
+        node = self._root
+        for label in labels:
+            child = node.children.get(label)
+            if child is None:
+                child = node.children[label] = _Node()
+            node = child
+        (node.wildcard if wildcard else node.exact).append(value)
+
+    def matches(self, hostname: str | None = None) -> list[Any]:
+        """Return the values whose hostname intersects a hostname.
+
+        Args:
+            hostname: A hostname, a wildcard hostname, or None to match
+                every value.
+
+        Returns:
+            Values stored under the hostname itself or hostnames it covers,
+            then values of wildcards covering it from the most specific to
+            the least, then values stored without a hostname. Within each,
+            values are in the order they were added.
+        """
+        if not hostname:
+            return [*_subtree(self._root, True), *self._any]
+
+        labels, wildcard = _labels(hostname)
+        node: _Node | None = self._root
+        covering: list[list[Any]] = []
+        for label in labels:
+            covering.append(node.wildcard)
+            node = node.children.get(label)
+            if node is None:
+                break
+
+        found: list[Any] = []
+        if node is not None:
+            # A wildcard does not match the bare domain it is a wildcard of
+            found = list(_subtree(node, False)) if wildcard else list(node.exact)
+        for values in reversed(covering):
+            found.extend(values)
+        found.extend(self._any)
+        return found
+
+
+class ListenerIndex:
+    """The listeners of Gateways, looked up for the routes attaching to them.
+
+    Listeners are indexed by hostname per Gateway, so finding the listeners
+    of a route takes one lookup per hostname and parentRef.
+    """
+
+    def __init__(self, gateways: Iterable[dict[str, Any]]):
+        self._gateways: dict[tuple[str, str], HostnameIndex] = {}
+        for gateway in gateways:
+            metadata = gateway.get("metadata") or {}
+            key = (metadata.get("namespace") or "default", metadata.get("name", ""))
+            index = self._gateways.setdefault(key, HostnameIndex())
+            for listener in (gateway.get("spec") or {}).get("listeners") or []:
+                index.add(listener.get("hostname"), listener)
+
+    def accepting(self, route: Route | dict[str, Any]) -> list[dict[str, Any]] | None:
+        """Return the listeners a route attaches to.
+
+        A parentRef attaches the route to the listeners of its Gateway whose
+        hostname intersects one of the route's hostnames, narrowed down by
+        the parentRef's sectionName and port.
+
+        Args:
+            route: A route dictionary or IR Route object.
+
+        Returns:
+            The listeners in order of first attachment, or None if none of
+            the route's parentRefs names one of the indexed Gateways.
+        """
+        if isinstance(route, Route):
+            route_namespace = route.namespace or "default"
+            hostnames = route.hostnames or [None]
+            # IR parentRefs always reference a whole Gateway
+            refs = [("Gateway", ref.namespace, ref.name, None, None) for ref in route.parent_refs]
+        else:
+            spec = route.get("spec") or {}
+            route_namespace = (route.get("metadata") or {}).get("namespace") or "default"
+            hostnames = spec.get("hostnames") or [None]
+            refs = [
+                (
+                    ref.get("kind", "Gateway"),
+                    ref.get("namespace"),
+                    ref.get("name"),
+                    ref.get("sectionName"),
+                    ref.get("port"),
+                )
+                for ref in spec.get("parentRefs") or []
+            ]
+
+        referenced = False
+        listeners: dict[int, dict[str, Any]] = {}
+        for kind, namespace, name, section_name, port in refs:
+            if kind != "Gateway":
+                continue
+            index = self._gateways.get((namespace or route_namespace, name))
+            if index is None:
+                continue
+            referenced = True
+            for hostname in hostnames:
+                for listener in index.matches(hostname):
+                    if section_name not in (None, listener.get("name")):
+                        continue
+                    if port not in (None, listener.get("port")):
+                        continue
+                    listeners.setdefault(id(listener), listener)
+        return list(listeners.values()) if referenced else None
+
+
+def intersects(first: str | None, second: str | None) -> bool:
+    """Check whether two listener or route hostnames have a hostname in common."""
+    if not first or not second:
+        return True
+    first, second = first.lower(), second.lower()
+    if first == second:
+        return True
+    if first.startswith("*.") and second.endswith(first[1:]):
+        return True
+    return second.startswith("*.") and first.endswith(second[1:])
+
+
+def _labels(hostname: str) -> tuple[list[str], bool]:
+    """Split a hostname into its labels, last first, and whether it is a wildcard."""
+    labels = hostname.lower().split(".")
+    wildcard = labels[0] == "*"
+    if wildcard:
+        del labels[0]
+    labels.reverse()
+    return labels, wildcard
+
+
+def _subtree(node: _Node, exact: bool) -> Iterator[Any]:
+    """Yield the values of a node and every node below it.
+
+    The node's own exact values are only included if exact is true.
+    """
+    if exact:
+        yield from node.exact
+    yield from node.wildcard
+    stack = list(reversed(node.children.values()))
+    while stack:
+        node = stack.pop()
+        yield from node.exact
+        yield from node.wildcard
+        stack.extend(reversed(node.children.values()))
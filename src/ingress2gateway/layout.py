@@ -0,0 +1,196 @@
+"""Per-resource output layouts.
+
+Instead of one combined file, generated resources can be written to a
+directory tree with one file per resource, as GitOps tools expect:
+
+- flat: every resource directly in the output directory
+- per-namespace: one sub-directory per namespace
+- kustomize: as per-namespace, with a generated kustomization.yaml in every
+  directory listing its resources and sub-directories
+
+Resources can also be spread over a fixed number of shard directories by a
+stable hash, so that each shard can be synced as a separate application.
+With the per-namespace and kustomize layouts a namespace is never split
+across shards.
+
+Files are written from a thread pool; each one is written atomically and only
+replaced when its content changes.
+"""
+
+import os
+import re
+import zlib
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from . import serializer
+from .batch import OUTPUT_SUFFIXES
+from .sink import write_file
+
+LAYOUTS = ["flat", "per-namespace", "kustomize"]
+
+KUSTOMIZATION = "kustomization.yaml"
+
+_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def plan_layout(
+    documents: Iterable[dict[str, Any]],
+    layout: str = "flat",
+    output_format: str = "yaml",
+    shards: int = 0,
+    sort_keys: bool = False,
+) -> dict[PurePosixPath, str]:
+    """Assign every document a file and serialize it.
+
+    Files are named ``<kind>-<name>`` with the extension of the output
+    format. Should two resources end up with the same file, the later one
+    gets a numeric suffix.
+
+    Args:
+        documents: Generated Gateway API resources.
+        layout: One of 'flat', 'per-namespace' or 'kustomize'.
+        output_format: One of 'yaml', 'json' or 'ndjson'.
+        shards: Number of shard directories; 0 or 1 disables sharding.
+        sort_keys: Whether to sort mapping keys, for canonical output.
+
+    Returns:
+        The content of each file, keyed by its path relative to the output
+        directory, in document order followed by any kustomization files.
+
+    Raises:
+        ValueError: If the layout or output format is unknown.
+    """
+    return dict(iter_layout(documents, layout, output_format, shards, sort_keys))
+
+
+def iter_layout(
+    documents: Iterable[dict[str, Any]],
+    layout: str = "flat",
+    output_format: str = "yaml",
+    shards: int = 0,
+    sort_keys: bool = False,
+) -> Iterator[tuple[PurePosixPath, str]]:
+    """Lazily assign every document a file and serialize it, as plan_layout().
+
+    Each file is yielded as soon as its document has been consumed, so output
+    can be streamed; only the file paths are kept in memory. Kustomization
+    files follow the last document.
+
+    Yields:
+        Pairs of relative path and file content.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}")
+    suffix = OUTPUT_SUFFIXES[output_format]
+    width = max(2, len(str(shards - 1)))
+
+    paths: set[PurePosixPath] = set()
+    ordered: list[PurePosixPath] = []
+    for document in documents:
+        metadata = document.get("metadata") or {}
+        namespace = _safe(metadata.get("namespace") or "default")
+        kind = str(document.get("kind", "resource")).lower()
+        name = _safe(metadata.get("name") or "unnamed")
+
+        directory = PurePosixPath()
+        if shards > 1:
+            key = f"{namespace}/{kind}/{name}" if layout == "flat" else namespace
+            directory /= f"shard-{zlib.crc32(key.encode()) % shards:0{width}d}"
+        if layout != "flat":
+            directory /= namespace
+
+        stem = f"{kind}-{name}"
+        path = directory / f"{stem}{suffix}"
+        count = 2
+        while path in paths:
+            path = directory / f"{stem}-{count}{suffix}"
+            count += 1
+        paths.add(path)
+        ordered.append(path)
+        yield path, serializer.dump_document(document, output_format, sort_keys)
+
+    if layout == "kustomize":
+        yield from _kustomizations(ordered).items()
+
+
+def write_layout(
+    files: Mapping[PurePosixPath, str] | Iterable[tuple[PurePosixPath, str]],
+    output_dir: str | Path,
+    workers: int | None = None,
+) -> tuple[int, int]:
+    """Write planned files below an output directory using a thread pool.
+
+    Files are handed to the pool as they are consumed, with a bounded number
+    in flight, so a lazily generated layout is never held in memory. Files
+    whose content is unchanged are left untouched. Files that are no longer
+    part of the plan are not removed.
+
+    Args:
+        files: File contents keyed by relative path, as from plan_layout(),
+            or (path, content) pairs, as from iter_layout().
+        output_dir: The directory to write to; created if missing.
+        workers: Number of writer threads; defaults to CPUs + 4, at most 32.
+
+    Returns:
+        The number of files (re)written and the number left unchanged.
+
+    Raises:
+        OSError: If a file cannot be written.
+    """
+    items = files.items() if isinstance(files, Mapping) else files
+    written = unchanged = 0
+
+    def collect(futures: Iterable[Future]) -> None:
+        nonlocal written, unchanged
+        for future in futures:
+            if future.result():
+                written += 1
+            else:
+                unchanged += 1
+
+    # Same default as ThreadPoolExecutor, which suits I/O-bound work
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="layout-writer") as executor:
+        window = workers * 4
+        pending: set[Future] = set()
+        for path, text in items:
+            pending.add(executor.submit(write_file, Path(output_dir) / path, text))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(pending)
+    return written, unchanged
+
+
+def _kustomizations(paths: list[PurePosixPath]) -> dict[PurePosixPath, str]:
+    """Generate a kustomization.yaml for every directory of a file tree.
+
+    Each one lists the directory's files in order, then its sub-directories.
+    """
+    entries: dict[PurePosixPath, list[str]] = {PurePosixPath(): []}
+    subdirectories: dict[PurePosixPath, set[str]] = {PurePosixPath(): set()}
+    for path in paths:
+        entries.setdefault(path.parent, []).append(path.name)
+        for directory in path.parents:
+            entries.setdefault(directory, [])
+            if directory != PurePosixPath():
+                subdirectories.setdefault(directory.parent, set()).add(directory.name)
+
+    return {
+        directory / KUSTOMIZATION: serializer.dump(
+            {
+                "apiVersion": "kustomize.config.k8s.io/v1beta1",
+                "kind": "Kustomization",
+                "resources": names + sorted(subdirectories.get(directory, ())),
+            }
+        )
+        for directory, names in sorted(entries.items())
+    }
+
+
+def _safe(name: str) -> str:
+    """Make a resource or namespace name safe to use as a path component."""
+    return _UNSAFE_RE.sub("-", str(name)).lstrip(".") or "unnamed"
@@ -0,0 +1,489 @@
+"""Streaming conversion pipeline.
+
+This module splits the CLI conversion flow into generator stages so that
+multi-document input is parsed, validated and converted one document at a
+time. Nothing is accumulated between stages, which keeps memory bounded by
+the size of the largest single document rather than the whole input.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Any
+
+from . import serializer
+from .annotations import get_annotation_warnings, parse_annotations
+from .consolidate import GatewayConsolidator
+from .converter import build_resources
+from .grpc import convert_to_grpc_routes, is_grpc_backend
+from .ir import Route, RouteList
+from .providers import apply_provider_config, get_provider
+from .splitter import Selector, iter_raw_documents, select_raw_documents
+from .store import ResourceStore
+from .validation import ValidationError, validate_conversion_output, validate_ingress
+
+
+class ConversionResult:
+    """Result of converting a single Ingress document.
+
+    Attributes:
+        ingress: The source Ingress resource.
+        resources: Converted resources with 'gateway', 'httproutes' and
+            'grpcroutes' keys, or None if the Ingress failed validation.
+        routes: The HTTPRoutes as IR Route objects, or None if resources
+            holds them only as dictionaries.
+        warnings: Annotation warnings raised while converting.
+        unsupported: Annotations that could not be converted.
+        errors: Input validation errors; empty on success.
+    """
+
+    def __init__(
+        self,
+        ingress: dict[str, Any],
+        resources: dict[str, Any] | None = None,
+        warnings: list[str] | None = None,
+        unsupported: list[dict[str, str]] | None = None,
+        errors: list[ValidationError] | None = None,
+        routes: list[Route] | None = None,
+    ):
+        self.ingress = ingress
+        # Without 'httproutes' if routes is given, until they are first needed
+        self._resources = resources
+        self.routes = routes
+        self.warnings = warnings or []
+        self.unsupported = unsupported or []
+        self.errors = errors or []
+
+    @property
+    def is_valid(self) -> bool:
+        return len(self.errors) == 0
+
+    @property
+    def name(self) -> str:
+        """The Ingress as '<namespace>/<name>'."""
+        metadata = self.ingress.get("metadata") or {}
+        return f"{metadata.get('namespace', 'default')}/{metadata.get('name', '<unnamed>')}"
+
+    @property
+    def resources(self) -> dict[str, Any] | None:
+        if self.routes is not None and "httproutes" not in self._resources:
+            self._resources = {
+                "gateway": self._resources["gateway"],
+                "httproutes": [route.to_dict() for route in self.routes],
+                "grpcroutes": self._resources["grpcroutes"],
+            }
+        return self._resources
+
+    def compact_resources(self) -> dict[str, Any] | None:
+        """Return the resources with the HTTPRoutes as IR Route objects, if built as such."""
+        if self.routes is None:
+            return self.resources
+        return {**self._resources, "httproutes": self.routes}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ingress": self.ingress,
+            "resources": self.resources,
+            "warnings": self.warnings,
+            "unsupported": self.unsupported,
+            "errors": [error.to_dict() for error in self.errors],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ConversionResult":
+        return cls(
+            data["ingress"],
+            resources=data["resources"],
+            warnings=data["warnings"],
+            unsupported=data["unsupported"],
+            errors=[ValidationError(**error) for error in data["errors"]],
+        )
+
+
+def iter_documents(
+    content: str | IO[str],
+    selector: Selector | None = None,
+    on_skip: Callable[[str], None] | None = None,
+) -> Iterator[Any]:
+    """Lazily parse multi-document YAML or JSON input.
+
+    Kubernetes list objects (``kind: List``, ``IngressList``) are expanded
+    into their items as they are reached. When a selector is given, YAML
+    input is split into raw documents first and only documents whose
+    sniffed kind, namespace and ingress class may match are parsed.
+
+    Args:
+        content: A YAML or JSON string, or an open text stream.
+        selector: Optional selector documents must match.
+        on_skip: Optional callback invoked with the kind of each document
+            dropped because its kind is not selected.
+
+    Yields:
+        Each parsed (and selected) document in input order.
+
+    Raises:
+        yaml.YAMLError: If a YAML document is invalid. Documents before the
+            invalid one have already been yielded.
+        json.JSONDecodeError: If JSON input is invalid.
+    """
+    if selector is None:
+        yield from serializer.expand_lists(serializer.load_documents(content))
+        return
+
+    if not isinstance(content, str) and not content.seekable():
+        content = content.read()
+
+    if serializer.is_json_input(content):
+        documents = serializer.expand_lists(serializer.load_documents(content))
+    else:
+        documents = _iter_sniffed(content, selector, on_skip)
+
+    for doc in documents:
+        if not doc:
+            continue
+        if selector.matches(doc):
+            yield doc
+        elif on_skip is not None and not selector.match_fields(doc.get("kind", ""), None, None):
+            on_skip(doc.get("kind", ""))
+
+
+def _iter_sniffed(
+    content: str | IO[str],
+    selector: Selector,
+    on_skip: Callable[[str], None] | None,
+) -> Iterator[Any]:
+    """Parse only the raw YAML documents whose sniffed fields may match."""
+    for raw in select_raw_documents(iter_raw_documents(content), selector, on_skip):
+        yield from serializer.expand_lists([serializer.load(raw)])
+
+
+def iter_ingresses(
+    documents: Iterable[Any],
+    on_skip: Callable[[str], None] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Filter a document stream down to Ingress resources.
+
+    Args:
+        documents: Parsed documents.
+        on_skip: Optional callback invoked with the kind of each skipped
+            non-Ingress document.
+
+    Yields:
+        Each Ingress document in input order.
+    """
+    for doc in documents:
+        if not doc:
+            continue
+
+        kind = doc.get("kind", "")
+        if kind != "Ingress":
+            if on_skip is not None:
+                on_skip(kind)
+            continue
+
+        yield doc
+
+
+# Distinct annotation sets whose parse results a session keeps
+ANNOTATION_CACHE_SIZE = 4096
+
+
+class ConversionSession:
+    """Converts many Ingresses with shared state.
+
+    The provider configuration is looked up once, and annotation parsing is
+    memoized by the annotations themselves, which mostly repeat across a
+    fleet. Results are the same as from convert_document(). A session is
+    not thread-safe; use one per thread.
+
+    Attributes:
+        provider: Gateway provider preset (e.g., 'istio', 'nginx', 'envoy').
+        grpc: Whether to detect and convert gRPC backends to GRPCRoutes.
+        validate: Whether to validate each input Ingress.
+        regex_paths: Whether to read ImplementationSpecific paths as
+            ingress-nginx regexes and GCE or ALB wildcards.
+    """
+
+    def __init__(
+        self,
+        provider: str = "istio",
+        grpc: bool = False,
+        validate: bool = True,
+        annotation_cache_size: int = ANNOTATION_CACHE_SIZE,
+        regex_paths: bool = False,
+    ):
+        self.provider = provider
+        self.grpc = grpc
+        self.validate = validate
+        self.regex_paths = regex_paths
+        self._config = get_provider(provider)
+        self._annotation_cache_size = annotation_cache_size
+        self._annotations: dict[tuple, tuple[list[str], list[dict[str, str]]]] = {}
+
+    def convert(self, ingress: dict[str, Any]) -> ConversionResult:
+        """Run the full conversion pipeline for a single Ingress.
+
+        Validates the input, parses annotations, converts to Gateway API,
+        applies provider defaults and splits out GRPCRoutes.
+
+        Args:
+            ingress: A dictionary representing a Kubernetes Ingress resource.
+
+        Returns:
+            A ConversionResult. If input validation fails, resources is None
+            and errors holds the validation errors.
+        """
+        if self.validate:
+            validation = validate_ingress(ingress)
+            if not validation.is_valid:
+                return ConversionResult(ingress, errors=validation.errors)
+
+        annotations = ingress.get("metadata", {}).get("annotations", {})
+        warnings, unsupported = self._parse_annotations(annotations)
+
+        gateway, routes = build_resources(ingress, self.regex_paths)
+        gateway_dict = apply_provider_config(gateway.to_dict(), self._config)
+
+        if self.grpc and is_grpc_backend(annotations):
+            http_routes, grpc_routes = convert_to_grpc_routes(
+                [route.to_dict() for route in routes], annotations
+            )
+            resources = {
+                "gateway": gateway_dict,
+                "httproutes": http_routes,
+                "grpcroutes": grpc_routes,
+            }
+            return ConversionResult(
+                ingress, resources=resources, warnings=warnings, unsupported=unsupported
+            )
+
+        # The routes stay IR objects until something needs them as dictionaries
+        return ConversionResult(
+            ingress,
+            resources={"gateway": gateway_dict, "grpcroutes": []},
+            warnings=warnings,
+            unsupported=unsupported,
+            routes=routes,
+        )
+
+    def convert_many(
+        self,
+        documents: Iterable[Any],
+        on_skip: Callable[[str], None] | None = None,
+    ) -> Iterator[ConversionResult]:
+        """Lazily convert every Ingress in a stream of parsed documents.
+
+        List objects are expanded and documents of other kinds are skipped.
+
+        Args:
+            documents: Parsed documents, such as Ingress dictionaries.
+            on_skip: Optional callback invoked with the kind of each skipped
+                non-Ingress document.
+
+        Yields:
+            A ConversionResult for each Ingress in input order.
+        """
+        for ingress in iter_ingresses(serializer.expand_lists(documents), on_skip):
+            yield self.convert(ingress)
+
+    def convert_stream(
+        self,
+        content: str | IO[str],
+        selector: Selector | None = None,
+        on_skip: Callable[[str], None] | None = None,
+    ) -> Iterator[ConversionResult]:
+        """Parse and convert multi-document input one Ingress at a time.
+
+        Args:
+            content: A YAML or JSON string, or an open text stream.
+            selector: Optional selector pushed down to the document splitter
+                so unselected documents are never fully parsed.
+            on_skip: Optional callback invoked with the kind of each skipped
+                document.
+
+        Yields:
+            A ConversionResult for each Ingress in input order.
+        """
+        return self.convert_many(iter_documents(content, selector, on_skip), on_skip)
+
+    def _parse_annotations(
+        self, annotations: dict[str, Any]
+    ) -> tuple[list[str], list[dict[str, str]]]:
+        """Return the warnings and unsupported annotations of an annotation set."""
+        try:
+            key = tuple(annotations.items()) if annotations else ()
+            cached = self._annotations.get(key)
+        except TypeError:
+            # Values that are not hashable, such as lists, are never cached
+            key = cached = None
+
+        if cached is None:
+            parsed = parse_annotations(annotations)
+            cached = (get_annotation_warnings(parsed), parsed.get("unsupported", []))
+            if key is not None and len(self._annotations) < self._annotation_cache_size:
+                self._annotations[key] = cached
+
+        # Results are handed out as copies so callers cannot alter the cache
+        warnings, unsupported = cached
+        return list(warnings), [dict(item) for item in unsupported]
+
+
+def convert_document(
+    ingress: dict[str, Any],
+    provider: str,
+    detect_grpc: bool = False,
+    do_validate: bool = True,
+    regex_paths: bool = False,
+) -> ConversionResult:
+    """Run the full conversion pipeline for a single Ingress.
+
+    To convert many Ingresses, a ConversionSession avoids repeating the
+    per-call setup.
+
+    Args:
+        ingress: A dictionary representing a Kubernetes Ingress resource.
+        provider: Gateway provider preset (e.g., 'istio', 'nginx', 'envoy').
+        detect_grpc: Whether to detect and convert gRPC backends to GRPCRoutes.
+        do_validate: Whether to validate the input Ingress.
+        regex_paths: Whether to read ImplementationSpecific paths as
+            ingress-nginx regexes and GCE or ALB wildcards.
+
+    Returns:
+        A ConversionResult. If input validation fails, resources is None and
+        errors holds the validation errors.
+    """
+    session = ConversionSession(provider, detect_grpc, do_validate, regex_paths=regex_paths)
+    return session.convert(ingress)
+
+
+def convert_stream(
+    content: str | IO[str],
+    provider: str,
+    detect_grpc: bool = False,
+    do_validate: bool = True,
+    on_skip: Callable[[str], None] | None = None,
+    selector: Selector | None = None,
+    regex_paths: bool = False,
+) -> Iterator[ConversionResult]:
+    """Convert multi-document input one Ingress at a time.
+
+    Args:
+        content: A YAML or JSON string, or an open text stream.
+        provider: Gateway provider preset.
+        detect_grpc: Whether to detect and convert gRPC backends to GRPCRoutes.
+        do_validate: Whether to validate each input Ingress.
+        on_skip: Optional callback invoked with the kind of each skipped
+            non-Ingress document.
+        selector: Optional selector pushed down to the document splitter so
+            unselected documents are never fully parsed.
+        regex_paths: Whether to read ImplementationSpecific paths as
+            ingress-nginx regexes and GCE or ALB wildcards.
+
+    Yields:
+        A ConversionResult for each Ingress in input order.
+    """
+    session = ConversionSession(provider, detect_grpc, do_validate, regex_paths=regex_paths)
+    return session.convert_stream(content, selector, on_skip)
+
+
+def skip_failures(
+    results: Iterable[ConversionResult],
+    do_validate: bool,
+    failures: list[ConversionResult],
+) -> Iterator[ConversionResult]:
+    """Skip results that fail input or output validation, collecting them.
+
+    Output is validated per Ingress, so a failure can be attributed to the
+    Ingress that caused it.
+
+    Args:
+        results: Conversion results, typically from convert_stream.
+        do_validate: Whether to validate the output of each result.
+        failures: List the failed results are appended to, with their
+            input or output validation errors.
+
+    Yields:
+        The results that passed validation.
+    """
+    for result in results:
+        if result.is_valid and do_validate:
+            output_validation = validate_conversion_output(result.compact_resources())
+            if not output_validation.is_valid:
+                result = ConversionResult(result.ingress, errors=output_validation.errors)
+        if result.is_valid:
+            yield result
+        else:
+            failures.append(result)
+
+
+def merge_results(
+    results: Iterable[ConversionResult],
+    store: ResourceStore | None = None,
+    consolidator: GatewayConsolidator | None = None,
+) -> ConversionResult | None:
+    """Merge per-Ingress results into a single combined result.
+
+    Only the first Gateway is kept, unless a consolidator is given; routes,
+    warnings and unsupported annotations from every Ingress are concatenated
+    in input order.
+
+    Args:
+        results: Conversion results, typically from convert_stream.
+        store: Optional store to spill routes, warnings and unsupported
+            annotations into. The merged lists are then views of the store
+            rather than lists in memory. Without a store the route lists are
+            RouteLists, which hold the routes compactly.
+        consolidator: Optional consolidator every Gateway is merged into. The
+            merged result then has all consolidated Gateways under
+            'gateways', the first of them as 'gateway', and routes pointed
+            at them.
+
+    Returns:
+        The merged result, whose ingress is the first Ingress converted. If a
+        result failed validation, merging stops and that result is returned.
+        Returns None if there were no results.
+    """
+    merged = None
+    for result in results:
+        if not result.is_valid:
+            return result
+
+        # Routes the converter built as IR objects are merged as such
+        resources = result.compact_resources()
+        if merged is None:
+            routes = (
+                {"httproutes": RouteList(), "grpcroutes": RouteList()}
+                if store is None
+                else {"httproutes": store.view("HTTPRoute"), "grpcroutes": store.view("GRPCRoute")}
+            )
+            merged = ConversionResult(
+                result.ingress, resources={"gateway": resources["gateway"], **routes}
+            )
+            if store is not None:
+                merged.warnings = store.messages("warning")
+                merged.unsupported = store.messages("unsupported")
+        if store is None:
+            merged.resources["httproutes"].extend(resources["httproutes"])
+            merged.resources["grpcroutes"].extend(resources["grpcroutes"])
+        else:
+            # The store keeps routes as JSON documents
+            store.add_all(result.resources["httproutes"])
+            store.add_all(resources["grpcroutes"])
+        if consolidator is not None:
+            consolidator.add(
+                resources["gateway"], [*resources["httproutes"], *resources["grpcroutes"]]
+            )
+        if store is None:
+            merged.warnings.extend(result.warnings)
+            merged.unsupported.extend(result.unsupported)
+        else:
+            store.add_messages("warning", result.warnings)
+            store.add_messages("unsupported", result.unsupported)
+
+    if merged is not None and consolidator is not None:
+        gateways = consolidator.gateways()
+        merged.resources.update(
+            gateway=gateways[0],
+            gateways=gateways,
+            httproutes=consolidator.routes(merged.resources["httproutes"]),
+            grpcroutes=consolidator.routes(merged.resources["grpcroutes"]),
+        )
+    return merged
@@ -96,8 +96,11 @@ def get_gateway_class(provider: str) -> str:
 
 def apply_provider_defaults(gateway: dict[str, Any], provider: str) -> dict[str, Any]:
     """Apply provider-specific defaults to a Gateway resource."""
-    config = get_provider(provider)
+    return apply_provider_config(gateway, get_provider(provider))
 
+
+def apply_provider_config(gateway: dict[str, Any], config: dict[str, Any]) -> dict[str, Any]:
+    """Apply an already looked-up provider configuration to a Gateway resource."""
     # Update gateway class
     gateway["spec"]["gatewayClassName"] = config["gateway_class"]
 
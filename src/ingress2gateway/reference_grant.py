@@ -1,19 +1,28 @@
 """ReferenceGrant generation for cross-namespace references."""
 
+from collections.abc import Iterable, Iterator
+from itertools import chain
 from typing import Any
 
 
 def detect_cross_namespace_refs(
-    gateway: dict[str, Any],
-    httproutes: list[dict[str, Any]],
-    grpcroutes: list[dict[str, Any]] | None = None,
-    tcproutes: list[dict[str, Any]] | None = None,
+    gateway: dict[str, Any] | list[dict[str, Any]],
+    httproutes: Iterable[dict[str, Any]],
+    grpcroutes: Iterable[dict[str, Any]] | None = None,
+    tcproutes: Iterable[dict[str, Any]] | None = None,
 ) -> list[dict[str, str]]:
     """Detect cross-namespace references that need ReferenceGrants."""
-    refs: list[dict[str, str]] = []
-    gateway_namespace = gateway.get("metadata", {}).get("namespace", "default")
+    return list(_iter_cross_namespace_refs(gateway, httproutes, grpcroutes, tcproutes))
 
-    all_routes = httproutes + (grpcroutes or []) + (tcproutes or [])
+
+def _iter_cross_namespace_refs(
+    gateway: dict[str, Any] | list[dict[str, Any]],
+    httproutes: Iterable[dict[str, Any]],
+    grpcroutes: Iterable[dict[str, Any]] | None = None,
+    tcproutes: Iterable[dict[str, Any]] | None = None,
+) -> Iterator[dict[str, str]]:
+    """Lazily detect cross-namespace references, routes first."""
+    all_routes = chain(httproutes, grpcroutes or [], tcproutes or [])
 
     for route in all_routes:
         route_namespace = route.get("metadata", {}).get("namespace", "default")
@@ -23,7 +32,7 @@ def detect_cross_namespace_refs(
         for parent_ref in route.get("spec", {}).get("parentRefs", []):
             parent_ns = parent_ref.get("namespace", route_namespace)
             if parent_ns != route_namespace:
-                refs.append(
+                yield (
                     {
                         "from_namespace": route_namespace,
                         "from_kind": route_kind,
@@ -38,7 +47,7 @@ def detect_cross_namespace_refs(
             for backend_ref in rule.get("backendRefs", []):
                 backend_ns = backend_ref.get("namespace")
                 if backend_ns and backend_ns != route_namespace:
-                    refs.append(
+                    yield (
                         {
                             "from_namespace": route_namespace,
                             "from_kind": route_kind,
@@ -48,23 +57,23 @@ def detect_cross_namespace_refs(
                         }
                     )
 
-    # Check TLS certificate refs
-    for listener in gateway.get("spec", {}).get("listeners", []):
-        tls = listener.get("tls", {})
-        for cert_ref in tls.get("certificateRefs", []):
-            cert_ns = cert_ref.get("namespace")
-            if cert_ns and cert_ns != gateway_namespace:
-                refs.append(
-                    {
-                        "from_namespace": gateway_namespace,
-                        "from_kind": "Gateway",
-                        "to_namespace": cert_ns,
-                        "to_kind": cert_ref.get("kind", "Secret"),
-                        "to_name": cert_ref.get("name", ""),
-                    }
-                )
-
-    return refs
+    # Check TLS certificate refs of every Gateway
+    for gw in [gateway] if isinstance(gateway, dict) else gateway:
+        gateway_namespace = gw.get("metadata", {}).get("namespace", "default")
+        for listener in gw.get("spec", {}).get("listeners", []):
+            tls = listener.get("tls", {})
+            for cert_ref in tls.get("certificateRefs", []):
+                cert_ns = cert_ref.get("namespace")
+                if cert_ns and cert_ns != gateway_namespace:
+                    yield (
+                        {
+                            "from_namespace": gateway_namespace,
+                            "from_kind": "Gateway",
+                            "to_namespace": cert_ns,
+                            "to_kind": cert_ref.get("kind", "Secret"),
+                            "to_name": cert_ref.get("name", ""),
+                        }
+                    )
 
 
 def create_reference_grant(
@@ -108,17 +117,28 @@ def create_reference_grant(
 
 
 def generate_reference_grants(
-    gateway: dict[str, Any],
-    httproutes: list[dict[str, Any]],
-    grpcroutes: list[dict[str, Any]] | None = None,
-    tcproutes: list[dict[str, Any]] | None = None,
+    gateway: dict[str, Any] | list[dict[str, Any]],
+    httproutes: Iterable[dict[str, Any]],
+    grpcroutes: Iterable[dict[str, Any]] | None = None,
+    tcproutes: Iterable[dict[str, Any]] | None = None,
 ) -> list[dict[str, Any]]:
-    """Generate all required ReferenceGrant resources."""
-    refs = detect_cross_namespace_refs(gateway, httproutes, grpcroutes, tcproutes)
+    """Generate all required ReferenceGrant resources.
+
+    gateway may also be a list of Gateways, such as consolidated ones, whose
+    certificate references are all checked. Routes may be any iterables,
+    such as generators or store views; they are consumed in a single pass
+    and only the grouped references are kept.
+    """
+    return group_reference_grants(
+        _iter_cross_namespace_refs(gateway, httproutes, grpcroutes, tcproutes)
+    )
+
 
-    if not refs:
-        return []
+def group_reference_grants(refs: Iterable[dict[str, str]]) -> list[dict[str, Any]]:
+    """Generate the ReferenceGrants for references from detect_cross_namespace_refs().
 
+    refs may be collected piecemeal, such as while streaming documents out.
+    """
     # Group refs by (from_namespace, to_namespace, to_kind)
     grouped: dict[tuple[str, str, str], dict[str, Any]] = {}
 
@@ -3,6 +3,9 @@
 from datetime import datetime
 from typing import Any
 
+from .hostnames import ListenerIndex
+from .ir import Route, iter_compact
+
 
 def generate_migration_report(
     ingress: dict[str, Any],
@@ -27,8 +30,23 @@ def generate_migration_report(
     namespace = ingress_meta.get("namespace", "default")
 
     gateway = resources.get("gateway", {})
-    httproutes = resources.get("httproutes", [])
+    gateways = resources.get("gateways") or [gateway]
+    listeners = [
+        listener for gw in gateways for listener in gw.get("spec", {}).get("listeners", [])
+    ]
+    # Routes held as IR are read without building their dictionaries
+    httproutes = list(iter_compact(resources.get("httproutes", [])))
     grpcroutes = resources.get("grpcroutes", [])
+    # Consolidated listeners may be spread over several Gateways
+    shards = f"- **Gateways**: {len(gateways)}\n" if len(gateways) > 1 else ""
+
+    # Listeners each HTTPRoute attaches to, and the number of routes per listener
+    index = ListenerIndex(gateways)
+    attached = [index.accepting(route) for route in httproutes]
+    route_counts: dict[int, int] = {}
+    for accepting in attached:
+        for listener in accepting or []:
+            route_counts[id(listener)] = route_counts.get(id(listener), 0) + 1
 
     report = f"""# Migration Report: {ingress_name}
 
@@ -52,44 +70,35 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
 - **Name**: `{gateway.get("metadata", {}).get("name", "N/A")}`
 - **Gateway Class**: `{gateway.get("spec", {}).get("gatewayClassName", "N/A")}`
-- **Listeners**: {len(gateway.get("spec", {}).get("listeners", []))}
-
+- **Listeners**: {len(listeners)}
+{shards}
 """
 
     # List listeners
-    listeners = gateway.get("spec", {}).get("listeners", [])
     if listeners:
         report += "#### Listeners\n\n"
-        report += "| Name | Port | Protocol | Hostname |\n"
-        report += "|------|------|----------|----------|\n"
+        report += "| Name | Port | Protocol | Hostname | Routes |\n"
+        report += "|------|------|----------|----------|--------|\n"
         for listener in listeners:
-            report += f"| {listener.get('name', 'N/A')} | {listener.get('port', 'N/A')} | {listener.get('protocol', 'N/A')} | {listener.get('hostname', '*')} |\n"
+            report += f"| {listener.get('name', 'N/A')} | {listener.get('port', 'N/A')} | {listener.get('protocol', 'N/A')} | {listener.get('hostname', '*')} | {route_counts.get(id(listener), 0)} |\n"
         report += "\n"
 
     # HTTPRoutes
     if httproutes:
         report += "### HTTPRoutes\n\n"
-        for i, route in enumerate(httproutes, 1):
-            route_meta = route.get("metadata", {})
-            route_spec = route.get("spec", {})
-            hostnames = route_spec.get("hostnames", ["*"])
-            rules_count = len(route_spec.get("rules", []))
+        for i, (route, accepting) in enumerate(zip(httproutes, attached), 1):
+            name, hostnames, rules = _describe_route(route)
 
-            report += f"#### {i}. `{route_meta.get('name', 'N/A')}`\n\n"
+            report += f"#### {i}. `{name}`\n\n"
             report += f"- **Hostnames**: {', '.join(hostnames)}\n"
-            report += f"- **Rules**: {rules_count}\n"
-
-            for j, rule in enumerate(route_spec.get("rules", []), 1):
-                matches = rule.get("matches", [{}])
-                backends = rule.get("backendRefs", [])
-                path = matches[0].get("path", {}).get("value", "/") if matches else "/"
+            if accepting is not None:
+                names = ", ".join(f"`{listener.get('name')}`" for listener in accepting) or "none"
+                report += f"- **Listeners**: {names}\n"
+            report += f"- **Rules**: {len(rules)}\n"
 
+            for j, (path, backend) in enumerate(rules, 1):
                 report += f"  - Rule {j}: `{path}` → "
-                if backends:
-                    backend = backends[0]
-                    report += f"`{backend.get('name', 'N/A')}:{backend.get('port', 80)}`\n"
-                else:
-                    report += "No backend\n"
+                report += f"`{backend}`\n" if backend else "No backend\n"
 
             report += "\n"
 
@@ -156,6 +165,35 @@ curl -H "Host: <hostname>" http://<gateway-ip>/
     return report
 
 
+def _describe_route(
+    route: Route | dict[str, Any],
+) -> tuple[str, list[str], list[tuple[str, str | None]]]:
+    """Return the name and hostnames of an HTTPRoute, and the path and first backend of each rule."""
+    if isinstance(route, Route):
+        rules = [
+            (
+                rule.matches[0].value if rule.matches else "/",
+                f"{rule.backend_refs[0].name}:{rule.backend_refs[0].port}"
+                if rule.backend_refs
+                else None,
+            )
+            for rule in route.rules
+        ]
+        return route.name, list(route.hostnames or ["*"]), rules
+
+    spec = route.get("spec", {})
+    rules = []
+    for rule in spec.get("rules", []):
+        matches = rule.get("matches", [{}])
+        backends = rule.get("backendRefs", [])
+        path = matches[0].get("path", {}).get("value", "/") if matches else "/"
+        backend = (
+            f"{backends[0].get('name', 'N/A')}:{backends[0].get('port', 80)}" if backends else None
+        )
+        rules.append((path, backend))
+    return route.get("metadata", {}).get("name", "N/A"), spec.get("hostnames", ["*"]), rules
+
+
 def generate_diff_summary(
     ingress: dict[str, Any], resources: dict[str, Any]
 ) -> list[dict[str, Any]]:
@@ -1,9 +1,14 @@
 """Reverse conversion: Gateway API to Ingress."""
 
-from typing import Any
+import json
+from typing import IO, Any
 
 import yaml
 
+from . import serializer
+from .pipeline import iter_documents
+from .splitter import Selector
+
 
 def convert_gateway_to_ingress(
     gateway: dict[str, Any],
@@ -131,10 +136,15 @@ def _map_path_type(gateway_path_type: str) -> str:
 
 
 def parse_gateway_resources(
-    yaml_content: str,
+    yaml_content: str | IO[str],
+    selector: Selector | None = None,
 ) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
     """
-    Parse YAML content containing Gateway API resources.
+    Parse YAML or JSON content containing Gateway API resources.
+
+    List objects such as ``kubectl get -o json`` output are expanded. When a
+    selector is given, documents that cannot match it are skipped before
+    being fully parsed.
 
     Returns tuple of (gateway, httproutes).
     """
@@ -142,9 +152,11 @@ def parse_gateway_resources(
     httproutes = []
 
     try:
-        documents = list(yaml.safe_load_all(yaml_content))
+        documents = list(iter_documents(yaml_content, selector))
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML: {e}")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}")
 
     for doc in documents:
         if not doc:
@@ -178,4 +190,4 @@ def gateway_resources_to_ingress_yaml(
 ) -> str:
     """Convert Gateway API resources to Ingress YAML string."""
     ingress = convert_gateway_to_ingress(gateway, httproutes)
-    return yaml.dump(ingress, default_flow_style=False, sort_keys=False)
+    return serializer.dump(ingress)
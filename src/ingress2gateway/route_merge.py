@@ -0,0 +1,189 @@
+"""HTTPRoute merging.
+
+The converter emits one HTTPRoute per Ingress rule, so Ingresses that share
+a host give as many routes with the same hostnames. merge_httproutes()
+merges the rules of routes with the same parents and hostnames into as few
+HTTPRoutes as possible, and folds groups with identical rules into one route
+with several hostnames.
+
+A route is split again when it would exceed the Gateway API's limit of 16
+rules or a byte budget per object. Routes are merged and split in input
+order, so the same input always gives the same routes.
+
+Routes are only merged when nothing but their names and rules differ. Rules
+are taken from the routes in order of route name, which is how the Gateway
+API breaks ties between equally specific rules of different routes created
+together, so the same rule keeps matching a request.
+"""
+
+import json
+from collections.abc import Iterable
+from typing import Any
+
+# The Gateway API allows at most this many rules per HTTPRoute
+MAX_RULES = 16
+
+# Default size budget of a merged route, as compact JSON
+DEFAULT_MAX_BYTES = 64 * 1024
+
+
+def merge_httproutes(
+    routes: Iterable[dict[str, Any]],
+    max_rules: int = MAX_RULES,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> list[dict[str, Any]]:
+    """Merge HTTPRoutes that share their parents and hostnames.
+
+    Routes are grouped by namespace, parentRefs, the set of hostnames and
+    any other metadata and spec fields. The rules of a group are
+    concatenated, dropping exact duplicates. Groups with hostnames whose
+    rules are then identical are folded into one route listing all their
+    hostnames. Each merged route takes the name of the first of its routes;
+    further routes split off it, or merged routes whose name is otherwise
+    taken, are numbered '<name>-2', '<name>-3' and so on. Other documents
+    and routes that need no merging are kept as given.
+
+    Args:
+        routes: Generated routes; routes of other kinds are passed through.
+        max_rules: Most rules per merged route.
+        max_bytes: Size budget of a merged route as compact JSON. A route
+            holding a single rule may exceed it.
+
+    Returns:
+        The merged routes, in order of the first route of each group.
+    """
+    if max_rules < 1:
+        raise ValueError("max_rules must be at least 1")
+
+    # Each slot holds either a route kept as is or the key of a group
+    slots: list[dict[str, Any] | tuple] = []
+    groups: dict[tuple, list[dict[str, Any]]] = {}
+    for route in routes:
+        spec = route.get("spec") or {}
+        if route.get("kind") != "HTTPRoute" or not isinstance(spec.get("rules"), list):
+            slots.append(route)
+            continue
+        key = (_shape(route), tuple(sorted(set(spec.get("hostnames") or []))))
+        if key not in groups:
+            groups[key] = []
+            slots.append(key)
+        groups[key].append(route)
+
+    # Fold groups with hostnames and identical rules into the first of them
+    rules: dict[tuple, list[dict[str, Any]]] = {}
+    hostnames: dict[tuple, list[str]] = {}
+    folded: dict[tuple, tuple] = {}
+    for key, members in list(groups.items()):
+        rules[key] = _merged_rules(members)
+        hostnames[key] = list(
+            dict.fromkeys(h for route in members for h in route["spec"].get("hostnames") or [])
+        )
+        if not key[1]:
+            continue
+        fold_key = (key[0], tuple(_dump(rule) for rule in rules[key]))
+        target = folded.setdefault(fold_key, key)
+        if target != key:
+            groups[target].extend(members)
+            hostnames[target].extend(h for h in hostnames[key] if h not in hostnames[target])
+            del groups[key]
+
+    merged: list[dict[str, Any]] = []
+    kept: set[int] = set()
+    for slot in slots:
+        if isinstance(slot, tuple) and slot not in groups:
+            continue
+        if isinstance(slot, tuple):
+            members = groups[slot]
+            route = members[0]
+            if (
+                len(members) > 1
+                or len(route["spec"]["rules"]) != len(rules[slot])
+                or len(rules[slot]) > max_rules
+                or len(_dump(route)) > max_bytes
+            ):
+                merged.extend(_split(members, rules[slot], hostnames[slot], max_rules, max_bytes))
+                continue
+            slot = route
+        kept.add(len(merged))
+        merged.append(slot)
+    return _unique_names(merged, kept)
+
+
+def _shape(route: dict[str, Any]) -> str:
+    """Everything about a route except its name, hostnames and rules."""
+    metadata = {k: v for k, v in (route.get("metadata") or {}).items() if k != "name"}
+    spec = {k: v for k, v in route["spec"].items() if k not in ("hostnames", "rules")}
+    rest = {k: v for k, v in route.items() if k not in ("metadata", "spec")}
+    return _dump({"route": rest, "metadata": metadata, "spec": spec})
+
+
+def _merged_rules(members: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Concatenate the rules of routes in order of route name, without duplicates."""
+    ordered = sorted(members, key=lambda route: route["metadata"].get("name", ""))
+    rules = {}
+    for route in ordered:
+        for rule in route["spec"]["rules"]:
+            rules.setdefault(_dump(rule), rule)
+    return list(rules.values())
+
+
+def _split(
+    members: list[dict[str, Any]],
+    rules: list[dict[str, Any]],
+    hostnames: list[str],
+    max_rules: int,
+    max_bytes: int,
+) -> list[dict[str, Any]]:
+    """Build the routes of a group, starting a new one at either limit."""
+    first = min(members, key=lambda route: route["metadata"].get("name", ""))
+    name = first["metadata"].get("name", "route")
+    spec = {k: v for k, v in first["spec"].items() if k != "rules"}
+    if "hostnames" in spec:
+        spec["hostnames"] = hostnames
+
+    base_size = len(_dump({**first, "spec": {**spec, "rules": []}}))
+    chunks: list[list[dict[str, Any]]] = [[]]
+    size = base_size
+    for rule in rules:
+        rule_size = len(_dump(rule)) + 1
+        chunk = chunks[-1]
+        if chunk and (len(chunk) >= max_rules or size + rule_size > max_bytes):
+            chunks.append([])
+            size = base_size
+        chunks[-1].append(rule)
+        size += rule_size
+
+    # All take the group's name; _unique_names() numbers them
+    metadata = {**first["metadata"], "name": name}
+    return [{**first, "metadata": metadata, "spec": {**spec, "rules": chunk}} for chunk in chunks]
+
+
+def _unique_names(routes: list[dict[str, Any]], kept: set[int]) -> list[dict[str, Any]]:
+    """Number merged routes whose name is taken in their namespace.
+
+    A merged route keeps its name if it is free, else takes the first free
+    '<name>-2', '<name>-3' and so on. Routes kept as given, whose positions
+    are in kept, are never renamed.
+    """
+
+    def key(route: dict[str, Any], name: str) -> tuple[str, str, str]:
+        return (route.get("kind", ""), (route.get("metadata") or {}).get("namespace", ""), name)
+
+    taken = {key(routes[i], (routes[i].get("metadata") or {}).get("name", "")) for i in kept}
+    unique = []
+    for index, route in enumerate(routes):
+        if index not in kept:
+            name = candidate = route["metadata"].get("name", "")
+            count = 2
+            while key(route, candidate) in taken:
+                candidate = f"{name}-{count}"
+                count += 1
+            taken.add(key(route, candidate))
+            if candidate != name:
+                route = {**route, "metadata": {**route["metadata"], "name": candidate}}
+        unique.append(route)
+    return unique
+
+
+def _dump(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
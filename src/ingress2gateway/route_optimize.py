@@ -0,0 +1,226 @@
+"""HTTPRoute match optimization.
+
+The converter emits one rule with a single match per Ingress path. With
+regex_paths, it keeps ImplementationSpecific paths that use regex syntax as
+RegularExpression matches on Ingresses that enable ingress-nginx regexes,
+which proxies evaluate one by one. optimize_httproute() makes a route's rule
+table smaller and cheaper to evaluate without changing which backend serves
+a request:
+
+- RegularExpression matches that only match a literal path, or a path and
+  everything below it, become Exact or PathPrefix matches. Regexes are taken
+  to match the whole path, as Envoy-based implementations do, so a trailing
+  '/*' or '/.*' wildcard is not a prefix and stays a regex.
+- Rules are ordered from the most specific match to the least.
+- Rules that differ only in their matches are merged into one rule.
+
+The Gateway API picks the most specific of all matching rules, and only
+falls back to rule order between matches of equal precedence. Rules are
+therefore never moved past a rule with a match of the same precedence, nor
+past a rule with a RegularExpression match, whose precedence is up to the
+implementation.
+"""
+
+import json
+from collections.abc import Iterable
+from typing import Any
+
+# The Gateway API allows at most this many matches per rule
+MAX_MATCHES = 64
+
+# Characters with a special meaning in a regex
+_METACHARACTERS = frozenset(".^$*+?()[]{}|")
+
+# Regex suffixes that match the end of a path segment and anything below it,
+# so that '<path><suffix>' matches what PathPrefix '<path>' does
+_PREFIX_SUFFIXES = ("(/.*)?", "(/.*|$)", "($|/.*)", "(/|$).*", "(/|$)(.*)")
+
+# Exact matches take precedence over PathPrefix matches of any length
+_PATH_TYPE_RANKS = {"Exact": 2, "PathPrefix": 1}
+
+
+def optimize_httproutes(routes: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Optimize the rules of each HTTPRoute with optimize_httproute()."""
+    return [optimize_httproute(route) for route in routes]
+
+
+def optimize_httproute(route: dict[str, Any]) -> dict[str, Any]:
+    """Demote regex matches, then order and merge the rules of an HTTPRoute.
+
+    A rule is merged into an earlier rule with the same backendRefs, filters
+    and other fields, unless a rule in between has a match of the same
+    precedence or the merged rule would exceed 64 matches. Identical
+    matches are only kept once.
+
+    Args:
+        route: A route; documents of other kinds are returned as given.
+
+    Returns:
+        The optimized route, or the given route if nothing changed. The
+        given route is not modified.
+    """
+    spec = route.get("spec") or {}
+    rules = spec.get("rules")
+    if route.get("kind") != "HTTPRoute" or not isinstance(rules, list):
+        return route
+    optimized = _merge_rules(_order_rules([_demote_rule(rule) for rule in rules]))
+    if optimized == rules:
+        return route
+    return {**route, "spec": {**spec, "rules": optimized}}
+
+
+def demote_regex(pattern: str) -> tuple[str, str] | None:
+    """Find an Exact or PathPrefix match for a path regex.
+
+    Args:
+        pattern: A regex matched against the whole path; '^' and '$'
+            anchors are allowed.
+
+    Returns:
+        A (type, value) path match matching the same paths, or None if the
+        regex needs to stay one.
+    """
+    if pattern.startswith("^"):
+        pattern = pattern[1:]
+    if pattern.endswith("$") and not _escaped(pattern, len(pattern) - 1):
+        pattern = pattern[:-1]
+
+    literal = _literal(pattern)
+    if literal is not None and literal.startswith("/"):
+        return "Exact", literal
+    if pattern in (".*", "/.*"):
+        return "PathPrefix", "/"
+    for suffix in _PREFIX_SUFFIXES:
+        if pattern.endswith(suffix):
+            literal = _literal(pattern[: -len(suffix)])
+            if literal == "":
+                return "PathPrefix", "/"
+            # PathPrefix matching ignores a trailing slash, the regex does not
+            if literal is not None and literal.startswith("/") and not literal.endswith("/"):
+                return "PathPrefix", literal
+    return None
+
+
+def _demote_rule(rule: dict[str, Any]) -> dict[str, Any]:
+    """Replace the regex matches of a rule that demote_regex() can demote."""
+    matches = rule.get("matches")
+    if not matches:
+        return rule
+    demoted = [_demote_match(match) for match in matches]
+    if all(new is old for new, old in zip(demoted, matches)):
+        return rule
+    return {**rule, "matches": demoted}
+
+
+def _demote_match(match: dict[str, Any]) -> dict[str, Any]:
+    path = match.get("path") or {}
+    if path.get("type") != "RegularExpression":
+        return match
+    demoted = demote_regex(path.get("value", ""))
+    if demoted is None:
+        return match
+    return {**match, "path": {"type": demoted[0], "value": demoted[1]}}
+
+
+def _order_rules(rules: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Move rules ahead of less specific ones, where that cannot change a match."""
+    keys = [_precedences(rule) for rule in rules]
+    order: list[int] = []
+    for index, own in enumerate(keys):
+        position = len(order)
+        if own is not None:
+            rank = max(own)
+            while position > 0:
+                other = keys[order[position - 1]]
+                if other is None or other & own or max(other) >= rank:
+                    break
+                position -= 1
+        order.insert(position, index)
+    return [rules[index] for index in order]
+
+
+def _merge_rules(rules: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Merge rules that differ only in their matches into the first of them."""
+    merged: list[dict[str, Any]] = []
+    keys: list[frozenset | None] = []
+    # Rule each combination of backendRefs, filters and so on is merged into
+    targets: dict[str, int] = {}
+    for rule in rules:
+        own = _precedences(rule)
+        matches = rule.get("matches")
+        if own is None or not matches:
+            merged.append(rule)
+            keys.append(own)
+            continue
+
+        action = _dump({k: v for k, v in rule.items() if k != "matches"})
+        target = targets.get(action)
+        if target is not None and not any(
+            other is None or other & own for other in keys[target + 1 :]
+        ):
+            combined = list(merged[target]["matches"])
+            combined.extend(match for match in matches if match not in combined)
+            if len(combined) <= MAX_MATCHES:
+                merged[target] = {**merged[target], "matches": combined}
+                keys[target] = keys[target] | own
+                continue
+
+        targets[action] = len(merged)
+        merged.append(rule)
+        keys.append(own)
+    return merged
+
+
+def _precedences(rule: dict[str, Any]) -> frozenset | None:
+    """Return the precedence of each match of a rule, or None for a regex match.
+
+    Precedence is ordered like the Gateway API orders matches: by path type,
+    path length, method, and the number of header and query parameter
+    matches.
+    """
+    precedences = set()
+    # A rule without matches matches every path
+    for match in rule.get("matches") or [{}]:
+        path = match.get("path") or {}
+        rank = _PATH_TYPE_RANKS.get(path.get("type", "PathPrefix"))
+        if rank is None:
+            return None
+        precedences.add(
+            (
+                rank,
+                len(path.get("value", "/")),
+                "method" in match,
+                len(match.get("headers") or []),
+                len(match.get("queryParams") or []),
+            )
+        )
+    return frozenset(precedences)
+
+
+def _literal(pattern: str) -> str | None:
+    """Return the only string a regex matches, or None if it has regex syntax."""
+    chars = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            # Only escaped punctuation is literal; '\d', '\w' and so on are not
+            if index + 1 == len(pattern) or pattern[index + 1].isalnum():
+                return None
+            char = pattern[index + 1]
+            index += 1
+        elif char in _METACHARACTERS:
+            return None
+        chars.append(char)
+        index += 1
+    return "".join(chars)
+
+
+def _escaped(pattern: str, index: int) -> bool:
+    """Check whether the character at index is escaped by a backslash."""
+    backslashes = len(pattern[:index]) - len(pattern[:index].rstrip("\\"))
+    return backslashes % 2 == 1
+
+
+def _dump(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
@@ -0,0 +1,617 @@
+"""Serialization layer for YAML and JSON input and output.
+
+All YAML parsing and emitting goes through this module. When PyYAML was
+built against LibYAML, the C-accelerated CSafeLoader and CSafeDumper are
+used; otherwise the pure-Python SafeLoader and SafeDumper are used. Both
+paths produce identical output for the plain dictionaries, lists and scalars
+handled by the converter.
+
+JSON input, such as the output of ``kubectl get -o json``, is detected
+automatically and parsed with the standard library ``json`` module.
+
+Objects exported from a cluster carry server-side state the converter never
+reads: ``status``, ``metadata.managedFields`` and the
+``kubectl.kubernetes.io/last-applied-configuration`` annotation, which
+together are often larger than the object itself. The loaders drop them,
+including from the items of list objects. YAML subtrees are pruned from the
+parsed node graph before any Python objects are constructed for them.
+
+Input from untrusted sources can be bounded with ParseLimits: the size and
+number of documents, how far aliases may expand and how deeply collections
+may nest. Limits are checked while parsing, so an alias bomb or a deeply
+nested document is rejected with LimitExceeded before it is built. The
+active limits are process-wide; they are read from ``I2G_*`` environment
+variables at import and can be replaced with set_limits().
+"""
+
+import json
+import os
+import textwrap
+from collections.abc import Iterable, Iterator, Mapping
+from typing import IO, Any
+
+import yaml
+from yaml.composer import Composer
+from yaml.events import AliasEvent, ScalarEvent
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    HAS_LIBYAML = True
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeDumper, SafeLoader
+
+    HAS_LIBYAML = False
+
+# Top-level fields and metadata fields of exported objects that are dropped
+# while loading, and annotations that are dropped with them
+STRIPPED_FIELDS = ("status",)
+STRIPPED_METADATA = ("managedFields",)
+STRIPPED_ANNOTATIONS = ("kubectl.kubernetes.io/last-applied-configuration",)
+
+# Emitter options shared by every dump so output is stable across call sites
+DUMP_OPTIONS: dict[str, Any] = {"default_flow_style": False, "sort_keys": False}
+
+OUTPUT_FORMATS = ["yaml", "json", "ndjson"]
+
+# Number of leading characters inspected to tell JSON from YAML input
+_SNIFF_SIZE = 4096
+
+# JSON output is wrapped in a kubectl-style List so it can be streamed
+_JSON_LIST_HEADER = '{\n  "apiVersion": "v1",\n  "kind": "List",\n  "items": [\n'
+_JSON_LIST_FOOTER = "\n  ]\n}\n"
+_JSON_LIST_EMPTY = '{\n  "apiVersion": "v1",\n  "kind": "List",\n  "items": []\n}\n'
+
+
+class LimitExceeded(ValueError):
+    """Raised when input exceeds one of the active parse limits."""
+
+
+class ParseLimits:
+    """Resource limits enforced while parsing input.
+
+    A limit of None disables it. Sizes are counted in characters of the
+    decoded input, which equals bytes for ASCII manifests.
+
+    Attributes:
+        max_document_size: Largest size of a single document.
+        max_documents: Most documents in one input; the items of list
+            objects are not counted separately.
+        max_alias_nodes: Most nodes that aliases may expand to in one
+            document. Nested aliases count at their full expanded size.
+        max_depth: Deepest nesting of mappings and sequences.
+    """
+
+    # Environment variables read by from_env(), by attribute
+    ENV = {
+        "max_document_size": "I2G_MAX_DOCUMENT_SIZE",
+        "max_documents": "I2G_MAX_DOCUMENTS",
+        "max_alias_nodes": "I2G_MAX_ALIAS_NODES",
+        "max_depth": "I2G_MAX_DEPTH",
+    }
+
+    def __init__(
+        self,
+        max_document_size: int | None = None,
+        max_documents: int | None = None,
+        max_alias_nodes: int | None = None,
+        max_depth: int | None = None,
+    ):
+        self.max_document_size = max_document_size
+        self.max_documents = max_documents
+        self.max_alias_nodes = max_alias_nodes
+        self.max_depth = max_depth
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "ParseLimits":
+        """Read limits from ``I2G_*`` environment variables; unset ones are disabled.
+
+        Raises:
+            ValueError: If a variable is not an integer.
+        """
+        values = {}
+        for attribute, name in cls.ENV.items():
+            value = environ.get(name, "").strip()
+            try:
+                values[attribute] = int(value) if value else None
+            except ValueError:
+                raise ValueError(f"{name} must be an integer, got {value!r}")
+        return cls(**values)
+
+    def to_env(self) -> dict[str, str]:
+        """Return the environment variables that from_env() reads these limits from."""
+        return {
+            name: str(getattr(self, attribute))
+            for attribute, name in self.ENV.items()
+            if getattr(self, attribute) is not None
+        }
+
+    def with_defaults(self, defaults: "ParseLimits") -> "ParseLimits":
+        """Return a copy with every disabled limit taken from defaults."""
+        return ParseLimits(
+            **{
+                attribute: getattr(defaults, attribute) if value is None else value
+                for attribute, value in vars(self).items()
+            }
+        )
+
+    def __bool__(self) -> bool:
+        return any(getattr(self, attribute) is not None for attribute in self.ENV)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ParseLimits) and vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{key}={value}" for key, value in vars(self).items())
+        return f"ParseLimits({values})"
+
+    def check_size(self, size: int) -> None:
+        if self.max_document_size is not None and size > self.max_document_size:
+            raise LimitExceeded(
+                f"Document is larger than the limit of {self.max_document_size} bytes"
+            )
+
+    def check_documents(self, count: int) -> None:
+        if self.max_documents is not None and count > self.max_documents:
+            raise LimitExceeded(f"Input has more than the limit of {self.max_documents} documents")
+
+    def check_alias_nodes(self, count: int) -> None:
+        if self.max_alias_nodes is not None and count > self.max_alias_nodes:
+            raise LimitExceeded(
+                f"Aliases expand to more than the limit of {self.max_alias_nodes} nodes"
+            )
+
+    def check_depth(self, depth: int) -> None:
+        if self.max_depth is not None and depth > self.max_depth:
+            raise LimitExceeded(f"Document is nested deeper than the limit of {self.max_depth}")
+
+
+_limits = ParseLimits.from_env()
+
+
+def get_limits() -> ParseLimits:
+    """Return the parse limits currently enforced by the loaders."""
+    return _limits
+
+
+def set_limits(limits: ParseLimits) -> None:
+    """Replace the parse limits enforced by the loaders in this process."""
+    global _limits
+    _limits = limits
+
+
+class _StrippingLoader(SafeLoader):
+    """Safe loader that prunes server-side state before construction."""
+
+    def construct_document(self, node: yaml.Node) -> Any:
+        _prune_node(node)
+        return super().construct_document(node)
+
+
+class _LimitedLoader(_StrippingLoader):
+    """Stripping loader that enforces ParseLimits while composing nodes.
+
+    LibYAML's composer cannot be interrupted and recurses in C, so a deeply
+    nested flow collection can overflow the stack before any check runs.
+    This loader composes the parser's events in Python instead, which is
+    slower, and checks every limit as each node is reached.
+    """
+
+    check_node = Composer.check_node
+    get_node = Composer.get_node
+    get_single_node = Composer.get_single_node
+
+    def __init__(self, stream: str | IO[str], limits: ParseLimits):
+        super().__init__(stream)
+        self.limits = limits
+        self.anchors: dict[str, yaml.Node] = {}
+        self._documents = 0
+        self._start = 0
+        self._depth = 0
+        self._nodes = 0
+        self._alias_nodes = 0
+        self._sizes: dict[int, int] = {}
+
+    def compose_document(self) -> yaml.Node:
+        self._documents += 1
+        self.limits.check_documents(self._documents)
+        self._start = self.peek_event().start_mark.index
+        self._depth = self._nodes = self._alias_nodes = 0
+        self._sizes = {}
+        try:
+            return Composer.compose_document(self)
+        except RecursionError:
+            raise LimitExceeded("Document is nested too deeply to parse")
+
+    def compose_node(self, parent: yaml.Node | None, index: Any) -> yaml.Node:
+        event = self.peek_event()
+        self.limits.check_size(event.end_mark.index - self._start)
+        if isinstance(event, AliasEvent):
+            node = Composer.compose_node(self, parent, index)
+            # Aliases to a collection still being composed are recursive; count them once
+            size = self._sizes.get(id(node), 1)
+            self._nodes += size
+            self._alias_nodes += size
+            self.limits.check_alias_nodes(self._alias_nodes)
+            return node
+
+        collection = not isinstance(event, ScalarEvent)
+        if collection:
+            self._depth += 1
+            self.limits.check_depth(self._depth)
+        before = self._nodes
+        self._nodes += 1
+        node = Composer.compose_node(self, parent, index)
+        if collection:
+            self._depth -= 1
+        if getattr(event, "anchor", None) is not None:
+            self._sizes[id(node)] = self._nodes - before
+        return node
+
+    compose_scalar_node = Composer.compose_scalar_node
+    compose_sequence_node = Composer.compose_sequence_node
+    compose_mapping_node = Composer.compose_mapping_node
+
+
+def _loader(content: str | IO[str]) -> _StrippingLoader:
+    """Create a loader that enforces the active limits, if any."""
+    return _LimitedLoader(content, _limits) if _limits else _StrippingLoader(content)
+
+
+def _prune_node(node: yaml.Node) -> None:
+    """Remove stripped fields from an object node and the items of a list node."""
+    if not isinstance(node, yaml.MappingNode):
+        return
+    kept = []
+    for key, value in node.value:
+        name = key.value if isinstance(key, yaml.ScalarNode) else None
+        if name in STRIPPED_FIELDS:
+            continue
+        if name == "metadata" and isinstance(value, yaml.MappingNode):
+            value.value = [
+                (meta_key, meta_value)
+                for meta_key, meta_value in value.value
+                if not (
+                    isinstance(meta_key, yaml.ScalarNode) and meta_key.value in STRIPPED_METADATA
+                )
+            ]
+            for meta_key, meta_value in value.value:
+                if meta_key.value == "annotations" and isinstance(meta_value, yaml.MappingNode):
+                    meta_value.value = [
+                        (annotation, text)
+                        for annotation, text in meta_value.value
+                        if not (
+                            isinstance(annotation, yaml.ScalarNode)
+                            and annotation.value in STRIPPED_ANNOTATIONS
+                        )
+                    ]
+        elif name == "items" and isinstance(value, yaml.SequenceNode):
+            for item in value.value:
+                _prune_node(item)
+        kept.append((key, value))
+    node.value = kept
+
+
+def strip_document(document: Any) -> Any:
+    """Remove stripped fields from a parsed object and the items of a list, in place.
+
+    Used for JSON input; YAML input is pruned while it is loaded.
+
+    Args:
+        document: A parsed document.
+
+    Returns:
+        The same document.
+    """
+    if not isinstance(document, dict):
+        return document
+    for field in STRIPPED_FIELDS:
+        document.pop(field, None)
+    metadata = document.get("metadata")
+    if isinstance(metadata, dict):
+        for field in STRIPPED_METADATA:
+            metadata.pop(field, None)
+        if isinstance(metadata.get("annotations"), dict):
+            for annotation in STRIPPED_ANNOTATIONS:
+                metadata["annotations"].pop(annotation, None)
+    if isinstance(document.get("items"), list):
+        for item in document["items"]:
+            strip_document(item)
+    return document
+
+
+def load(content: str | IO[str]) -> Any:
+    """Parse a single YAML document, dropping server-side state.
+
+    Args:
+        content: A YAML string or an open text stream.
+
+    Returns:
+        The parsed document.
+
+    Raises:
+        yaml.YAMLError: If the YAML is invalid.
+        LimitExceeded: If the document exceeds a parse limit.
+    """
+    if isinstance(content, str):
+        # A single document is at most the whole text; reject it unparsed
+        _limits.check_size(len(content))
+    loader = _loader(content)
+    try:
+        return loader.get_single_data()
+    finally:
+        loader.dispose()
+
+
+def load_all(content: str | IO[str]) -> Iterator[Any]:
+    """Lazily parse a multi-document YAML string or stream, dropping server-side state.
+
+    Args:
+        content: A YAML string or an open text stream.
+
+    Yields:
+        Each parsed document in input order.
+
+    Raises:
+        yaml.YAMLError: If a document is invalid.
+        LimitExceeded: If the input exceeds a parse limit.
+    """
+    loader = _loader(content)
+    try:
+        while loader.check_data():
+            yield loader.get_data()
+    finally:
+        loader.dispose()
+
+
+def dump(document: Any, sort_keys: bool = False) -> str:
+    """Serialize a single document to YAML.
+
+    Args:
+        document: The document to serialize.
+        sort_keys: Whether to sort mapping keys instead of keeping their order.
+
+    Returns:
+        The YAML string, without a leading document separator.
+    """
+    return yaml.dump(document, Dumper=SafeDumper, **{**DUMP_OPTIONS, "sort_keys": sort_keys})
+
+
+def dump_document(document: Any, output_format: str = "yaml", sort_keys: bool = False) -> str:
+    """Serialize a single document on its own, as written to a per-resource file.
+
+    Unlike iter_serialized, JSON output is the bare object, not a List.
+
+    Args:
+        document: The document to serialize.
+        output_format: One of 'yaml', 'json' or 'ndjson'.
+        sort_keys: Whether to sort mapping keys, for canonical output.
+
+    Returns:
+        The serialized text, ending with a newline.
+
+    Raises:
+        ValueError: If the output format is unknown.
+    """
+    if output_format == "yaml":
+        return dump(document, sort_keys)
+    if output_format == "json":
+        return json.dumps(document, indent=2, sort_keys=sort_keys) + "\n"
+    if output_format == "ndjson":
+        return json.dumps(document, separators=(",", ":"), sort_keys=sort_keys) + "\n"
+    raise ValueError(f"Unknown output format: {output_format}")
+
+
+def dump_all(documents: Iterable[Any]) -> str:
+    """Serialize multiple documents to a multi-document YAML string.
+
+    Args:
+        documents: The documents to serialize.
+
+    Returns:
+        A YAML string with documents separated by '---'.
+    """
+    return yaml.dump_all(documents, Dumper=SafeDumper, **DUMP_OPTIONS)
+
+
+def is_json(content: str) -> bool:
+    """Check whether input text looks like JSON rather than YAML.
+
+    Args:
+        content: The start of the input text.
+
+    Returns:
+        True if the first non-whitespace character opens a JSON object or array.
+    """
+    stripped = content.lstrip()
+    return stripped[:1] in ("{", "[")
+
+
+def is_json_input(content: str | IO[str]) -> bool:
+    """Check whether a string or seekable stream holds JSON input.
+
+    Streams are rewound after their first characters have been inspected.
+
+    Args:
+        content: Input text or a seekable text stream.
+
+    Returns:
+        True if the input looks like JSON.
+    """
+    if isinstance(content, str):
+        return is_json(content[:_SNIFF_SIZE])
+    head = content.read(_SNIFF_SIZE)
+    content.seek(0)
+    return is_json(head)
+
+
+def load_json_all(content: str) -> Iterator[Any]:
+    """Lazily parse one or more concatenated JSON values.
+
+    Handles a single object, a top-level array, and newline-delimited JSON.
+    Top-level arrays are flattened into their elements. Server-side state is
+    dropped from each document as it is parsed.
+
+    Args:
+        content: JSON text.
+
+    Yields:
+        Each parsed document in input order.
+
+    Raises:
+        json.JSONDecodeError: If the JSON is invalid.
+        LimitExceeded: If the input exceeds a parse limit.
+    """
+    limits = _limits
+    decoder = json.JSONDecoder()
+    index = 0
+    length = len(content)
+    documents = 0
+    while True:
+        while index < length and content[index].isspace():
+            index += 1
+        if index >= length:
+            return
+        start = index
+        try:
+            value, index = decoder.raw_decode(content, index)
+        except RecursionError:
+            raise LimitExceeded("Document is nested too deeply to parse")
+        if limits:
+            limits.check_size(index - start)
+            documents += 1
+            limits.check_documents(documents)
+            if limits.max_depth is not None:
+                limits.check_depth(_depth(value, limits.max_depth))
+        if isinstance(value, list):
+            yield from (strip_document(item) for item in value)
+        else:
+            yield strip_document(value)
+
+
+def _depth(value: Any, limit: int) -> int:
+    """Return the nesting depth of a parsed value, stopping once it exceeds limit."""
+    deepest = 0
+    stack = [(value, 1)]
+    while stack:
+        value, depth = stack.pop()
+        if isinstance(value, dict):
+            value = value.values()
+        elif not isinstance(value, list):
+            continue
+        deepest = max(deepest, depth)
+        if depth > limit:
+            break
+        stack.extend((child, depth + 1) for child in value)
+    return deepest
+
+
+def load_documents(content: str | IO[str]) -> Iterator[Any]:
+    """Lazily parse YAML or JSON input into documents.
+
+    JSON is detected from the first non-whitespace character. Seekable
+    YAML streams are parsed incrementally; JSON is read in full since the
+    standard library parser needs the complete text.
+
+    Args:
+        content: Input text or an open text stream.
+
+    Yields:
+        Each parsed document in input order.
+
+    Raises:
+        yaml.YAMLError: If YAML input is invalid.
+        json.JSONDecodeError: If JSON input is invalid.
+        LimitExceeded: If the input exceeds a parse limit.
+    """
+    if not isinstance(content, str) and not content.seekable():
+        content = content.read()
+
+    if not is_json_input(content):
+        yield from load_all(content)
+    else:
+        yield from load_json_all(content if isinstance(content, str) else content.read())
+
+
+def expand_lists(documents: Iterable[Any]) -> Iterator[Any]:
+    """Lazily expand Kubernetes list objects into their items.
+
+    Handles ``kind: List`` as returned by ``kubectl get -o yaml|json`` as
+    well as typed lists such as ``IngressList``.
+
+    Args:
+        documents: Parsed documents.
+
+    Yields:
+        Each document, with list objects replaced by their items.
+    """
+    for doc in documents:
+        if (
+            isinstance(doc, dict)
+            and str(doc.get("kind", "")).endswith("List")
+            and isinstance(doc.get("items"), list)
+        ):
+            yield from doc["items"]
+        else:
+            yield doc
+
+
+def iter_serialized(
+    documents: Iterable[Any],
+    output_format: str = "yaml",
+    sort_keys: bool = False,
+) -> Iterator[str]:
+    """Serialize documents incrementally in the requested output format.
+
+    Chunks are yielded as each document is serialized so output can be
+    streamed. Joining the chunks gives the same text as dump_documents.
+
+    Args:
+        documents: The documents to serialize.
+        output_format: One of 'yaml', 'json' or 'ndjson'. JSON output is a
+            single ``kind: List`` object; NDJSON writes one compact object
+            per line.
+        sort_keys: Whether to sort mapping keys, for canonical output.
+
+    Yields:
+        Serialized text chunks.
+
+    Raises:
+        ValueError: If the output format is unknown.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+
+    first = True
+    for document in documents:
+        if output_format == "yaml":
+            text = dump(document, sort_keys)
+            yield text if first else "---\n" + text
+        elif output_format == "ndjson":
+            yield json.dumps(document, separators=(",", ":"), sort_keys=sort_keys) + "\n"
+        else:
+            item = textwrap.indent(json.dumps(document, indent=2, sort_keys=sort_keys), "    ")
+            yield _JSON_LIST_HEADER + item if first else ",\n" + item
+        first = False
+
+    if output_format == "json":
+        yield _JSON_LIST_EMPTY if first else _JSON_LIST_FOOTER
+
+
+def dump_documents(
+    documents: Iterable[Any],
+    output_format: str = "yaml",
+    sort_keys: bool = False,
+) -> str:
+    """Serialize documents in the requested output format.
+
+    Args:
+        documents: The documents to serialize.
+        output_format: One of 'yaml', 'json' or 'ndjson'.
+        sort_keys: Whether to sort mapping keys, for canonical output.
+
+    Returns:
+        The serialized text.
+    """
+    return "".join(iter_serialized(documents, output_format, sort_keys))
@@ -0,0 +1,329 @@
+"""Background output writing.
+
+Generated documents are handed to an OutputSink as soon as they are
+serialized. A writer thread drains them into the output stream, so output
+I/O overlaps with converting the next documents and the complete output
+never has to be held in memory.
+
+How often the stream is flushed is governed by a flush policy. Regular files
+are only flushed when the sink is closed. Pipes and terminals are flushed
+whenever the writer has caught up with the converter, so a downstream
+consumer such as ``kubectl apply -f -`` sees each document promptly without
+paying for a flush per write.
+"""
+
+import contextlib
+import gzip
+import hashlib
+import io
+import os
+import queue
+import stat
+import tarfile
+import tempfile
+import threading
+from collections.abc import Iterable
+from pathlib import Path, PurePath
+from typing import IO, Any
+
+# 'always' flushes after every chunk, 'idle' whenever no more chunks are
+# queued, and 'close' only when the sink is closed. 'auto' picks 'close' for
+# regular files and 'idle' for anything else.
+FLUSH_POLICIES = ["auto", "always", "idle", "close"]
+
+# Chunks that may be queued before the producer blocks, bounding memory
+_QUEUE_SIZE = 64
+
+
+class OutputSink:
+    """Writes text chunks to a stream from a background thread.
+
+    Use as a context manager; leaving the block waits for all queued chunks
+    to be written and flushes the stream. Errors raised by the stream, such
+    as a full disk or a closed pipe, are re-raised in the producing thread
+    by the next write() or by close().
+
+    Attributes:
+        stream: The text stream written to. It is not closed by the sink.
+        flush: The resolved flush policy ('always', 'idle' or 'close').
+    """
+
+    def __init__(self, stream: IO[str], flush: str = "auto", queue_size: int = _QUEUE_SIZE):
+        if flush not in FLUSH_POLICIES:
+            raise ValueError(f"Unknown flush policy: {flush}")
+
+        self.stream = stream
+        self.flush = _auto_policy(stream) if flush == "auto" else flush
+        self._queue: queue.Queue[str | None] = queue.Queue(maxsize=queue_size)
+        self._error: BaseException | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, chunk: str) -> None:
+        """Queue a chunk of text for writing.
+
+        Raises:
+            ValueError: If the sink is closed.
+            OSError: If an earlier write failed.
+        """
+        if self._closed:
+            raise ValueError("Write to closed output sink")
+        self._raise_error()
+        self._queue.put(chunk)
+
+    def write_all(self, chunks: Iterable[str]) -> None:
+        """Queue every chunk of an iterable for writing."""
+        for chunk in chunks:
+            self.write(chunk)
+
+    def close(self) -> None:
+        """Wait until all queued chunks are written and flush the stream.
+
+        Raises:
+            OSError: If writing or flushing failed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_error()
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Keep what was produced before the failure, but let the original
+        # exception propagate rather than a secondary write error
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _write(self, chunk: str) -> None:
+        self.stream.write(chunk)
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                break
+            if self._error is not None:
+                # Keep draining so the producer never blocks on a full queue
+                continue
+            try:
+                self._write(chunk)
+                if self.flush == "always" or (self.flush == "idle" and self._queue.empty()):
+                    self.stream.flush()
+            except BaseException as e:
+                self._error = e
+
+        if self._error is None:
+            try:
+                self.stream.flush()
+            except BaseException as e:
+                self._error = e
+
+
+class FileSink(OutputSink):
+    """An output sink that replaces a file only if its content changes.
+
+    Output is written to a temporary file in the target's directory. On
+    close, its content hash is compared with the existing file: if they
+    match the temporary file is discarded, leaving the existing file and its
+    modification time untouched; otherwise it atomically replaces the
+    target. Readers never see a partially written file.
+
+    Attributes:
+        path: The target file.
+        written: Whether the target was (re)written; set by close().
+    """
+
+    def __init__(self, path: str | Path, flush: str = "close"):
+        self.path = Path(path)
+        self.written = False
+        self._discarded = False
+        fd, self._temp_path = _temp_file(self.path)
+        super().__init__(os.fdopen(fd, "w"), flush)
+
+    def discard(self) -> None:
+        """Leave the target untouched when the sink is closed."""
+        self._discarded = True
+
+    def close(self) -> None:
+        """Write out queued chunks, then replace the target if it changed.
+
+        Raises:
+            OSError: If writing or replacing the file failed.
+        """
+        if self._closed:
+            return
+        try:
+            super().close()
+        finally:
+            self.stream.close()
+            if self._discarded or self._error is not None:
+                self._temp_path.unlink(missing_ok=True)
+        if not self._discarded:
+            self.written = _replace_if_changed(self._temp_path, self.path)
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is not None:
+            self.discard()
+        super().__exit__(exc_type, exc, traceback)
+
+
+class BundleSink(OutputSink):
+    """An output sink that streams files into a gzip-compressed tar archive.
+
+    Each file is compressed and appended by the writer thread as soon as it
+    is added, so neither the archive nor its files are held in memory. The
+    archive is written to a temporary file and, like with FileSink, only
+    replaces the target if its content changed. Timestamps in the archive
+    are fixed, so the same files always give a byte-identical archive.
+
+    Attributes:
+        path: The target archive.
+        written: Whether the target was (re)written; set by close().
+    """
+
+    def __init__(self, path: str | Path, compresslevel: int = 6):
+        self.path = Path(path)
+        self.written = False
+        self._discarded = False
+        fd, self._temp_path = _temp_file(self.path)
+        archive = os.fdopen(fd, "wb")
+        self._gzip = gzip.GzipFile(
+            filename="", mode="wb", fileobj=archive, compresslevel=compresslevel, mtime=0
+        )
+        self._tar = tarfile.open(fileobj=self._gzip, mode="w|")
+        super().__init__(archive, "close")
+
+    def add(self, name: str | PurePath, text: str) -> None:
+        """Queue a file for adding to the archive."""
+        self.write((str(name), text))
+
+    def add_all(self, files: Iterable[tuple[str | PurePath, str]]) -> None:
+        """Queue every (name, text) pair of an iterable for adding to the archive."""
+        for name, text in files:
+            self.add(name, text)
+
+    def discard(self) -> None:
+        """Leave the target untouched when the sink is closed."""
+        self._discarded = True
+
+    def close(self) -> None:
+        """Add queued files and finish the archive, then replace the target if it changed.
+
+        Raises:
+            OSError: If writing or replacing the archive failed.
+        """
+        if self._closed:
+            return
+        complete = False
+        try:
+            super().close()
+            self._tar.close()
+            self._gzip.close()
+            complete = True
+        finally:
+            if not complete:
+                with contextlib.suppress(Exception):
+                    self._gzip.close()
+            self.stream.close()
+            if self._discarded or not complete:
+                self._temp_path.unlink(missing_ok=True)
+        if not self._discarded:
+            self.written = _replace_if_changed(self._temp_path, self.path)
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is not None:
+            self.discard()
+        super().__exit__(exc_type, exc, traceback)
+
+    def _write(self, chunk: Any) -> None:
+        name, text = chunk
+        data = text.encode()
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+
+
+def write_file(path: str | Path, text: str) -> bool:
+    """Atomically write a file unless it already has exactly this content.
+
+    Args:
+        path: The target file; missing parent directories are created.
+        text: The complete file content.
+
+    Returns:
+        Whether the file was (re)written.
+    """
+    fd, temp_path = _temp_file(Path(path))
+    try:
+        with os.fdopen(fd, "w") as temp_file:
+            temp_file.write(text)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return _replace_if_changed(temp_path, Path(path))
+
+
+def _temp_file(path: Path) -> tuple[int, Path]:
+    """Create a hidden temporary file next to path, which is renamed over it later."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    return fd, Path(temp_path)
+
+
+def _replace_if_changed(temp_path: Path, path: Path) -> bool:
+    """Rename temp_path over path if the content differs, else remove it."""
+    try:
+        if _same_content(temp_path, path):
+            return False
+        os.chmod(temp_path, _file_mode(path))
+        os.replace(temp_path, path)
+        return True
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def _same_content(new: Path, existing: Path) -> bool:
+    """Compare a new file with an existing one by size and SHA-256 digest."""
+    try:
+        if new.stat().st_size != existing.stat().st_size:
+            return False
+        with open(existing, "rb") as old_file:
+            old_digest = hashlib.file_digest(old_file, "sha256").digest()
+    except OSError:
+        return False
+    with open(new, "rb") as new_file:
+        return hashlib.file_digest(new_file, "sha256").digest() == old_digest
+
+
+def _file_mode(path: Path) -> int:
+    """Keep the mode of an existing file, else use the default from the umask."""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _auto_policy(stream: IO[str]) -> str:
+    """Choose 'close' for regular files and 'idle' for pipes and terminals."""
+    try:
+        mode = os.fstat(stream.fileno()).st_mode
+    except (AttributeError, OSError, ValueError):
+        return "idle"
+    return "close" if stat.S_ISREG(mode) else "idle"
@@ -0,0 +1,341 @@
+"""Pre-parse document splitting and selector pushdown.
+
+Cluster dumps usually contain far more non-Ingress documents than Ingresses.
+This module cuts raw YAML input on ``---`` boundaries without parsing it,
+cheaply sniffs ``kind``, ``metadata.namespace`` and the ingress class of each
+document with regular expressions, and lets callers skip documents that
+cannot match a Selector before paying for a full YAML parse.
+
+Sniffing is conservative: whenever a value cannot be determined reliably
+(flow style, anchors, merge keys, tags), it is reported as unknown and the
+document is parsed so the Selector can be applied to the real object.
+
+Selected documents also have the server-side state of exported objects cut
+out of their text, so the YAML parser never has to scan it. The same rule
+applies: anything that is not plainly written in block style is left for the
+loader, which prunes it from the parsed node graph instead.
+"""
+
+import mmap
+import re
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Any
+
+from . import serializer
+
+INGRESS_CLASS_ANNOTATION = "kubernetes.io/ingress.class"
+
+_KIND_RE = re.compile(r"^kind:[ \t]*['\"]?([\w.-]+)['\"]?[ \t]*(?:#.*)?$", re.M)
+_VALUE_RE = re.compile(r"^['\"]?([^'\"#\s]+)['\"]?[ \t]*(?:#.*)?$")
+_CLASS_ANNOTATION_RE = re.compile(
+    r"^[ \t]+['\"]?kubernetes\.io/ingress\.class['\"]?:[ \t]*(.*)$", re.M
+)
+_CONTENT_RE = re.compile(r"^(?!(?:---|\.\.\.)[ \t]*(?:#.*)?$)[ \t]*[^\s#]", re.M)
+_BOUNDARY_END = (b"\n", b"\r", b" ", b"\t", b"")
+
+_ROOT_RE = re.compile(r"\A(?:---[ \t]*(?:#[^\n]*)?\n)?(?:[ \t]*(?:#[^\n]*)?\n)*[A-Za-z]")
+_INDENT_RE = re.compile(r"(?:[ \t]*(?:#[^\n]*)?\n)*( +)[^\s#-]")
+_HAS_CONTENT_RE = re.compile(r"^[ \t]*[^\s#]", re.M)
+
+
+def iter_raw_documents(source: str | IO[Any]) -> Iterator[str]:
+    """Split YAML input into raw document strings without parsing it.
+
+    Documents are cut on lines starting with ``---``. The marker line is kept
+    with the document that follows it. Chunks holding only comments or
+    whitespace are dropped. Regular files are memory-mapped so only one
+    document at a time is copied out of the page cache.
+
+    Args:
+        source: YAML text or an open file.
+
+    Yields:
+        The raw text of each document in input order.
+    """
+    if isinstance(source, str):
+        yield from _split(source.encode())
+        return
+
+    try:
+        fileno = source.fileno()
+    except (AttributeError, OSError):
+        fileno = None
+
+    if fileno is None:
+        data = source.read()
+        yield from _split(data.encode() if isinstance(data, str) else data)
+        return
+
+    try:
+        buffer = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files cannot be memory-mapped
+        return
+    with buffer:
+        yield from _split(buffer)
+
+
+def _split(buffer: bytes | mmap.mmap) -> Iterator[str]:
+    """Split a bytes-like buffer on document start markers."""
+    start = 0
+    position = buffer.find(b"\n---")
+    while position != -1:
+        marker = position + 1
+        if buffer[marker + 3 : marker + 4] in _BOUNDARY_END:
+            chunk = buffer[start:marker].decode()
+            if _CONTENT_RE.search(chunk):
+                yield chunk
+            start = marker
+        position = buffer.find(b"\n---", marker)
+
+    chunk = buffer[start:].decode()
+    if _CONTENT_RE.search(chunk):
+        yield chunk
+
+
+def select_raw_documents(
+    raw_documents: Iterable[str],
+    selector: "Selector | None",
+    on_skip: Callable[[str], None] | None = None,
+) -> Iterator[str]:
+    """Drop raw documents whose sniffed fields cannot match a selector.
+
+    Args:
+        raw_documents: Raw document texts, as from iter_raw_documents.
+        selector: The selector; None keeps every document.
+        on_skip: Optional callback invoked with the kind of each document
+            dropped because its kind is not selected.
+
+    Yields:
+        The raw documents that may match, in input order, with server-side
+        state cut out by strip_raw_document().
+
+    Raises:
+        serializer.LimitExceeded: If a document is too large or there are
+            too many documents for the active parse limits.
+    """
+    limits = serializer.get_limits()
+    for count, raw in enumerate(raw_documents, 1):
+        if limits:
+            # Checked on every document, selected or not, before sniffing it
+            limits.check_documents(count)
+            limits.check_size(len(raw))
+        if selector is not None:
+            # Only sniff the fields the selector actually filters on
+            fields = sniff(raw, bool(selector.namespaces), bool(selector.ingress_classes))
+            if not selector.match_fields(
+                fields["kind"], fields["namespace"], fields["ingress_class"]
+            ):
+                if on_skip is not None and not selector.match_fields(fields["kind"], None, None):
+                    on_skip(fields["kind"])
+                continue
+        yield strip_raw_document(raw)
+
+
+def strip_raw_document(text: str) -> str:
+    """Cut server-side state out of a raw YAML document before it is parsed.
+
+    Removes the same fields as the serializer's loaders, as long as they are
+    written in plain block style at their usual place: a top-level
+    ``status``, ``metadata.managedFields`` and the last-applied annotation.
+    Documents with CRLF line ends or a flow-style root, and cuts that would
+    remove an anchor, are left unchanged.
+
+    Args:
+        text: Raw text of a single document.
+
+    Returns:
+        The text with those fields removed.
+    """
+    if "\r" in text or not _ROOT_RE.match(text):
+        return text
+    for field in serializer.STRIPPED_FIELDS:
+        if f"{field}:" in text:
+            text = _cut(text, "", field)
+
+    metadata = re.search(rf"^metadata:[ \t]*(?:#.*)?\n({_nested('')})", text, re.M)
+    if metadata is None or (child := _INDENT_RE.match(metadata.group(1))) is None:
+        return text
+    indent = child.group(1)
+    block = metadata.group(1)
+    for field in serializer.STRIPPED_METADATA:
+        if f"{field}:" in block:
+            block = _cut(block, indent, field)
+
+    annotations = re.search(rf"^{indent}annotations:[ \t]*\n({_nested(indent)})", block, re.M)
+    if annotations is not None and (child := _INDENT_RE.match(annotations.group(1))) is not None:
+        entries = annotations.group(1)
+        for name in serializer.STRIPPED_ANNOTATIONS:
+            if name in entries:
+                entries = _cut(entries, child.group(1), name)
+        if entries != annotations.group(1):
+            # An emptied mapping stays a mapping, as with the loaders
+            empty = "" if _HAS_CONTENT_RE.search(entries) else " {}"
+            header = f"{indent}annotations:{empty}\n"
+            block = block[: annotations.start()] + header + entries + block[annotations.end() :]
+
+    return text[: metadata.start(1)] + block + text[metadata.end(1) :]
+
+
+def _nested(indent: str) -> str:
+    """Pattern for the lines nested below a key at the given indentation."""
+    # More indented lines, indentless sequence items, blank lines and comments
+    line = rf"(?:{indent}[ \t][^\n]*|{indent}-(?:[ \t][^\n]*)?|[ \t]*(?:#[^\n]*)?)"
+    return rf"(?:{line}(?:\n|\Z))*"
+
+
+def _cut(text: str, indent: str, key: str) -> str:
+    """Remove a plain key at the given indentation and everything nested below it."""
+    pattern = rf"^{indent}{re.escape(key)}:(?:[ \t][^\n]*)?(?:\n|\Z){_nested(indent)}"
+    match = re.search(pattern, text, re.M)
+    if match is None or "&" in match.group():
+        return text
+    return text[: match.start()] + text[match.end() :]
+
+
+def sniff(text: str, namespace: bool = True, ingress_class: bool = True) -> dict[str, str | None]:
+    """Cheaply extract selector fields from a raw YAML document.
+
+    Args:
+        text: Raw text of a single document.
+        namespace: Whether to sniff the namespace.
+        ingress_class: Whether to sniff the ingress class.
+
+    Returns:
+        A dictionary with 'kind', 'namespace' and 'ingress_class' keys. A
+        value of None means the field could not be determined without a full
+        parse or was not requested. A missing namespace is reported as
+        'default' and a missing ingress class as an empty string.
+    """
+    fields: dict[str, str | None] = {"kind": None, "namespace": None, "ingress_class": None}
+
+    kinds = _KIND_RE.findall(text)
+    if len(kinds) != 1:
+        # Not a plain block mapping (flow style, duplicate keys); parse it
+        return fields
+    fields["kind"] = kinds[0]
+
+    # Merge keys can pull fields in from elsewhere; leave those to the parser
+    if "<<:" in text:
+        return fields
+
+    if namespace:
+        value = _child_value(text, "metadata", "namespace")
+        if value is not None:
+            fields["namespace"] = value or "default"
+
+    if ingress_class:
+        value = _child_value(text, "spec", "ingressClassName")
+        if value == "":
+            annotation = _CLASS_ANNOTATION_RE.findall(text)
+            if len(annotation) > 1:
+                value = None
+            elif annotation:
+                value = _scalar(annotation[0])
+        fields["ingress_class"] = value
+
+    return fields
+
+
+def _child_value(text: str, parent: str, child: str) -> str | None:
+    """Find the value of a direct child key of a top-level block mapping.
+
+    Returns the value, an empty string if the child (or the whole parent) is
+    absent, or None if the value cannot be determined.
+    """
+    header = re.search(rf"^{parent}:[ \t]*(?:#.*)?$", text, re.M)
+    if header is None:
+        # Either the parent is absent or it is written in flow style
+        return None if re.search(rf"^['\"]?{parent}['\"]?[ \t]*:", text, re.M) else ""
+
+    child_indent = None
+    for line in text[header.end() + 1 :].splitlines():
+        stripped = line.lstrip(" ")
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(line) - len(stripped)
+        if indent == 0:
+            break
+        if child_indent is None:
+            child_indent = indent
+        if indent != child_indent or stripped.startswith("-"):
+            # Nested values and indentless sequence items of a sibling key
+            continue
+        if stripped.startswith(f"{child}:"):
+            return _scalar(stripped[len(child) + 1 :])
+        if stripped.startswith(("'", '"', "?")):
+            # Quoted or complex keys are not sniffed
+            return None
+
+    return ""
+
+
+def _scalar(value: str) -> str | None:
+    """Parse a simple plain or quoted scalar, or return None."""
+    match = _VALUE_RE.match(value.strip())
+    if match is None or match.group(1)[0] in "&*!|>{[":
+        return None
+    return match.group(1)
+
+
+class Selector:
+    """Selects documents by kind, namespace and ingress class.
+
+    Empty criteria match everything. The ingress class criterion only
+    applies to Ingress resources. List kinds always match so that their
+    items can be expanded and selected individually.
+
+    Attributes:
+        kinds: Kinds to keep.
+        namespaces: Namespaces to keep.
+        ingress_classes: Ingress classes to keep.
+    """
+
+    def __init__(
+        self,
+        kinds: Iterable[str] | None = None,
+        namespaces: Iterable[str] | None = None,
+        ingress_classes: Iterable[str] | None = None,
+    ):
+        self.kinds = set(kinds or [])
+        self.namespaces = set(namespaces or [])
+        self.ingress_classes = set(ingress_classes or [])
+
+    def match_fields(
+        self,
+        kind: str | None,
+        namespace: str | None,
+        ingress_class: str | None,
+    ) -> bool:
+        """Check sniffed fields against the selector.
+
+        Unknown (None) fields never exclude a document.
+
+        Returns:
+            False only if the document definitely does not match.
+        """
+        if kind is not None and kind.endswith("List"):
+            return True
+        if self.kinds and kind is not None and kind not in self.kinds:
+            return False
+        if self.namespaces and namespace is not None and namespace not in self.namespaces:
+            return False
+        if (
+            self.ingress_classes
+            and kind == "Ingress"
+            and ingress_class is not None
+            and ingress_class not in self.ingress_classes
+        ):
+            return False
+        return True
+
+    def matches(self, document: dict[str, Any]) -> bool:
+        """Check a parsed document against the selector."""
+        metadata = document.get("metadata") or {}
+        annotations = metadata.get("annotations") or {}
+        spec = document.get("spec") or {}
+        return self.match_fields(
+            document.get("kind", ""),
+            metadata.get("namespace") or "default",
+            spec.get("ingressClassName") or annotations.get(INGRESS_CLASS_ANNOTATION, ""),
+        )
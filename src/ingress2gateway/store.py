@@ -0,0 +1,250 @@
+"""On-disk working set of generated resources.
+
+Fleet-wide steps such as validating every route, grouping ReferenceGrants or
+writing canonically ordered output normally hold every generated resource in
+memory. A ResourceStore keeps them in a temporary SQLite database instead,
+together with the warnings and unsupported annotations of the conversion, so
+that a conversion of millions of objects runs within a fixed memory budget:
+SQLite keeps at most that much of the database in its page cache and spills
+the rest to disk. Routes are indexed by kind and namespace, and by whether
+they reference a Gateway or Service in another namespace, which is all that
+ReferenceGrants are grouped from.
+
+The store is scratch space. It is not crash-safe and is deleted on close.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from pathlib import Path
+from typing import Any
+
+from .canonical import KIND_ORDER, canonicalize
+
+# Default page cache budget of a store in bytes
+DEFAULT_MAX_MEMORY = 64 * 1024 * 1024
+
+# Documents inserted per transaction
+_BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE resources (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    namespace TEXT NOT NULL,
+    name TEXT NOT NULL,
+    cross_namespace INTEGER NOT NULL,
+    document TEXT NOT NULL
+);
+CREATE TABLE messages (id INTEGER PRIMARY KEY, type TEXT NOT NULL, message TEXT NOT NULL);
+CREATE INDEX resources_kind ON resources (kind, namespace);
+CREATE INDEX resources_order ON resources (rank, namespace, name);
+CREATE INDEX resources_cross_namespace ON resources (id) WHERE cross_namespace;
+CREATE INDEX messages_type ON messages (type);
+"""
+
+
+class ResourceStore:
+    """A temporary SQLite database of generated Gateway API resources.
+
+    Documents are stored as JSON in insertion order. Use as a context
+    manager, or call close() to delete the database.
+
+    Attributes:
+        path: The database file.
+        max_memory: Page cache budget in bytes.
+    """
+
+    def __init__(self, directory: str | Path | None = None, max_memory: int = DEFAULT_MAX_MEMORY):
+        fd, path = tempfile.mkstemp(dir=directory, prefix="ingress2gateway-", suffix=".db")
+        os.close(fd)
+        self.path = Path(path)
+        self.max_memory = max_memory
+        self._db = sqlite3.connect(self.path, isolation_level=None)
+        # Negative cache sizes are in KiB; nothing here needs to survive a crash
+        self._db.execute(f"PRAGMA cache_size = -{max(max_memory // 1024, 64)}")
+        self._db.execute("PRAGMA journal_mode = OFF")
+        self._db.execute("PRAGMA synchronous = OFF")
+        self._db.execute("PRAGMA temp_store = FILE")
+        self._db.executescript(_SCHEMA)
+        self._pending: list[dict[str, Any]] = []
+        self._pending_messages: list[tuple[str, str]] = []
+
+    def add(self, document: dict[str, Any]) -> None:
+        """Add a document; writes are batched into transactions."""
+        self._pending.append(document)
+        if len(self._pending) >= _BATCH_SIZE:
+            self._flush()
+
+    def add_all(self, documents: Iterable[dict[str, Any]]) -> None:
+        for document in documents:
+            self.add(document)
+
+    def add_messages(self, type: str, messages: Iterable[Any]) -> None:
+        """Add messages of a type, such as 'warning', stored as JSON."""
+        self._pending_messages.extend((type, json.dumps(message)) for message in messages)
+        if len(self._pending_messages) >= _BATCH_SIZE:
+            self._flush()
+
+    def iter_messages(self, type: str) -> Iterator[Any]:
+        """Lazily read the messages of a type back in insertion order."""
+        self._flush()
+        for (text,) in self._db.execute(
+            "SELECT message FROM messages WHERE type = ? ORDER BY id", (type,)
+        ):
+            yield json.loads(text)
+
+    def count_messages(self, type: str) -> int:
+        self._flush()
+        return self._db.execute("SELECT COUNT(*) FROM messages WHERE type = ?", (type,)).fetchone()[
+            0
+        ]
+
+    def count(self, kind: str | None = None) -> int:
+        """Count the stored documents, optionally of one kind only."""
+        self._flush()
+        if kind is None:
+            return self._db.execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+        return self._db.execute(
+            "SELECT COUNT(*) FROM resources WHERE kind = ?", (kind,)
+        ).fetchone()[0]
+
+    def iter_documents(
+        self,
+        kind: str | None = None,
+        namespace: str | None = None,
+        cross_namespace: bool = False,
+        canonical: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """Lazily read documents back, optionally filtered through the indexes.
+
+        Args:
+            kind: Only documents of this kind.
+            namespace: Only documents in this namespace, as given in their
+                metadata ('' if unset).
+            cross_namespace: Only routes with a parentRef or backendRef in
+                another namespace than their own.
+            canonical: Return documents in canonical order, as canonicalize(),
+                instead of insertion order.
+
+        Yields:
+            The matching documents.
+        """
+        self._flush()
+        query = "SELECT document FROM resources"
+        conditions = []
+        params: list[Any] = []
+        if kind is not None:
+            conditions.append("kind = ?")
+            params.append(kind)
+        if namespace is not None:
+            conditions.append("namespace = ?")
+            params.append(namespace)
+        if cross_namespace:
+            conditions.append("cross_namespace")
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY rank, namespace, name, id" if canonical else " ORDER BY id"
+
+        for (text,) in self._db.execute(query, params):
+            document = json.loads(text)
+            yield canonicalize([document])[0] if canonical else document
+
+    def view(self, kind: str) -> "ResourceView":
+        """Return a list-like view of the documents of one kind."""
+        return ResourceView(self, kind)
+
+    def messages(self, type: str) -> "MessageView":
+        """Return a list-like view of the messages of one type."""
+        return MessageView(self, type)
+
+    def close(self) -> None:
+        """Close and delete the database."""
+        self._pending.clear()
+        self._pending_messages.clear()
+        self._db.close()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ResourceStore":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    def _flush(self) -> None:
+        if not self._pending and not self._pending_messages:
+            return
+        self._db.execute("BEGIN")
+        for document in self._pending:
+            self._insert(document)
+        self._db.executemany(
+            "INSERT INTO messages (type, message) VALUES (?, ?)", self._pending_messages
+        )
+        self._db.execute("COMMIT")
+        self._pending.clear()
+        self._pending_messages.clear()
+
+    def _insert(self, document: dict[str, Any]) -> None:
+        kind = str(document.get("kind", ""))
+        metadata = document.get("metadata") or {}
+        namespace = metadata.get("namespace") or ""
+        rank = KIND_ORDER.index(kind) if kind in KIND_ORDER else len(KIND_ORDER)
+        spec = document.get("spec") or {}
+        refs = chain(
+            spec.get("parentRefs") or [],
+            (ref for rule in spec.get("rules") or [] for ref in rule.get("backendRefs") or []),
+        )
+        # Read the route's namespace as generate_reference_grants() does
+        own = metadata.get("namespace", "default")
+        cross_namespace = any(ref.get("namespace", own) != own for ref in refs)
+        self._db.execute(
+            "INSERT INTO resources (kind, rank, namespace, name, cross_namespace, document)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                kind,
+                rank,
+                namespace,
+                metadata.get("name") or "",
+                cross_namespace,
+                json.dumps(document),
+            ),
+        )
+
+
+class ResourceView:
+    """A read-only, list-like view of the documents of one kind in a store.
+
+    Supports len(), truth testing and repeated iteration, so it can stand in
+    for the lists of a conversion's resources dictionary.
+    """
+
+    def __init__(self, store: ResourceStore, kind: str):
+        self.store = store
+        self.kind = kind
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return self.store.iter_documents(self.kind)
+
+    def __len__(self) -> int:
+        return self.store.count(self.kind)
+
+
+class MessageView:
+    """A read-only, list-like view of the messages of one type in a store.
+
+    Stands in for the warnings and unsupported lists of a merged result.
+    """
+
+    def __init__(self, store: ResourceStore, type: str):
+        self.store = store
+        self.type = type
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.store.iter_messages(self.type)
+
+    def __len__(self) -> int:
+        return self.store.count_messages(self.type)
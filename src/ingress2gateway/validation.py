@@ -7,11 +7,17 @@ fields, valid API versions, and structural correctness.
 
 from typing import Any
 
+from .hostnames import ListenerIndex
+from .ir import Route, iter_compact
+
 # Simplified schemas for validation
 INGRESS_REQUIRED_FIELDS = ["apiVersion", "kind", "metadata", "spec"]
 GATEWAY_REQUIRED_FIELDS = ["apiVersion", "kind", "metadata", "spec"]
 HTTPROUTE_REQUIRED_FIELDS = ["apiVersion", "kind", "metadata", "spec"]
 
+# The Gateway API allows at most this many listeners per Gateway
+MAX_LISTENERS = 64
+
 
 class ValidationError:
     """Represents a validation error or warning.
@@ -196,6 +202,11 @@ def validate_gateway(gateway: dict[str, Any]) -> ValidationResult:
     listeners = spec.get("listeners", [])
     if not listeners:
         result.add_warning("spec.listeners", "No listeners defined")
+    elif len(listeners) > MAX_LISTENERS:
+        result.add_warning(
+            "spec.listeners",
+            f"{len(listeners)} listeners exceed the Gateway API limit of {MAX_LISTENERS}",
+        )
 
     for i, listener in enumerate(listeners):
         if not listener.get("name"):
@@ -252,15 +263,35 @@ def validate_httproute(route: dict[str, Any]) -> ValidationResult:
     return result
 
 
+def _validate_compact_httproute(route: Route) -> ValidationResult:
+    """Validate an HTTPRoute held as IR, as validate_httproute() does a dictionary.
+
+    The IR always has the required fields, so only the remaining checks apply.
+    """
+    result = ValidationResult()
+    if route.kind != "HTTPRoute":
+        result.add_error("kind", f"Expected 'HTTPRoute', got '{route.kind}'")
+    if not route.parent_refs:
+        result.add_error("spec.parentRefs", "Missing parentRefs")
+    if not route.rules:
+        result.add_warning("spec.rules", "No rules defined")
+    for i, rule in enumerate(route.rules):
+        if not rule.backend_refs:
+            result.add_warning(f"spec.rules[{i}]", "No backendRefs defined")
+    return result
+
+
 def validate_conversion_output(resources: dict[str, Any]) -> ValidationResult:
     """Validate the complete conversion output including all resources.
 
     Validates the Gateway, all HTTPRoutes, and all GRPCRoutes in the
-    conversion output.
+    conversion output, and warns about HTTPRoutes that no listener of the
+    Gateways they reference accepts.
 
     Args:
         resources: A dictionary containing 'gateway', 'httproutes', and
-            optionally 'grpcroutes' keys.
+            optionally 'grpcroutes' keys, and 'gateways' with all Gateways
+            of a consolidated conversion.
 
     Returns:
         ValidationResult containing aggregated errors and warnings from
@@ -275,9 +306,28 @@ def validate_conversion_output(resources: dict[str, Any]) -> ValidationResult:
         result.errors.extend(gateway_result.errors)
         result.warnings.extend(gateway_result.warnings)
 
-    # Validate HTTPRoutes
-    for i, route in enumerate(resources.get("httproutes", [])):
-        route_result = validate_httproute(route)
+    # Validate the other Gateways of a consolidated conversion
+    for i, other in enumerate(resources.get("gateways", [])[1:], 1):
+        gateway_result = validate_gateway(other)
+        for error in gateway_result.errors:
+            error.path = f"gateways[{i}].{error.path}"
+            result.errors.append(error)
+        for warning in gateway_result.warnings:
+            warning.path = f"gateways[{i}].{warning.path}"
+            result.warnings.append(warning)
+
+    # Validate HTTPRoutes, and that they attach to the Gateways they reference;
+    # routes held as IR are validated without building their dictionaries
+    listeners = ListenerIndex(resources.get("gateways") or ([gateway] if gateway else []))
+    for i, route in enumerate(iter_compact(resources.get("httproutes", []))):
+        if isinstance(route, Route):
+            route_result = _validate_compact_httproute(route)
+        else:
+            route_result = validate_httproute(route)
+        if listeners.accepting(route) == []:
+            route_result.add_warning(
+                "spec.parentRefs", "No listener of the referenced Gateways accepts the route"
+            )
         for error in route_result.errors:
             error.path = f"httproutes[{i}].{error.path}"
             result.errors.append(error)
@@ -0,0 +1,311 @@
+"""Watch mode: incremental re-conversion of changed input files.
+
+Input directories are watched with inotify on Linux, accessed through ctypes
+so no extra dependency is needed; elsewhere, or when inotify is unavailable,
+the input files are polled for modification time and size changes.
+
+Every converted file keeps an in-memory cache of its documents keyed by
+their content hash, so editing one document in a large multi-document file
+only re-converts that document.
+"""
+
+import ctypes
+import ctypes.util
+import glob
+import os
+import select
+import struct
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from .batch import FileResult, convert_file, expand_inputs, is_output, output_paths
+from .cache import MemoryCache
+
+# Default interval between scans of the polling watcher, in seconds
+POLL_INTERVAL = 1.0
+
+# Time to keep collecting events after the first one, so that an editor
+# saving several files, or writing a file in several steps, is handled as a
+# single batch of changes
+_SETTLE_TIME = 0.1
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """Detects changes by periodically comparing file modification times.
+
+    Attributes:
+        scan: Callable returning the files currently being watched.
+        interval: Seconds between scans.
+    """
+
+    def __init__(self, scan: Callable[[], list[Path]], interval: float = POLL_INTERVAL):
+        self.scan = scan
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for path in self.scan():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path.resolve()] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def changes(self) -> set[Path] | None:
+        """Block until files are added, modified or removed.
+
+        Returns:
+            The resolved paths that changed.
+        """
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._take_snapshot()
+            changed = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed:
+                return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Detects changes with Linux inotify, watching directories recursively.
+
+    Raises:
+        OSError: If inotify is not available or a watch cannot be added,
+            for example because the per-user watch limit was reached.
+    """
+
+    def __init__(self, roots: list[Path]):
+        library = ctypes.util.find_library("c")
+        if library is None:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(library, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: dict[int, Path] = {}
+        try:
+            for root in roots:
+                self._add_tree(root.resolve())
+        except OSError:
+            self.close()
+            raise
+
+    def _add_tree(self, root: Path) -> list[Path]:
+        """Watch a directory tree and return the files already in it."""
+        files = []
+        for directory, _, names in os.walk(root):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+            self._directories[wd] = Path(directory)
+            files.extend(Path(directory) / name for name in names)
+        return files
+
+    def changes(self) -> set[Path] | None:
+        """Block until entries below the watched directories change.
+
+        Returns:
+            The resolved paths that changed, or None if events were lost and
+            every file has to be considered changed.
+        """
+        changed: set[Path] = set()
+        overflow = False
+        timeout = None
+        while select.select([self._fd], [], [], timeout)[0]:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size : offset + _EVENT.size + length].rstrip(b"\0")
+                offset += _EVENT.size + length
+
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                directory = self._directories.get(wd)
+                if directory is None or not name:
+                    continue
+                path = directory / os.fsdecode(name)
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        # Files may have been created before the watch was added
+                        changed.update(self._add_tree(path))
+                    continue
+                changed.add(path)
+            timeout = _SETTLE_TIME
+
+        return None if overflow else changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_watcher(
+    patterns: list[str],
+    scan: Callable[[], list[Path]],
+    interval: float = POLL_INTERVAL,
+) -> InotifyWatcher | PollingWatcher:
+    """Create an inotify watcher, falling back to polling.
+
+    Args:
+        patterns: Input files, directories or glob patterns.
+        scan: Callable returning the current input files, used for polling.
+        interval: Polling interval in seconds.
+
+    Returns:
+        A watcher with changes() and close() methods.
+    """
+    try:
+        return InotifyWatcher(watch_roots(patterns))
+    except OSError:
+        return PollingWatcher(scan, interval)
+
+
+def watch_roots(patterns: list[str]) -> list[Path]:
+    """Determine the directories to watch for a set of input patterns.
+
+    Files are watched through their directory, so that editors which save
+    by replacing the file are noticed. Glob patterns are watched from their
+    deepest directory without wildcards. Missing directories are watched
+    through their nearest existing ancestor.
+    """
+    roots = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if not path.exists() and glob.has_magic(pattern):
+            parts = []
+            for part in path.parts:
+                if glob.has_magic(part):
+                    break
+                parts.append(part)
+            path = Path(*parts) if parts else Path()
+        path = path.resolve()
+        while not path.is_dir() and path != path.parent:
+            path = path.parent
+        roots.add(path)
+
+    # Directories below another root are already watched recursively
+    return sorted(root for root in roots if not any(p in roots for p in root.parents))
+
+
+def iter_watch(
+    patterns: list[str],
+    output_dir: str | None = None,
+    output_format: str = "yaml",
+    watcher: InotifyWatcher | PollingWatcher | None = None,
+    output_file: str | None = None,
+    **options: Any,
+) -> Iterator[list[FileResult]]:
+    """Convert input files, then re-convert them whenever they change.
+
+    Outputs are placed as in batch mode, mirrored relative to the watched
+    directories so that they do not move when files are added. Generated
+    outputs are never treated as inputs. When an input file is deleted, its
+    output is deleted as well.
+
+    Args:
+        patterns: Input files, directories or glob patterns.
+        output_dir: Optional directory to mirror outputs into.
+        output_format: Output format ('yaml', 'json' or 'ndjson').
+        watcher: Watcher to use; defaults to open_watcher().
+        output_file: Optional file to write the output to instead, for a
+            single input file.
+        **options: Conversion options passed to convert_file.
+
+    Yields:
+        The results of the initial conversion, then the results of each
+        batch of changes. Runs until the consumer stops iterating.
+    """
+    roots = watch_roots(patterns)
+    base = Path(os.path.commonpath(roots)) if roots else None
+    excluded = Path(output_dir).resolve() if output_dir else None
+
+    def scan() -> list[Path]:
+        try:
+            files = expand_inputs(patterns)
+        except FileNotFoundError:
+            return []
+        return [f for f in files if not is_output(f.resolve(), excluded)]
+
+    memos: dict[Path, MemoryCache] = {}
+    outputs: dict[Path, Path] = {}
+
+    def convert(files: list[Path]) -> list[FileResult]:
+        results = []
+        if output_file is not None:
+            targets = [Path(output_file)] * len(files)
+        else:
+            targets = output_paths(files, output_dir, output_format, base)
+        for path, target in zip(files, targets):
+            memo = memos.setdefault(path.resolve(), MemoryCache())
+            result = convert_file(
+                str(path), str(target), output_format=output_format, cache=memo, **options
+            )
+            if result.status == "converted" and memo.hits:
+                total = memo.hits + memo.misses
+                result.message = f"{memo.misses} of {total} documents re-converted"
+            memo.sweep()
+            if result.status == "converted":
+                outputs[path.resolve()] = target
+            results.append(result)
+        return results
+
+    files = scan()
+    if watcher is None:
+        watcher = open_watcher(patterns, scan)
+    try:
+        yield convert(files)
+
+        known = {f.resolve() for f in files}
+        while True:
+            changed = watcher.changes()
+            files = scan()
+            current = {f.resolve(): f for f in files}
+
+            results = []
+            for path in sorted(known - current.keys()):
+                memos.pop(path, None)
+                target = outputs.pop(path, None)
+                if target is not None:
+                    target.unlink(missing_ok=True)
+                results.append(FileResult(str(path), str(target), status="removed"))
+
+            # None means events were lost; re-convert everything (cheaply, as
+            # unchanged documents are served from the per-file caches)
+            if changed is None:
+                changed = set(current)
+            results.extend(convert([f for path, f in current.items() if path in changed]))
+            known = set(current)
+            if results:
+                yield results
+    finally:
+        watcher.close()
@@ -0,0 +1,159 @@
+"""Tests for batch conversion of many files."""
+
+import json
+
+import pytest
+import yaml
+
+from src.ingress2gateway.batch import (
+    convert_parallel,
+    expand_inputs,
+    output_paths,
+    run_batch,
+)
+from src.ingress2gateway.pipeline import convert_stream
+from src.ingress2gateway.splitter import Selector
+
+INGRESS_YAML = """
+apiVersion: networking.k8s.io/v1
+kind: Ingress
+metadata:
+  name: {name}
+spec:
+  rules:
+    - host: {name}.example.com
+      http:
+        paths:
+          - path: /
+            pathType: Prefix
+            backend:
+              service:
+                name: {name}
+                port:
+                  number: 80
+"""
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Create a small manifest tree with converted, skipped and failing files."""
+    (tmp_path / "apps" / "web").mkdir(parents=True)
+    (tmp_path / "apps" / "web" / "ingress.yaml").write_text(INGRESS_YAML.format(name="web"))
+    (tmp_path / "apps" / "api.yml").write_text(INGRESS_YAML.format(name="api"))
+    (tmp_path / "apps" / "config.yaml").write_text("kind: ConfigMap\n")
+    (tmp_path / "apps" / "broken.yaml").write_text("kind: Ingress\n")
+    (tmp_path / "apps" / "README.md").write_text("not a manifest")
+    return tmp_path
+
+
+def test_expand_inputs(tree):
+    """Test expanding directories, globs and files."""
+    files = expand_inputs([str(tree / "apps")])
+    assert [f.name for f in files] == ["api.yml", "broken.yaml", "config.yaml", "ingress.yaml"]
+
+    files = expand_inputs([str(tree / "apps" / "**" / "ingress.yaml"), str(tree / "apps/api.yml")])
+    assert [f.name for f in files] == ["api.yml", "ingress.yaml"]
+
+    with pytest.raises(FileNotFoundError, match="No input files match"):
+        expand_inputs([str(tree / "missing" / "*.yaml")])
+
+
+def test_output_paths(tree):
+    """Test output placement next to inputs and in a mirrored tree."""
+    files = expand_inputs([str(tree / "apps")])
+
+    beside = output_paths(files, None, "json")
+    assert beside[0] == tree / "apps" / "api.gateway.json"
+
+    mirrored = output_paths(files, str(tree / "out"), "yaml")
+    assert mirrored[0] == tree / "out" / "api.yaml"
+    assert mirrored[3] == tree / "out" / "web" / "ingress.yaml"
+
+
+@pytest.mark.parametrize("output_dir", [None, "apps/out"])
+def test_run_batch_twice(tree, output_dir):
+    """Test that a second run over the same tree does not pick up the first run's outputs."""
+    output_dir = str(tree / output_dir) if output_dir else None
+    for _ in range(2):
+        files = expand_inputs([str(tree / "apps")], output_dir)
+        assert [f.name for f in files] == ["api.yml", "broken.yaml", "config.yaml", "ingress.yaml"]
+        results = list(run_batch(files, output_paths(files, output_dir), 1))
+        assert [r.status for r in results] == ["converted", "failed", "skipped", "converted"]
+
+    # Outputs found in a directory are kept on request, and when named explicitly
+    outputs = expand_inputs([str(tree / "apps")], output_dir, include_outputs=True)
+    assert len(outputs) == 6
+    output = output_paths(files, output_dir)[0]
+    assert expand_inputs([str(output)], output_dir) == [output]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_batch(tree, jobs):
+    """Test converting a tree in-process and across a process pool."""
+    files = expand_inputs([str(tree / "apps")])
+    outputs = output_paths(files, str(tree / "out"))
+
+    results = list(run_batch(files, outputs, jobs, provider="envoy"))
+
+    assert [r.status for r in results] == ["converted", "failed", "skipped", "converted"]
+    assert "Input validation failed" in results[1].message
+    documents = list(yaml.safe_load_all((tree / "out" / "web" / "ingress.yaml").read_text()))
+    assert documents[0]["spec"]["gatewayClassName"] == "eg"
+    assert results[3].ingresses == 1
+    assert results[3].documents == len(documents)
+    assert not (tree / "out" / "config.yaml").exists()
+
+    rerun = list(run_batch(files, outputs, jobs, provider="envoy"))
+    assert [r.unchanged for r in rerun] == [True, False, False, True]
+
+
+def test_run_batch_keep_going(tree):
+    """Test that keep_going skips failing Ingresses instead of failing their file."""
+    mixed = tree / "apps" / "web" / "ingress.yaml"
+    mixed.write_text(mixed.read_text() + "---\nkind: Ingress\nmetadata:\n  name: bad\n")
+    files = [tree / "apps" / "broken.yaml", mixed]
+    outputs = output_paths(files, str(tree / "out"))
+
+    results = list(run_batch(files, outputs, 1))
+    assert [r.status for r in results] == ["failed", "failed"]
+
+    results = list(run_batch(files, outputs, 1, keep_going=True))
+    assert [r.status for r in results] == ["failed", "converted"]
+    assert len(results[0].failures) == 1
+    assert results[1].ingresses == 1
+    assert results[1].message == "1 Ingress(es) skipped"
+    assert results[1].failures[0].startswith("default/bad: ")
+    documents = list(yaml.safe_load_all(outputs[1].read_text()))
+    assert [doc["kind"] for doc in documents] == ["Gateway", "HTTPRoute"]
+
+
+def test_convert_parallel_preserves_order():
+    """Test that a file split across workers converts like convert_stream."""
+    documents = [INGRESS_YAML.format(name=f"app{i}") for i in range(12)]
+    documents.insert(5, "kind: ConfigMap\nmetadata:\n  name: cfg\n")
+    content = "---\n".join(documents)
+    selector = Selector(["Ingress"])
+
+    expected_skips = []
+    expected = list(
+        convert_stream(content, "istio", on_skip=expected_skips.append, selector=selector)
+    )
+    skips = []
+    results = list(
+        convert_parallel(
+            content, "istio", on_skip=skips.append, selector=selector, jobs=2, chunk_bytes=512
+        )
+    )
+
+    assert [r.ingress["metadata"]["name"] for r in results] == [f"app{i}" for i in range(12)]
+    assert [r.resources for r in results] == [r.resources for r in expected]
+    assert skips == expected_skips == ["ConfigMap"]
+
+
+def test_convert_parallel_json_fallback():
+    """Test that JSON input is converted in-process."""
+    content = json.dumps(yaml.safe_load(INGRESS_YAML.format(name="web")))
+
+    results = list(convert_parallel(content, "istio", jobs=2))
+
+    assert [r.ingress["metadata"]["name"] for r in results] == ["web"]
@@ -0,0 +1,181 @@
+"""Tests for the on-disk conversion cache."""
+
+import os
+
+import pytest
+
+from src.ingress2gateway import cache as cache_module
+from src.ingress2gateway.cache import (
+    Checkpoint,
+    ConversionCache,
+    MemoryCache,
+    convert_cached,
+    document_key,
+)
+from src.ingress2gateway.pipeline import convert_stream
+from src.ingress2gateway.splitter import Selector
+
+INGRESS_YAML = """apiVersion: networking.k8s.io/v1
+kind: Ingress
+metadata:
+  name: web
+  annotations:
+    nginx.ingress.kubernetes.io/enable-cors: "true"
+spec:
+  rules:
+    - host: example.com
+      http:
+        paths:
+          - path: /
+            pathType: Prefix
+            backend:
+              service:
+                name: web
+                port:
+                  number: 80
+---
+kind: ConfigMap
+metadata:
+  name: settings
+---
+kind: Ingress
+metadata:
+  name: broken
+"""
+
+
+def test_convert_cached_replays_results(tmp_path, monkeypatch):
+    """Test that a warm cache reproduces results without converting."""
+    cache = ConversionCache(tmp_path)
+    expected_skips = []
+    expected = list(convert_stream(INGRESS_YAML, "istio", on_skip=expected_skips.append))
+
+    skips = []
+    cold = list(convert_cached(INGRESS_YAML, "istio", on_skip=skips.append, cache=cache))
+    assert skips == expected_skips == ["ConfigMap"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache miss")
+
+    monkeypatch.setattr(cache_module.ConversionSession, "convert_stream", fail)
+    skips = []
+    warm = list(convert_cached(INGRESS_YAML, "istio", on_skip=skips.append, cache=cache))
+
+    assert skips == ["ConfigMap"]
+    for results in (cold, warm):
+        assert [r.resources for r in results] == [r.resources for r in expected]
+        assert [r.warnings for r in results] == [r.warnings for r in expected]
+    assert not warm[1].is_valid
+    assert warm[1].errors[0].path == expected[1].errors[0].path
+
+
+def test_document_key():
+    """Test that the key covers the document and conversion options."""
+    key = document_key("kind: Ingress\n", "istio", False, True)
+
+    assert key == document_key("kind: Ingress\n", "istio", False, True)
+    assert key != document_key("kind: Ingress\n", "envoy", False, True)
+    assert key != document_key("kind: Ingress\n", "istio", True, True)
+    assert key != document_key("kind: Ingress\n", "istio", False, True, Selector(["Ingress"]))
+    assert key != document_key("kind: Ingress\n\n", "istio", False, True)
+
+
+def test_cache_marker_normalized(tmp_path):
+    """Test that a leading document marker does not change the key."""
+    cache = ConversionCache(tmp_path)
+    list(convert_cached(INGRESS_YAML, "istio", cache=cache))
+    entries = len(list(tmp_path.glob("*/*.json")))
+
+    list(convert_cached("---\n" + INGRESS_YAML.replace("\n", "\r\n"), "istio", cache=cache))
+
+    assert len(list(tmp_path.glob("*/*.json"))) == entries == 3
+
+
+def test_evict_least_recently_used(tmp_path):
+    """Test that eviction removes the oldest entries first."""
+    cache = ConversionCache(tmp_path)
+    for index, key in enumerate(["aa1", "bb2", "cc3"]):
+        cache.put(key, {"data": "x" * 100})
+        os.utime(tmp_path / key[:2] / f"{key}.json", (index, index))
+    cache.get("aa1")
+
+    cache.max_size = 250
+    assert cache.evict() == 1
+
+    assert cache.get("bb2") is None
+    assert cache.get("aa1") is not None
+    assert cache.get("cc3") is not None
+
+
+@pytest.mark.parametrize("xdg", ["", "/tmp/xdg"])
+def test_default_cache_dir(monkeypatch, xdg):
+    """Test the XDG default cache location."""
+    monkeypatch.setenv("XDG_CACHE_HOME", xdg)
+    directory = ConversionCache().directory
+
+    assert directory.name == "ingress2gateway"
+    if xdg:
+        assert str(directory.parent) == xdg
+
+
+def test_memory_cache_reconverts_changed_documents():
+    """Test that only edited documents miss an in-memory cache."""
+    memo = MemoryCache()
+    list(convert_cached(INGRESS_YAML, "istio", cache=memo))
+    assert (memo.hits, memo.misses) == (0, 3)
+    memo.sweep()
+
+    edited = INGRESS_YAML.replace("name: settings", "name: other")
+    list(convert_cached(edited, "istio", cache=memo))
+    assert (memo.hits, memo.misses) == (2, 1)
+
+
+def test_checkpoint_resumes(tmp_path):
+    """Test that a checkpoint replays converted documents but not failed ones."""
+    path = tmp_path / "checkpoint"
+    checkpoint = Checkpoint(path)
+    first = list(convert_cached(INGRESS_YAML, "istio", cache=checkpoint))
+    checkpoint.close()
+    assert [r.is_valid for r in first] == [True, False]
+    # The broken Ingress is not journaled; simulate an interrupted append
+    assert len(path.read_bytes().splitlines()) == 2
+    with open(path, "ab") as journal:
+        journal.write(b"0123\t{")
+
+    checkpoint = Checkpoint(path)
+    second = list(convert_cached(INGRESS_YAML, "istio", cache=checkpoint))
+    assert checkpoint.replayed == 2
+    assert [r.resources for r in second] == [r.resources for r in first]
+
+    fixed = INGRESS_YAML.replace(
+        "kind: Ingress\nmetadata:\n  name: broken\n",
+        "apiVersion: networking.k8s.io/v1\nkind: Ingress\nmetadata:\n  name: broken\n"
+        "spec:\n  defaultBackend:\n    service:\n      name: web\n      port:\n"
+        "        number: 80\n",
+    )
+    list(convert_cached(fixed, "istio", cache=checkpoint))
+    checkpoint.close()
+
+    checkpoint = Checkpoint(path)
+    resumed = list(convert_cached(fixed, "istio", cache=checkpoint))
+    checkpoint.close()
+    assert checkpoint.replayed == 3
+    assert all(r.is_valid for r in resumed)
+
+
+def test_checkpoint_skips_failed_cache_entries(tmp_path):
+    """Test that failed documents read from the cache are not journaled."""
+    cache = ConversionCache(tmp_path / "cache")
+    list(convert_cached(INGRESS_YAML, "istio", cache=cache))
+
+    path = tmp_path / "checkpoint"
+    checkpoint = Checkpoint(path, cache)
+    results = list(convert_cached(INGRESS_YAML, "istio", cache=checkpoint))
+    checkpoint.close()
+    assert [r.is_valid for r in results] == [True, False]
+    assert len(path.read_bytes().splitlines()) == 2
+
+    checkpoint = Checkpoint(path)
+    list(convert_cached(INGRESS_YAML, "istio", cache=checkpoint))
+    checkpoint.close()
+    assert checkpoint.replayed == 2
@@ -0,0 +1,52 @@
+"""Tests for canonical resource ordering."""
+
+from src.ingress2gateway.canonical import canonicalize
+
+
+def _route(name, namespace="default", hostnames=()):
+    return {
+        "kind": "HTTPRoute",
+        "metadata": {"name": name, "namespace": namespace},
+        "spec": {"hostnames": list(hostnames), "rules": [{"matches": [1]}, {"matches": [0]}]},
+    }
+
+
+def test_canonicalize_orders_documents():
+    """Test ordering by kind, namespace and name."""
+    gateway = {"kind": "Gateway", "metadata": {"name": "gw"}, "spec": {"listeners": []}}
+    documents = [_route("b"), _route("a", "prod"), gateway, _route("a")]
+
+    ordered = canonicalize(documents)
+
+    assert [
+        (
+            d["kind"],
+            d["metadata"]["namespace"] if d["kind"] != "Gateway" else "",
+            d["metadata"]["name"],
+        )
+        for d in ordered
+    ] == [
+        ("Gateway", "", "gw"),
+        ("HTTPRoute", "default", "a"),
+        ("HTTPRoute", "default", "b"),
+        ("HTTPRoute", "prod", "a"),
+    ]
+
+
+def test_canonicalize_sorts_lists_but_not_rules():
+    """Test that listeners and hostnames are sorted and rules keep their order."""
+    gateway = {
+        "kind": "Gateway",
+        "metadata": {"name": "gw"},
+        "spec": {"listeners": [{"name": "https"}, {"name": "http"}]},
+    }
+    route = _route("web", hostnames=["b.example.com", "a.example.com"])
+
+    ordered = canonicalize([route, gateway])
+
+    assert [listener["name"] for listener in ordered[0]["spec"]["listeners"]] == ["http", "https"]
+    assert ordered[1]["spec"]["hostnames"] == ["a.example.com", "b.example.com"]
+    assert ordered[1]["spec"]["rules"] == route["spec"]["rules"]
+    # The input documents are not modified
+    assert gateway["spec"]["listeners"][0]["name"] == "https"
+    assert route["spec"]["hostnames"][0] == "b.example.com"
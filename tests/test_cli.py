@@ -0,0 +1,528 @@
+"""Tests for the command-line interface."""
+
+import json
+import tarfile
+
+import yaml
+from click.testing import CliRunner
+
+from src.ingress2gateway import cli
+from src.ingress2gateway.cli import main
+
+INGRESS_YAML = """
+apiVersion: networking.k8s.io/v1
+kind: Ingress
+metadata:
+  name: web
+  namespace: default
+spec:
+  rules:
+    - host: example.com
+      http:
+        paths:
+          - path: /
+            pathType: Prefix
+            backend:
+              service:
+                name: web
+                port:
+                  number: 80
+---
+apiVersion: networking.k8s.io/v1
+kind: Ingress
+metadata:
+  name: api
+  namespace: default
+spec:
+  rules:
+    - host: api.example.com
+      http:
+        paths:
+          - path: /v1
+            pathType: Prefix
+            backend:
+              service:
+                name: api
+                port:
+                  number: 8080
+"""
+
+
+def test_convert_stream_matches_combined_output(tmp_path):
+    """Test that streaming mode writes the same documents as combined mode."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(INGRESS_YAML)
+    runner = CliRunner()
+
+    combined = runner.invoke(main, ["convert", str(input_file), "-q"])
+    streamed = runner.invoke(main, ["convert", str(input_file), "-q", "--stream"])
+
+    assert combined.exit_code == 0
+    assert streamed.exit_code == 0
+    assert streamed.output.strip() == combined.output.strip()
+
+
+def test_convert_stream_to_stdout_keeps_diagnostics_out(tmp_path):
+    """Test that diagnostics go to stderr while documents are streamed to stdout."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(
+        "kind: Service\nmetadata:\n  name: web\n---"
+        + INGRESS_YAML.replace(
+            "\n  name: web\n",
+            "\n  name: web\n  annotations:\n"
+            "    nginx.ingress.kubernetes.io/server-snippet: 'return 200;'\n",
+        )
+    )
+    result = CliRunner().invoke(main, ["convert", str(input_file), "--stream"])
+
+    assert result.exit_code == 0
+    assert [doc["kind"] for doc in yaml.safe_load_all(result.stdout)] == [
+        "Gateway",
+        "HTTPRoute",
+        "HTTPRoute",
+    ]
+    assert "Skipping non-Ingress resource: Service" in result.stderr
+    assert "Annotation warning" in result.stderr
+
+
+def test_convert_stream_rejects_report(tmp_path):
+    """Test that --report is not accepted in streaming mode."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(INGRESS_YAML)
+    result = CliRunner().invoke(
+        main, ["convert", str(input_file), "--stream", "--report", str(tmp_path / "r.md")]
+    )
+    assert result.exit_code != 0
+    assert "--report" in result.output
+
+
+def test_convert_json_output(tmp_path):
+    """Test JSON output in combined and streaming modes."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(INGRESS_YAML)
+    runner = CliRunner()
+
+    combined = runner.invoke(main, ["convert", str(input_file), "-q", "-f", "json"])
+    streamed = runner.invoke(main, ["convert", str(input_file), "-q", "-f", "json", "--stream"])
+
+    assert combined.exit_code == 0
+    output = json.loads(combined.output)
+    assert output["kind"] == "List"
+    assert [item["kind"] for item in output["items"]] == ["Gateway", "HTTPRoute", "HTTPRoute"]
+    assert json.loads(streamed.output) == output
+
+
+def test_convert_namespace_selector(tmp_path):
+    """Test that only Ingresses matching the selectors are converted."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(
+        INGRESS_YAML.replace("name: api\n  namespace: default", "name: api\n  namespace: prod")
+    )
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["convert", str(input_file), "-q", "-f", "json", "-n", "prod"])
+
+    assert result.exit_code == 0
+    items = json.loads(result.output)["items"]
+    assert {item["metadata"]["namespace"] for item in items} == {"prod"}
+    assert items[0]["metadata"]["name"] == "api"
+
+    result = runner.invoke(main, ["convert", str(input_file), "-q", "--ingress-class", "nginx"])
+    assert result.exit_code == 1
+
+
+def test_convert_directory_batch(tmp_path):
+    """Test converting a directory with an aggregated exit status."""
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "one.yaml").write_text(INGRESS_YAML)
+    (tmp_path / "in" / "two.yaml").write_text(INGRESS_YAML)
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["convert", str(tmp_path / "in"), "-o", str(tmp_path / "out")])
+
+    assert result.exit_code == 0
+    assert "2 converted" in result.output
+    assert (tmp_path / "out" / "one.yaml").exists()
+
+    (tmp_path / "in" / "bad.yaml").write_text("kind: Ingress\n")
+    result = runner.invoke(main, ["convert", str(tmp_path / "in"), "-q", "-j", "2"])
+    assert result.exit_code == 1
+    assert "1 failed" in result.output
+    assert (tmp_path / "in" / "one.gateway.yaml").exists()
+
+
+def test_convert_with_cache(tmp_path):
+    """Test that cached conversion output matches uncached output."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(INGRESS_YAML)
+    runner = CliRunner()
+    expected = runner.invoke(main, ["convert", str(input_file), "-q"]).output
+
+    for _ in range(2):
+        result = runner.invoke(
+            main, ["convert", str(input_file), "-q", "--cache-dir", str(tmp_path / "cache")]
+        )
+        assert result.exit_code == 0
+        assert result.output == expected
+    assert list((tmp_path / "cache").glob("*/*.json"))
+
+
+def test_convert_canonical_skips_unchanged(tmp_path):
+    """Test canonical route order and that unchanged output is not rewritten."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(INGRESS_YAML)
+    output = tmp_path / "gateway.yaml"
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["convert", str(input_file), "--canonical", "-o", str(output)])
+    assert result.exit_code == 0
+    assert "Output written" in result.output
+    routes = [doc for doc in yaml.safe_load_all(output.read_text()) if doc["kind"] == "HTTPRoute"]
+    assert [route["metadata"]["name"] for route in routes] == sorted(
+        route["metadata"]["name"] for route in routes
+    )
+
+    result = runner.invoke(main, ["convert", str(input_file), "--canonical", "-o", str(output)])
+    assert result.exit_code == 0
+    assert "Output unchanged" in result.output
+
+
+def test_convert_output_dir(tmp_path, monkeypatch):
+    """Test writing one file per resource in the kustomize layout."""
+    monkeypatch.chdir(tmp_path)
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(INGRESS_YAML)
+    output_dir = tmp_path / "out"
+    args = ["convert", "ingress.yaml", "--output-dir", "out", "--layout", "kustomize"]
+    runner = CliRunner()
+
+    result = runner.invoke(main, args)
+    assert result.exit_code == 0
+    assert "0 unchanged" in result.output
+    assert (output_dir / "kustomization.yaml").is_file()
+    assert any(output_dir.glob("*/gateway-*.yaml"))
+
+    result = runner.invoke(main, args)
+    assert result.exit_code == 0
+    assert "0 written" in result.output
+
+    result = runner.invoke(main, ["convert", str(input_file), "--shards", "2"])
+    assert result.exit_code == 2
+    assert "require --output-dir" in result.output
+
+
+def test_convert_bundle(tmp_path, monkeypatch):
+    """Test writing resources and the report into a tar.gz bundle."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "ingress.yaml").write_text(INGRESS_YAML)
+    runner = CliRunner()
+
+    result = runner.invoke(
+        main, ["convert", "ingress.yaml", "--bundle", "out.tar.gz", "--report", "report.md"]
+    )
+    assert result.exit_code == 0
+    assert "Output written to out.tar.gz" in result.output
+    with tarfile.open(tmp_path / "out.tar.gz") as archive:
+        names = archive.getnames()
+    assert names[-1] == "report.md"
+    assert any(name.startswith("gateway-") for name in names)
+
+    result = runner.invoke(main, ["convert", "ingress.yaml", "--bundle", "out.tar.gz", "--stream"])
+    assert result.exit_code == 0
+    with tarfile.open(tmp_path / "out.tar.gz") as archive:
+        assert archive.getnames() == names[:-1]
+
+
+def test_convert_keep_going(tmp_path):
+    """Test that --keep-going converts valid Ingresses and reports the others."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(
+        INGRESS_YAML + "---\napiVersion: networking.k8s.io/v1\nkind: Ingress\n"
+        "metadata:\n  name: bad\n"
+    )
+    output = tmp_path / "gateway.yaml"
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["convert", str(input_file), "-o", str(output)])
+    assert result.exit_code == 1
+    assert not output.exists()
+
+    for mode in ([], ["--stream"]):
+        output.unlink(missing_ok=True)
+        result = runner.invoke(main, ["convert", str(input_file), "-o", str(output), "-k", *mode])
+        assert result.exit_code == 1
+        assert "1 Ingress(es) failed validation" in result.output
+        assert "default/bad" in result.output
+        kinds = [doc["kind"] for doc in yaml.safe_load_all(output.read_text())]
+        assert kinds.count("HTTPRoute") == 2
+
+
+def test_convert_max_memory(tmp_path):
+    """Test that spilling resources to disk gives identical output."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(INGRESS_YAML)
+    runner = CliRunner()
+
+    for options in ([], ["--canonical"]):
+        outputs = []
+        for extra in ([], ["--max-memory", "1"]):
+            output = tmp_path / f"gateway{len(outputs)}.yaml"
+            result = runner.invoke(
+                main, ["convert", str(input_file), "-o", str(output), *options, *extra]
+            )
+            assert result.exit_code == 0
+            outputs.append(output.read_text())
+        assert outputs[0] == outputs[1]
+
+
+def test_validate_multiple_files(tmp_path, monkeypatch):
+    """Test validating every Ingress in several files."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "good.yaml").write_text(INGRESS_YAML)
+    (tmp_path / "bad.yaml").write_text("apiVersion: networking.k8s.io/v1\nkind: Ingress\n")
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["validate", "good.yaml"])
+    assert result.exit_code == 0
+    assert "good.yaml (web): Ingress is valid" in result.output
+    assert "good.yaml (api): Ingress is valid" in result.output
+
+    result = runner.invoke(main, ["validate", "."])
+    assert result.exit_code == 1
+    assert "bad.yaml: Validation failed" in result.output
+
+
+def test_parse_limits(tmp_path):
+    """Test that parse limits given to the CLI reject oversized input."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(INGRESS_YAML)
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["--max-documents", "1", "convert", str(input_file), "-q"])
+    assert result.exit_code == 1
+    assert "more than the limit of 1 documents" in result.output
+
+    result = runner.invoke(main, ["convert", str(input_file), "-q"], env={"I2G_MAX_DEPTH": "3"})
+    assert result.exit_code == 1
+    assert "nested deeper than the limit of 3" in result.output
+
+    result = runner.invoke(main, ["convert", str(input_file), "-q"])
+    assert result.exit_code == 0
+
+
+def test_convert_consolidate(tmp_path):
+    """Test that --consolidate keeps the listeners of every Ingress."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(INGRESS_YAML)
+    output = tmp_path / "gateway.yaml"
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["convert", str(input_file), "-o", str(output), "--consolidate"])
+    assert result.exit_code == 0
+    documents = list(yaml.safe_load_all(output.read_text()))
+    (gateway,) = [doc for doc in documents if doc["kind"] == "Gateway"]
+    hostnames = [listener["hostname"] for listener in gateway["spec"]["listeners"]]
+    assert hostnames == ["example.com", "api.example.com"]
+    for route in documents[1:]:
+        assert route["spec"]["parentRefs"][0]["name"] == gateway["metadata"]["name"]
+
+    result = runner.invoke(main, ["convert", str(input_file), "--minimize-listeners"])
+    assert result.exit_code == 0
+    assert "Consolidated 2 listeners into 1 on 1 Gateway(s), saving 1" in result.output
+
+    result = runner.invoke(main, ["convert", str(input_file), "--consolidate", "--stream"])
+    assert result.exit_code == 2
+
+
+def test_convert_merge_routes(tmp_path):
+    """Test that --merge-routes merges the routes of a consolidated Gateway."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(INGRESS_YAML + "---\n" + INGRESS_YAML.replace("name: web", "name: web2"))
+    output = tmp_path / "gateway.yaml"
+    runner = CliRunner()
+
+    result = runner.invoke(
+        main, ["convert", str(input_file), "-o", str(output), "--consolidate", "--merge-routes"]
+    )
+    assert result.exit_code == 0
+    assert "Merged 4 HTTPRoutes into 2" in result.output
+
+
+def test_check_conflicts(tmp_path):
+    """Test path conflict checks during conversion and on Gateway API YAML."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(INGRESS_YAML + "---\n" + INGRESS_YAML.replace("name: web", "name: web2"))
+    output = tmp_path / "gateway.yaml"
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["convert", str(input_file), "--check-conflicts"])
+    assert result.exit_code == 1
+    assert "Path conflicts" in result.output
+
+    result = runner.invoke(main, ["convert", str(input_file), "-o", str(output)])
+    assert result.exit_code == 0
+    result = runner.invoke(main, ["conflicts", str(output)])
+    assert result.exit_code == 1
+    assert "default/web2-example-com.spec.rules[0].matches[0]" in result.output
+
+    output.write_text(yaml.safe_dump_all(list(yaml.safe_load_all(output.read_text()))[:3]))
+    result = runner.invoke(main, ["conflicts", str(output)])
+    assert result.exit_code == 0
+    assert "No path conflicts in 2 HTTPRoute(s)" in result.output
+
+
+def test_convert_optimize_routes(tmp_path):
+    """Test that --optimize-routes merges rules, also when streaming."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(
+        INGRESS_YAML.replace(
+            "          - path: /v1",
+            "          - path: /v2\n"
+            "            pathType: ImplementationSpecific\n"
+            "            backend:\n"
+            "              service:\n"
+            "                name: api\n"
+            "                port:\n"
+            "                  number: 8080\n"
+            "          - path: /v1",
+        )
+    )
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["convert", str(input_file), "--optimize-routes"])
+    assert result.exit_code == 0
+    assert "Optimized 3 HTTPRoute rules into 2" in result.output
+
+    result = runner.invoke(
+        main, ["convert", str(input_file), "-q", "--optimize-routes", "--stream"]
+    )
+    assert result.exit_code == 0
+    (route,) = [
+        doc
+        for doc in yaml.safe_load_all(result.output)
+        if doc["metadata"]["name"] == "api-api-example-com"
+    ]
+    assert len(route["spec"]["rules"]) == 1
+
+
+def test_convert_optimize_routes_regex_paths(tmp_path):
+    """Test that regex paths are only converted as regexes with --optimize-routes."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(
+        INGRESS_YAML.replace(
+            "\n  name: api\n",
+            "\n  name: api\n  annotations:\n    nginx.ingress.kubernetes.io/use-regex: 'true'\n",
+        ).replace(
+            "          - path: /v1\n            pathType: Prefix",
+            "          - path: /v[0-9]+\n            pathType: ImplementationSpecific",
+        )
+    )
+    runner = CliRunner()
+
+    def paths(*args):
+        result = runner.invoke(main, ["convert", str(input_file), "-q", *args])
+        assert result.exit_code == 0
+        (route,) = [
+            doc
+            for doc in yaml.safe_load_all(result.output)
+            if doc["metadata"]["name"] == "api-api-example-com"
+        ]
+        return [match["path"] for rule in route["spec"]["rules"] for match in rule["matches"]]
+
+    assert paths() == [{"type": "PathPrefix", "value": "/v[0-9]+"}]
+    assert paths("--optimize-routes") == [{"type": "RegularExpression", "value": "/v[0-9]+.*"}]
+    assert paths("--optimize-routes", "--stream") == paths("--optimize-routes", "--jobs", "2")
+
+
+def test_convert_batch_keep_going(tmp_path):
+    """Test that --keep-going also applies to directory input."""
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "ingress.yaml").write_text(
+        INGRESS_YAML + "---\nkind: Ingress\nmetadata:\n  name: bad\n"
+    )
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["convert", str(tmp_path / "in"), "-o", str(tmp_path / "out")])
+    assert result.exit_code == 1
+    assert not (tmp_path / "out").exists()
+
+    result = runner.invoke(
+        main, ["convert", str(tmp_path / "in"), "-o", str(tmp_path / "out"), "-k"]
+    )
+    assert result.exit_code == 1
+    assert "Skipped Ingresses" in result.output
+    assert "default/bad" in result.output
+    documents = yaml.safe_load_all((tmp_path / "out" / "ingress.yaml").read_text())
+    assert [doc["kind"] for doc in documents].count("HTTPRoute") == 2
+
+
+def test_convert_consolidate_reference_grants(tmp_path):
+    """Test that consolidating Ingresses of several namespaces adds ReferenceGrants."""
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    input_file = input_dir / "ingress.yaml"
+    input_file.write_text(
+        INGRESS_YAML.replace(
+            "namespace: default\nspec:\n  rules:\n    - host: api",
+            "namespace: apps\n"
+            "spec:\n  tls:\n    - hosts: [api.example.com]\n      secretName: api-tls\n"
+            "  rules:\n    - host: api",
+        )
+    )
+    output = tmp_path / "gateway.yaml"
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["convert", str(input_file), "-o", str(output), "--consolidate"])
+    assert result.exit_code == 0
+    documents = list(yaml.safe_load_all(output.read_text()))
+    grants = [doc for doc in documents if doc["kind"] == "ReferenceGrant"]
+    assert ("apps", "Secret") in {
+        (grant["metadata"]["namespace"], grant["spec"]["to"][0]["kind"]) for grant in grants
+    }
+
+    out_dir = tmp_path / "out"
+    result = runner.invoke(main, ["convert", str(input_dir), "-o", str(out_dir), "--consolidate"])
+    assert result.exit_code == 0
+    documents = yaml.safe_load_all((out_dir / "ingress.yaml").read_text())
+    assert [doc for doc in documents if doc["kind"] == "ReferenceGrant"] == grants
+
+    result = runner.invoke(main, ["convert", str(input_file), "-o", str(output)])
+    assert "ReferenceGrant" not in output.read_text()
+
+
+def test_convert_watch_rejects_output_file(tmp_path):
+    """Test that --watch only takes an output file for a single input file."""
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "ingress.yaml").write_text(INGRESS_YAML)
+    runner = CliRunner()
+
+    output = tmp_path / "out.yaml"
+    result = runner.invoke(main, ["convert", str(tmp_path / "in"), "-o", str(output), "--watch"])
+    assert result.exit_code == 2
+    assert "--output must name a directory" in result.output
+    assert not output.exists()
+
+
+def test_convert_bundle_stream_reference_grants(tmp_path, monkeypatch):
+    """Test that a streamed bundle ends with the ReferenceGrants its routes need."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "ingress.yaml").write_text(INGRESS_YAML)
+    iter_results = cli._iter_results
+
+    def shared_backends(*args):
+        for result in iter_results(*args):
+            for route in result.resources["httproutes"]:
+                route["spec"]["rules"][0]["backendRefs"][0]["namespace"] = "shared"
+            yield result
+
+    monkeypatch.setattr(cli, "_iter_results", shared_backends)
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["convert", "ingress.yaml", "--bundle", "out.tar.gz", "--stream"])
+    assert result.exit_code == 0
+    with tarfile.open(tmp_path / "out.tar.gz") as archive:
+        name = archive.getnames()[-1]
+        grant = yaml.safe_load(archive.extractfile(name).read())
+    assert grant["kind"] == "ReferenceGrant"
+    assert grant["metadata"]["namespace"] == "shared"
+    assert grant["spec"]["to"] == [{"group": "", "kind": "Service", "name": None}]
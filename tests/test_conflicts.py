@@ -0,0 +1,79 @@
+"""Tests for path conflict detection."""
+
+from src.ingress2gateway.conflicts import find_path_conflicts
+
+
+def _route(name, namespace, hostnames, matches, backend=None):
+    return {
+        "kind": "HTTPRoute",
+        "metadata": {"name": name, "namespace": namespace},
+        "spec": {
+            "hostnames": hostnames,
+            "rules": [
+                {
+                    "matches": [{"path": {"type": path_type, "value": value}}],
+                    "backendRefs": [{"name": backend or name, "port": 80}],
+                }
+                for path_type, value in matches
+            ],
+        },
+    }
+
+
+def test_conflicts_across_namespaces():
+    """Test that identical matches with other backends are conflicts."""
+    result = find_path_conflicts(
+        [
+            _route("web", "team", ["example.com"], [("PathPrefix", "/api/")]),
+            _route("api", "shop", ["example.com"], [("PathPrefix", "/api")]),
+            _route("other", "shop", ["other.example.com"], [("PathPrefix", "/api")]),
+            _route("any", "shop", [], [("PathPrefix", "/api")]),
+        ]
+    )
+
+    # shop/api sorts before team/web, so it takes precedence
+    assert [(error.path, error.message) for error in result.errors] == [
+        (
+            "team/web.spec.rules[0].matches[0]",
+            "PathPrefix match on example.com conflicts with "
+            "shop/api.spec.rules[0].matches[0], which takes precedence",
+        )
+    ]
+    assert [warning.path for warning in result.warnings] == ["team/web.spec.rules[0]"]
+
+
+def test_duplicates_and_overlaps():
+    """Test duplicate, unreachable and cross-namespace nested matches."""
+    result = find_path_conflicts(
+        [
+            _route("web", "shop", ["example.com"], [("PathPrefix", "/"), ("PathPrefix", "//")]),
+            _route("api", "team", ["example.com"], [("Exact", "/api"), ("PathPrefix", "/api/v1")]),
+            _route("app", "shop", ["example.com"], [("PathPrefix", "/app")]),
+            _route("copy", "team", ["example.com"], [("Exact", "/api")], backend="api"),
+            _route("re", "team", ["example.com"], [("RegularExpression", "/api/.*")]),
+        ]
+    )
+
+    assert result.is_valid
+    assert [(warning.path, warning.message) for warning in result.warnings] == [
+        (
+            "shop/web.spec.rules[1].matches[0]",
+            "PathPrefix match on example.com duplicates shop/web.spec.rules[0].matches[0]",
+        ),
+        (
+            "team/copy.spec.rules[0].matches[0]",
+            "Exact match on example.com duplicates team/api.spec.rules[0].matches[0]",
+        ),
+        (
+            "team/api.spec.rules[0].matches[0]",
+            "Exact match on example.com takes requests from "
+            "shop/web.spec.rules[0].matches[0] in namespace shop",
+        ),
+        (
+            "team/api.spec.rules[1].matches[0]",
+            "PathPrefix match on example.com takes requests from "
+            "shop/web.spec.rules[0].matches[0] in namespace shop",
+        ),
+        ("shop/web.spec.rules[1]", "Rule is unreachable: all its matches are shadowed"),
+        ("team/copy.spec.rules[0]", "Rule is unreachable: all its matches are shadowed"),
+    ]
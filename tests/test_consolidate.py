@@ -0,0 +1,197 @@
+"""Tests for fleet-level Gateway consolidation."""
+
+from src.ingress2gateway.consolidate import GatewayConsolidator
+from src.ingress2gateway.pipeline import convert_document, merge_results
+from src.ingress2gateway.reference_grant import generate_reference_grants
+
+
+def _ingress(name, namespace, hosts, tls_hosts=(), default_backend=False, secret=None):
+    spec = {
+        "rules": [
+            {
+                "host": host,
+                "http": {
+                    "paths": [
+                        {
+                            "path": "/",
+                            "pathType": "Prefix",
+                            "backend": {"service": {"name": name, "port": {"number": 80}}},
+                        }
+                    ]
+                },
+            }
+            for host in hosts
+        ]
+    }
+    if tls_hosts:
+        spec["tls"] = [{"hosts": list(tls_hosts), "secretName": secret or f"{name}-tls"}]
+    if default_backend:
+        spec["defaultBackend"] = {"service": {"name": name, "port": {"number": 80}}}
+    return {
+        "apiVersion": "networking.k8s.io/v1",
+        "kind": "Ingress",
+        "metadata": {"name": name, "namespace": namespace},
+        "spec": spec,
+    }
+
+
+def _merge(ingresses, consolidator):
+    results = [convert_document(ingress, "istio") for ingress in ingresses]
+    return merge_results(results, consolidator=consolidator).resources
+
+
+def test_consolidate_merges_listeners():
+    """Test that listeners are merged by hostname, port and protocol."""
+    resources = _merge(
+        [
+            _ingress("web", "shop", ["a.example.com"], ["a.example.com"], default_backend=True),
+            _ingress("api", "team", ["a.example.com", "b.example.com"], ["a.example.com"]),
+        ],
+        GatewayConsolidator(),
+    )
+
+    assert len(resources["gateways"]) == 1
+    gateway = resources["gateway"]
+    assert gateway["metadata"] == {"name": "web", "namespace": "shop"}
+    listeners = {listener["name"]: listener for listener in gateway["spec"]["listeners"]}
+    assert list(listeners) == ["https-a-example-com", "http-b-example-com"]
+    assert listeners["https-a-example-com"]["tls"]["certificateRefs"] == [
+        {"kind": "Secret", "name": "web-tls"},
+        {"kind": "Secret", "name": "api-tls", "namespace": "team"},
+    ]
+    assert listeners["https-a-example-com"]["allowedRoutes"] == {"namespaces": {"from": "All"}}
+
+    routes = {route["metadata"]["name"]: route for route in resources["httproutes"]}
+    assert len(resources["httproutes"]) == 4
+    assert routes["api-b-example-com"]["spec"]["parentRefs"] == [
+        {"name": "web", "namespace": "shop", "sectionName": "http-b-example-com"}
+    ]
+    # A route without hostnames only attaches to its own Ingress's listeners
+    assert routes["web-default"]["spec"]["parentRefs"] == [
+        {"name": "web", "namespace": "shop", "sectionName": "https-a-example-com"}
+    ]
+
+    grants = generate_reference_grants(resources["gateways"], resources["httproutes"])
+    assert {
+        (grant["metadata"]["namespace"], grant["spec"]["to"][0]["kind"]) for grant in grants
+    } == {
+        ("shop", "Gateway"),
+        ("team", "Secret"),
+    }
+
+
+def test_consolidate_shards_listeners():
+    """Test that Gateways over the listener limit are split deterministically."""
+    ingresses = [_ingress(f"web{i}", "shop", [f"h{i}.example.com"]) for i in range(3)]
+    ingresses.append(_ingress("secure", "shop", ["h1.example.com"], ["h1.example.com"]))
+    resources = _merge(ingresses, GatewayConsolidator(max_listeners=2))
+
+    gateways = resources["gateways"]
+    assert [gateway["metadata"]["name"] for gateway in gateways] == ["web0", "web0-2", "web0-3"]
+    # The HTTP and HTTPS listeners of a host stay on one Gateway
+    assert [
+        [listener["name"] for listener in gateway["spec"]["listeners"]] for gateway in gateways
+    ] == [
+        ["http-h0-example-com"],
+        ["http-h1-example-com", "https-h1-example-com"],
+        ["http-h2-example-com"],
+    ]
+    assert resources["gateway"] is gateways[0]
+
+    for route in resources["httproutes"]:
+        host = route["spec"]["hostnames"][0]
+        (gateway,) = [
+            gateway
+            for gateway in gateways
+            if any(listener["hostname"] == host for listener in gateway["spec"]["listeners"])
+        ]
+        assert {ref["name"] for ref in route["spec"]["parentRefs"]} == {gateway["metadata"]["name"]}
+
+    again = _merge(ingresses, GatewayConsolidator(max_listeners=2))
+    assert again["gateways"] == gateways
+    assert list(again["httproutes"]) == list(resources["httproutes"])
+
+
+def test_minimize_listeners_without_hostless_routes():
+    """Test folding every listener into one per port when all routes carry hostnames."""
+    consolidator = GatewayConsolidator(minimize=True)
+    resources = _merge(
+        [
+            _ingress("a", "shop", ["a.example.com"], ["a.example.com"]),
+            _ingress("b", "team", ["b.example.com"], ["b.example.com"]),
+            _ingress("c", "shop", ["c.example.com"]),
+        ],
+        consolidator,
+    )
+
+    (gateway,) = resources["gateways"]
+    assert gateway["spec"]["listeners"] == [
+        {
+            "name": "https",
+            "port": 443,
+            "protocol": "HTTPS",
+            "tls": {
+                "mode": "Terminate",
+                "certificateRefs": [
+                    {"kind": "Secret", "name": "a-tls"},
+                    {"kind": "Secret", "name": "b-tls", "namespace": "team"},
+                ],
+            },
+            "allowedRoutes": {"namespaces": {"from": "All"}},
+        },
+        {
+            "name": "http-c-example-com",
+            "hostname": "c.example.com",
+            "port": 80,
+            "protocol": "HTTP",
+            "allowedRoutes": {"namespaces": {"from": "Same"}},
+        },
+    ]
+    assert consolidator.listeners_added == 3
+    assert [
+        ref["sectionName"]
+        for route in resources["httproutes"]
+        for ref in route["spec"]["parentRefs"]
+    ] == [
+        "https",
+        "https",
+        "http-c-example-com",
+    ]
+
+
+def test_minimize_listeners_by_certificate():
+    """Test wildcard and shared-certificate folding next to routes without hostnames."""
+    resources = _merge(
+        [
+            _ingress("wild", "shop", ["*.example.com"], ["*.example.com"], secret="wild"),
+            _ingress("a", "shop", ["a.example.com"], ["a.example.com"], secret="wild"),
+            _ingress("d", "shop", ["d.example.com"], ["d.example.com"], True, secret="wild"),
+            _ingress("b", "shop", ["b.other.com"], ["b.other.com"], secret="other"),
+            _ingress("c", "shop", ["c.other.com"], ["c.other.com"], secret="other"),
+        ],
+        GatewayConsolidator(minimize=True),
+    )
+
+    (gateway,) = resources["gateways"]
+    listeners = {listener["name"]: listener for listener in gateway["spec"]["listeners"]}
+    assert [(name, listener["hostname"]) for name, listener in listeners.items()] == [
+        ("https-wildcard-example-com", "*.example.com"),
+        ("https-d-example-com", "d.example.com"),
+        ("https-wildcard-other-com", "*.other.com"),
+    ]
+    assert listeners["https-wildcard-other-com"]["tls"]["certificateRefs"] == [
+        {"kind": "Secret", "name": "other"}
+    ]
+
+    refs = {
+        route["metadata"]["name"]: [ref["sectionName"] for ref in route["spec"]["parentRefs"]]
+        for route in resources["httproutes"]
+    }
+    assert refs == {
+        "wild-*-example-com": ["https-wildcard-example-com"],
+        "a-a-example-com": ["https-wildcard-example-com"],
+        "d-d-example-com": ["https-d-example-com"],
+        "d-default": ["https-d-example-com"],
+        "b-b-other-com": ["https-wildcard-other-com"],
+        "c-c-other-com": ["https-wildcard-other-com"],
+    }
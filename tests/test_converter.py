@@ -114,6 +114,87 @@ def test_convert_ingress_with_tls():
     assert https_listeners[0]["tls"]["certificateRefs"][0]["name"] == "tls-secret"
 
 
+def _implementation_specific(paths, annotations=None, regex_paths=False):
+    metadata = {"name": "test", "namespace": "default"}
+    if annotations:
+        metadata["annotations"] = annotations
+    ingress = {
+        "apiVersion": "networking.k8s.io/v1",
+        "kind": "Ingress",
+        "metadata": metadata,
+        "spec": {
+            "rules": [
+                {
+                    "host": "example.com",
+                    "http": {
+                        "paths": [
+                            {
+                                "path": path,
+                                "pathType": "ImplementationSpecific",
+                                "backend": {"service": {"name": "svc", "port": {"number": 80}}},
+                            }
+                            for path in paths
+                        ]
+                    },
+                }
+            ],
+        },
+    }
+    result = convert_ingress_to_gateway(ingress, regex_paths)
+    return [rule["matches"][0]["path"] for rule in result["httproutes"][0]["spec"]["rules"]]
+
+
+def test_convert_implementation_specific_paths():
+    """Test that ImplementationSpecific paths are kept as prefixes by default."""
+    annotations = {"nginx.ingress.kubernetes.io/use-regex": "true"}
+    paths = _implementation_specific(["/*", "/api/*", "/api/v[0-9]+"], annotations)
+
+    assert paths == [
+        {"type": "PathPrefix", "value": "/*"},
+        {"type": "PathPrefix", "value": "/api/*"},
+        {"type": "PathPrefix", "value": "/api/v[0-9]+"},
+    ]
+
+
+def test_convert_implementation_specific_wildcards():
+    """Test that with regex_paths, '/*' drops its wildcard and regexes stay prefixes."""
+    paths = _implementation_specific(
+        ["/*", "/api/*", "/api(/|$)(.*)", "/robots.txt"], regex_paths=True
+    )
+
+    assert paths == [
+        {"type": "PathPrefix", "value": "/"},
+        {"type": "PathPrefix", "value": "/api"},
+        {"type": "PathPrefix", "value": "/api(/|$)(.*)"},
+        {"type": "PathPrefix", "value": "/robots.txt"},
+    ]
+
+
+def test_convert_implementation_specific_use_regex():
+    """Test that with regex_paths, paths with regex syntax become regex matches.
+
+    ingress-nginx only anchors them at the start of the path, so they are
+    extended to match the rest of it.
+    """
+    for annotations in [
+        {"nginx.ingress.kubernetes.io/use-regex": "true"},
+        {"nginx.ingress.kubernetes.io/rewrite-target": "/$2"},
+    ]:
+        paths = _implementation_specific(
+            ["/api(/|$)(.*)", "/api/v[0-9]+", "^/exact$", "/api/*", "/robots.txt"],
+            annotations,
+            regex_paths=True,
+        )
+
+        assert paths == [
+            {"type": "RegularExpression", "value": "/api(/|$)(.*)"},
+            {"type": "RegularExpression", "value": "/api/v[0-9]+.*"},
+            {"type": "RegularExpression", "value": "^/exact$"},
+            {"type": "PathPrefix", "value": "/api"},
+            {"type": "PathPrefix", "value": "/robots.txt"},
+        ]
+
+
 def test_convert_empty_ingress_raises():
     """Test that empty ingress raises ValueError."""
     with pytest.raises(ValueError, match="Empty ingress"):
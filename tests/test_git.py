@@ -0,0 +1,73 @@
+"""Tests for the git plumbing helpers."""
+
+import shutil
+import subprocess
+
+import pytest
+from click.testing import CliRunner
+
+from src.ingress2gateway.cli import main
+from src.ingress2gateway.git import changed_files
+
+from .test_batch import INGRESS_YAML
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a repository with a base commit and some changes on top."""
+    (tmp_path / "apps").mkdir()
+    for name in ("web", "api", "admin"):
+        (tmp_path / "apps" / f"{name}.yaml").write_text(INGRESS_YAML.format(name=name))
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "base")
+    _git(tmp_path, "checkout", "-q", "-b", "feature")
+
+    # A committed change, an uncommitted change, an untracked file and a deletion
+    (tmp_path / "apps" / "web.yaml").write_text(INGRESS_YAML.format(name="web2"))
+    _git(tmp_path, "commit", "-q", "-am", "change web")
+    (tmp_path / "apps" / "api.yaml").write_text(INGRESS_YAML.format(name="api2"))
+    (tmp_path / "apps" / "new.yaml").write_text(INGRESS_YAML.format(name="new"))
+    (tmp_path / "apps" / "admin.yaml").unlink()
+    return tmp_path
+
+
+def test_changed_files(repo):
+    """Test that committed, uncommitted and untracked changes are found."""
+    changed = changed_files("main", repo / "apps")
+
+    assert {p.name for p in changed} == {"web.yaml", "api.yaml", "new.yaml"}
+    assert all(p.is_absolute() for p in changed)
+
+    with pytest.raises(ValueError, match="git merge-base failed"):
+        changed_files("no-such-ref", repo)
+
+
+def test_convert_and_validate_changed_since(repo, monkeypatch):
+    """Test that only changed files are converted and validated."""
+    monkeypatch.chdir(repo)
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["convert", "apps", "-o", "out", "--changed-since", "main"])
+    assert result.exit_code == 0
+    assert "3 files" in result.output
+    assert sorted(p.name for p in (repo / "out").iterdir()) == ["api.yaml", "new.yaml", "web.yaml"]
+
+    result = runner.invoke(main, ["validate", "apps", "--changed-since", "HEAD"])
+    assert result.exit_code == 0
+    assert "api.yaml" in result.output
+    assert "web.yaml" not in result.output
+
+    result = runner.invoke(main, ["convert", "apps", "--changed-since", "no-such-ref"])
+    assert result.exit_code == 2
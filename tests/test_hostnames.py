@@ -0,0 +1,87 @@
+"""Tests for hostname matching between listeners and routes."""
+
+import random
+
+from src.ingress2gateway.hostnames import HostnameIndex, ListenerIndex, intersects
+
+
+def test_hostname_index_matches():
+    """Test lookups of hostnames, wildcards and values without a hostname."""
+    index = HostnameIndex()
+    for hostname in [
+        "a.example.com",
+        "*.example.com",
+        "example.com",
+        "*.com",
+        "b.a.example.com",
+        None,
+        "*.a.example.com",
+        "other.org",
+    ]:
+        index.add(hostname, hostname)
+
+    assert len(index) == 8
+    assert index.matches("a.example.com") == ["a.example.com", "*.example.com", "*.com", None]
+    assert index.matches("example.com") == ["example.com", "*.com", None]
+    assert index.matches("x.b.a.example.com") == [
+        "*.a.example.com",
+        "*.example.com",
+        "*.com",
+        None,
+    ]
+    assert index.matches("*.example.com") == [
+        "*.example.com",
+        "a.example.com",
+        "*.a.example.com",
+        "b.a.example.com",
+        "*.com",
+        None,
+    ]
+    assert index.matches("EXAMPLE.org") == [None]
+    assert len(index.matches(None)) == 8
+
+
+def test_hostname_index_agrees_with_intersects():
+    """Test that index lookups find exactly the intersecting hostnames."""
+    rng = random.Random(7)
+    labels = ["a", "b", "c"]
+
+    def hostname():
+        name = ".".join(rng.choice(labels) for _ in range(rng.randint(1, 4)))
+        return f"*.{name}" if rng.random() < 0.3 else name
+
+    hostnames = list(dict.fromkeys(hostname() for _ in range(200)))
+    index = HostnameIndex()
+    for name in hostnames:
+        index.add(name, name)
+
+    for _ in range(200):
+        query = hostname()
+        assert sorted(index.matches(query)) == sorted(
+            name for name in hostnames if intersects(name, query)
+        )
+
+
+def test_listener_index_accepting():
+    """Test resolving parentRefs to the listeners a route attaches to."""
+    listeners = [
+        {"name": "http", "port": 80, "protocol": "HTTP"},
+        {"name": "https-wild", "port": 443, "protocol": "HTTPS", "hostname": "*.example.com"},
+        {"name": "https-a", "port": 443, "protocol": "HTTPS", "hostname": "a.example.com"},
+    ]
+    index = ListenerIndex(
+        [{"metadata": {"name": "gw", "namespace": "infra"}, "spec": {"listeners": listeners}}]
+    )
+
+    def route(hostnames, **ref):
+        ref = {"name": "gw", "namespace": "infra", **ref}
+        return {
+            "metadata": {"namespace": "shop"},
+            "spec": {"parentRefs": [ref], "hostnames": hostnames},
+        }
+
+    assert index.accepting(route(["a.example.com"])) == [listeners[2], listeners[1], listeners[0]]
+    assert index.accepting(route(["b.example.com"], port=443)) == [listeners[1]]
+    assert index.accepting(route([], sectionName="https-a")) == [listeners[2]]
+    assert index.accepting(route(["b.example.com"], sectionName="https-a")) == []
+    assert index.accepting(route(["a.example.com"], namespace="shop")) is None
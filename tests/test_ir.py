@@ -0,0 +1,99 @@
+"""Tests for the compact intermediate representation."""
+
+from src.ingress2gateway.converter import build_resources, convert_ingress_to_gateway
+from src.ingress2gateway.ir import Route, RouteList
+from src.ingress2gateway.pipeline import ConversionSession, merge_results
+from src.ingress2gateway.report import generate_migration_report
+from src.ingress2gateway.validation import validate_conversion_output
+
+INGRESS = {
+    "apiVersion": "networking.k8s.io/v1",
+    "kind": "Ingress",
+    "metadata": {"name": "web", "namespace": "prod"},
+    "spec": {
+        "tls": [{"hosts": ["example.com"], "secretName": "example-tls"}],
+        "rules": [
+            {
+                "host": "example.com",
+                "http": {
+                    "paths": [
+                        {
+                            "path": "/api",
+                            "pathType": "Exact",
+                            "backend": {"service": {"name": "api", "port": {"number": 8080}}},
+                        }
+                    ]
+                },
+            }
+        ],
+        "defaultBackend": {"service": {"name": "web", "port": {"number": 80}}},
+    },
+}
+
+
+def test_build_resources_matches_dictionaries():
+    """Test that the IR turns into exactly the converter's dictionaries."""
+    gateway, routes = build_resources(INGRESS)
+    resources = convert_ingress_to_gateway(INGRESS)
+
+    assert gateway.to_dict() == resources["gateway"]
+    assert [route.to_dict() for route in routes] == resources["httproutes"]
+    assert resources["gateway"]["spec"]["listeners"][0]["tls"]["certificateRefs"] == [
+        {"kind": "Secret", "name": "example-tls"}
+    ]
+
+
+def test_route_from_dict_round_trip():
+    """Test that routes convert back unchanged, and other shapes are refused."""
+    for route in convert_ingress_to_gateway(INGRESS)["httproutes"]:
+        compact = Route.from_dict(route)
+        assert compact is not None
+        assert compact.to_dict() == route
+        assert list(compact.to_dict()["spec"]) == list(route["spec"])
+
+    route = convert_ingress_to_gateway(INGRESS)["httproutes"][0]
+    route["spec"]["rules"][0]["filters"] = [{"type": "RequestHeaderModifier"}]
+    assert Route.from_dict(route) is None
+    route = convert_ingress_to_gateway(INGRESS)["httproutes"][0]
+    route["metadata"]["labels"] = {"app": "web"}
+    assert Route.from_dict(route) is None
+    assert Route.from_dict({"kind": "HTTPRoute"}) is None
+
+
+def test_route_list():
+    """Test that a RouteList behaves like the list of routes it was given."""
+    routes = convert_ingress_to_gateway(INGRESS)["httproutes"]
+    unusual = {"kind": "HTTPRoute", "metadata": {"name": "other"}, "spec": {"rules": []}}
+
+    route_list = RouteList(routes)
+    assert len(route_list) == 2
+    route_list.append(unusual)
+
+    assert len(route_list) == 3
+    assert list(route_list) == [*routes, unusual]
+    assert list(route_list) == list(route_list)
+    assert not RouteList()
+
+
+def test_merged_routes_stay_compact(monkeypatch):
+    """Test that merged routes are only turned into dictionaries when written out."""
+    merged = merge_results(ConversionSession().convert_many([INGRESS]))
+    routes = merged.resources["httproutes"]
+    assert all(isinstance(route, Route) for route in routes.compact())
+
+    resources = {**merged.resources, "httproutes": list(routes)}
+    expected = generate_migration_report(merged.ingress, resources, [], [])
+
+    def to_dict(self):
+        raise AssertionError("Route.to_dict() called")
+
+    monkeypatch.setattr(Route, "to_dict", to_dict)
+    assert validate_conversion_output(merged.resources).is_valid
+    report = generate_migration_report(merged.ingress, merged.resources, [], [])
+    monkeypatch.undo()
+
+    def strip(text):
+        return [line for line in text.splitlines() if not line.startswith("Generated:")]
+
+    assert strip(report) == strip(expected)
+    assert list(routes) == convert_ingress_to_gateway(INGRESS)["httproutes"]
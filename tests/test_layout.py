@@ -0,0 +1,88 @@
+"""Tests for per-resource output layouts."""
+
+from pathlib import PurePosixPath
+
+import pytest
+import yaml
+
+from src.ingress2gateway.layout import KUSTOMIZATION, plan_layout, write_layout
+
+
+def _resource(kind, name, namespace="default"):
+    return {"kind": kind, "metadata": {"name": name, "namespace": namespace}}
+
+
+DOCUMENTS = [
+    _resource("Gateway", "gw"),
+    _resource("HTTPRoute", "web"),
+    _resource("HTTPRoute", "api", "billing"),
+]
+
+
+def test_plan_flat_and_per_namespace():
+    """Test file naming in the flat and per-namespace layouts."""
+    assert list(plan_layout(DOCUMENTS, "flat")) == [
+        PurePosixPath("gateway-gw.yaml"),
+        PurePosixPath("httproute-web.yaml"),
+        PurePosixPath("httproute-api.yaml"),
+    ]
+    files = plan_layout(DOCUMENTS, "per-namespace", output_format="json")
+    assert list(files) == [
+        PurePosixPath("default/gateway-gw.json"),
+        PurePosixPath("default/httproute-web.json"),
+        PurePosixPath("billing/httproute-api.json"),
+    ]
+    assert files[PurePosixPath("billing/httproute-api.json")].startswith('{\n  "kind"')
+
+
+def test_plan_name_collision():
+    """Test that resources mapped to the same file get distinct names."""
+    files = plan_layout([_resource("HTTPRoute", "web"), _resource("HTTPRoute", "web", "prod")])
+    assert list(files) == [
+        PurePosixPath("httproute-web.yaml"),
+        PurePosixPath("httproute-web-2.yaml"),
+    ]
+
+
+def test_plan_kustomize():
+    """Test generated kustomization files."""
+    files = plan_layout(DOCUMENTS, "kustomize")
+
+    root = yaml.safe_load(files[PurePosixPath(KUSTOMIZATION)])
+    assert root["kind"] == "Kustomization"
+    assert root["resources"] == ["billing", "default"]
+    namespace = yaml.safe_load(files[PurePosixPath("default") / KUSTOMIZATION])
+    assert namespace["resources"] == ["gateway-gw.yaml", "httproute-web.yaml"]
+
+
+def test_plan_shards():
+    """Test that sharding is stable and keeps namespaces together."""
+    documents = [_resource("HTTPRoute", f"route-{i}", f"ns-{i % 7}") for i in range(50)]
+    files = plan_layout(documents, "kustomize", shards=4)
+
+    assert files == plan_layout(documents, "kustomize", shards=4)
+    shards = {path.parts[0] for path in files if len(path.parts) > 1}
+    assert shards <= {"shard-00", "shard-01", "shard-02", "shard-03"}
+    assert len(shards) > 1
+    for i in range(7):
+        assert len({path.parts[0] for path in files if f"ns-{i}" in path.parts}) == 1
+    root = yaml.safe_load(files[PurePosixPath(KUSTOMIZATION)])
+    assert root["resources"] == sorted(shards)
+
+
+def test_plan_unknown_layout():
+    with pytest.raises(ValueError, match="Unknown layout"):
+        plan_layout(DOCUMENTS, "nested")
+
+
+def test_write_layout_skips_unchanged(tmp_path):
+    """Test writing files and leaving unchanged ones alone."""
+    files = plan_layout(DOCUMENTS, "per-namespace")
+
+    assert write_layout(files, tmp_path / "out") == (3, 0)
+    assert (tmp_path / "out" / "billing" / "httproute-api.yaml").is_file()
+
+    files[PurePosixPath("default/gateway-gw.yaml")] = "changed\n"
+    assert write_layout(iter(files.items()), tmp_path / "out", workers=1) == (1, 2)
+    assert (tmp_path / "out" / "default" / "gateway-gw.yaml").read_text() == "changed\n"
+    assert list((tmp_path / "out").rglob("*.tmp")) == []
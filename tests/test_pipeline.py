@@ -0,0 +1,128 @@
+"""Tests for the streaming conversion pipeline."""
+
+import io
+import json
+
+from src.ingress2gateway.pipeline import (
+    ConversionSession,
+    convert_document,
+    convert_stream,
+    iter_documents,
+    iter_ingresses,
+)
+
+MULTI_DOC_YAML = """
+apiVersion: v1
+kind: Service
+metadata:
+  name: svc
+---
+apiVersion: networking.k8s.io/v1
+kind: Ingress
+metadata:
+  name: first
+spec:
+  rules:
+    - host: a.example.com
+      http:
+        paths:
+          - path: /
+            pathType: Prefix
+            backend:
+              service:
+                name: a-svc
+                port:
+                  number: 80
+---
+apiVersion: networking.k8s.io/v1
+kind: Ingress
+metadata:
+  name: second
+  annotations:
+    nginx.ingress.kubernetes.io/backend-protocol: GRPC
+spec:
+  rules:
+    - host: b.example.com
+      http:
+        paths:
+          - path: /
+            pathType: Prefix
+            backend:
+              service:
+                name: b-svc
+                port:
+                  number: 9000
+"""
+
+
+def test_iter_documents_is_lazy():
+    """Test that documents are yielded before the whole stream is parsed."""
+    documents = iter_documents(io.StringIO("kind: A\n---\nkind: B\n---\n: [invalid"))
+    assert next(documents) == {"kind": "A"}
+    assert next(documents) == {"kind": "B"}
+
+
+def test_iter_ingresses_reports_skipped_kinds():
+    """Test that non-Ingress documents are skipped and reported."""
+    skipped = []
+    documents = [{"kind": "Service"}, None, {"kind": "Ingress"}]
+    ingresses = list(iter_ingresses(documents, on_skip=skipped.append))
+    assert ingresses == [{"kind": "Ingress"}]
+    assert skipped == ["Service"]
+
+
+def test_convert_document_applies_provider():
+    """Test that a single document runs through the full pipeline."""
+    ingress = next(iter_ingresses(iter_documents(MULTI_DOC_YAML)))
+    result = convert_document(ingress, "envoy")
+    assert result.is_valid
+    assert result.resources["gateway"]["spec"]["gatewayClassName"] == "eg"
+    assert result.resources["grpcroutes"] == []
+
+
+def test_convert_document_validation_errors():
+    """Test that invalid input is reported without converting."""
+    ingress = {"apiVersion": "networking.k8s.io/v1", "kind": "Ingress", "spec": {}}
+    result = convert_document(ingress, "istio")
+    assert not result.is_valid
+    assert result.resources is None
+    assert any(error.path == "metadata.name" for error in result.errors)
+
+
+def test_convert_stream_detects_grpc():
+    """Test streaming conversion of multiple Ingresses in order."""
+    results = list(convert_stream(MULTI_DOC_YAML, "istio", detect_grpc=True))
+    assert [r.ingress["metadata"]["name"] for r in results] == ["first", "second"]
+    assert len(results[0].resources["httproutes"]) == 1
+    assert results[1].resources["httproutes"] == []
+    assert results[1].resources["grpcroutes"][0]["kind"] == "GRPCRoute"
+
+
+def test_convert_stream_expands_json_list():
+    """Test that kubectl JSON List output is expanded into its Ingresses."""
+    documents = list(iter_documents(MULTI_DOC_YAML))
+    content = json.dumps({"apiVersion": "v1", "kind": "List", "items": documents})
+    results = list(convert_stream(content, "istio"))
+    assert [r.ingress["metadata"]["name"] for r in results] == ["first", "second"]
+
+
+def test_session_convert_many_matches_convert_document():
+    """Test that a session gives per-call results and shares annotation parsing."""
+    documents = list(iter_documents(MULTI_DOC_YAML))
+    unsupported = {"nginx.ingress.kubernetes.io/unknown": "x"}
+    documents.append({**documents[2], "metadata": {"name": "third", "annotations": unsupported}})
+    listed = {"apiVersion": "v1", "kind": "List", "items": documents[1:] + documents[2:]}
+
+    session = ConversionSession("kong", grpc=True)
+    skipped = []
+    results = list(session.convert_many([documents[0], listed], on_skip=skipped.append))
+
+    expected = [convert_document(doc, "kong", True) for doc in documents[1:] + documents[2:]]
+    assert [r.to_dict() for r in results] == [r.to_dict() for r in expected]
+    assert skipped == ["Service"]
+    assert len(session._annotations) == 3
+
+    # Cached results are copies, so changing one does not leak into the next
+    results[2].warnings.append("changed")
+    results[2].unsupported[0]["value"] = "changed"
+    assert [r.to_dict() for r in session.convert_many(documents[3:])] == [expected[2].to_dict()]
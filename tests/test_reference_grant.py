@@ -90,3 +90,23 @@ def test_generate_reference_grants():
     grants = generate_reference_grants(gateway, httproutes)
     assert len(grants) == 1
     assert grants[0]["metadata"]["namespace"] == "gateway-ns"
+
+
+def test_generate_reference_grants_from_iterables():
+    """Test that routes may be generators, consumed in a single pass."""
+    gateway = {"metadata": {"name": "gw", "namespace": "gateway-ns"}, "spec": {"listeners": []}}
+
+    def routes(kind):
+        for i in range(3):
+            yield {
+                "metadata": {"name": f"route-{i}", "namespace": "app-ns"},
+                "kind": kind,
+                "spec": {"parentRefs": [{"name": "gw", "namespace": "gateway-ns"}]},
+            }
+
+    grants = generate_reference_grants(gateway, routes("HTTPRoute"), routes("GRPCRoute"))
+    assert len(grants) == 1
+    assert sorted(source["kind"] for source in grants[0]["spec"]["from"]) == [
+        "GRPCRoute",
+        "HTTPRoute",
+    ]
@@ -1,5 +1,7 @@
 """Tests for reverse conversion (Gateway API to Ingress)."""
 
+import json
+
 from src.ingress2gateway.reverse import (
     convert_gateway_to_ingress,
     gateway_resources_to_ingress_yaml,
@@ -93,3 +95,21 @@ def test_gateway_resources_to_ingress_yaml():
 
     assert "kind: Ingress" in yaml_output
     assert "name: test" in yaml_output
+
+
+def test_parse_gateway_resources_json_list():
+    """Test parsing Gateway API resources from a JSON List."""
+    content = json.dumps(
+        {
+            "apiVersion": "v1",
+            "kind": "List",
+            "items": [
+                {"kind": "Gateway", "metadata": {"name": "gw"}, "spec": {}},
+                {"kind": "HTTPRoute", "metadata": {"name": "route"}, "spec": {}},
+            ],
+        }
+    )
+    gateway, httproutes = parse_gateway_resources(content)
+
+    assert gateway["metadata"]["name"] == "gw"
+    assert len(httproutes) == 1
@@ -0,0 +1,82 @@
+"""Tests for HTTPRoute merging."""
+
+from src.ingress2gateway.route_merge import merge_httproutes
+
+
+def _route(name, hostnames, paths, namespace="default", parent="gw"):
+    return {
+        "apiVersion": "gateway.networking.k8s.io/v1",
+        "kind": "HTTPRoute",
+        "metadata": {"name": name, "namespace": namespace},
+        "spec": {
+            "parentRefs": [{"name": parent, "namespace": namespace}],
+            "rules": [
+                {
+                    "matches": [{"path": {"type": "PathPrefix", "value": path}}],
+                    "backendRefs": [{"name": path.strip("/") or "root", "port": 80}],
+                }
+                for path in paths
+            ],
+            "hostnames": hostnames,
+        },
+    }
+
+
+def test_merge_routes_sharing_hostnames():
+    """Test that routes with the same parents and hostnames are merged."""
+    grant = {"kind": "ReferenceGrant", "metadata": {"name": "grant"}}
+    routes = [
+        _route("web-b", ["a.example.com"], ["/b", "/shared"]),
+        grant,
+        _route("other", ["a.example.com"], ["/c"], parent="other-gw"),
+        _route("web-a", ["a.example.com"], ["/a", "/shared"]),
+        _route("prod", ["a.example.com"], ["/d"], namespace="prod"),
+    ]
+
+    merged = merge_httproutes(routes)
+
+    assert [route["metadata"]["name"] for route in merged] == ["web-a", "grant", "other", "prod"]
+    assert merged[1] is grant
+    assert merged[2] is routes[2]
+    # Rules are taken in order of route name, without duplicates
+    paths = [rule["matches"][0]["path"]["value"] for rule in merged[0]["spec"]["rules"]]
+    assert paths == ["/a", "/shared", "/b"]
+    assert merged[0]["spec"]["hostnames"] == ["a.example.com"]
+    assert routes[0]["spec"]["rules"][0]["matches"][0]["path"]["value"] == "/b"
+
+
+def test_merge_routes_splits_at_limits():
+    """Test splitting merged routes by rule count and by size."""
+    routes = [_route(f"web{i:02d}", ["a.example.com"], [f"/p{i:02d}"]) for i in range(20)]
+    routes.append(_route("web00-2", ["b.example.com"], ["/other"]))
+
+    merged = merge_httproutes(routes)
+    assert [(route["metadata"]["name"], len(route["spec"]["rules"])) for route in merged] == [
+        ("web00", 16),
+        ("web00-3", 4),
+        ("web00-2", 1),
+    ]
+
+    merged = merge_httproutes(routes[:4], max_bytes=450)
+    assert [len(route["spec"]["rules"]) for route in merged] == [2, 2]
+    merged = merge_httproutes(routes[:4], max_rules=3)
+    assert [route["metadata"]["name"] for route in merged] == ["web00", "web00-2"]
+    assert [len(route["spec"]["rules"]) for route in merged] == [3, 1]
+
+
+def test_merge_routes_folds_identical_rules():
+    """Test that groups with identical rules become one multi-hostname route."""
+    routes = [
+        _route("a", ["a.example.com"], ["/"]),
+        _route("b", ["b.example.com"], ["/"]),
+        _route("c", ["c.example.com"], ["/other"]),
+        _route("all", [], ["/"]),
+    ]
+
+    merged = merge_httproutes(routes)
+
+    assert [(route["metadata"]["name"], route["spec"]["hostnames"]) for route in merged] == [
+        ("a", ["a.example.com", "b.example.com"]),
+        ("c", ["c.example.com"]),
+        ("all", []),
+    ]
@@ -0,0 +1,87 @@
+"""Tests for HTTPRoute match optimization."""
+
+from src.ingress2gateway.route_optimize import demote_regex, optimize_httproute
+
+
+def _rule(backend, *matches):
+    return {
+        "matches": [
+            {"path": {"type": match[0], "value": match[1]}, **(match[2] if match[2:] else {})}
+            for match in matches
+        ],
+        "backendRefs": [{"name": backend, "port": 80}],
+    }
+
+
+def _route(*rules):
+    return {"kind": "HTTPRoute", "metadata": {"name": "web"}, "spec": {"rules": list(rules)}}
+
+
+def test_demote_regex():
+    """Test regexes that match a literal path or a path prefix."""
+    assert demote_regex("/healthz") == ("Exact", "/healthz")
+    assert demote_regex("^/a\\.b\\$$") == ("Exact", "/a.b$")
+    assert demote_regex("/api(/|$)(.*)") == ("PathPrefix", "/api")
+    assert demote_regex("^/api(/.*)?$") == ("PathPrefix", "/api")
+    assert demote_regex("/.*") == ("PathPrefix", "/")
+    assert demote_regex("(/.*)?") == ("PathPrefix", "/")
+    for pattern in [
+        "/api.*",
+        "/api/(/.*)?",
+        "/v[0-9]+/*",
+        "/v[0-9]+",
+        "/a.b",
+        "/\\d+",
+        "api(/.*)?",
+        # '/api/*' only matches '/api' followed by slashes, '/api/.*' not '/api' itself
+        "/*",
+        "/api/*",
+        "^/api/.*$",
+    ]:
+        assert demote_regex(pattern) is None
+
+
+def test_optimize_orders_and_merges_rules():
+    """Test that rules are ordered by specificity and merged by backend."""
+    route = _route(
+        _rule("web", ("PathPrefix", "/")),
+        _rule("api", ("RegularExpression", "/api(/|$)(.*)")),
+        _rule("web", ("PathPrefix", "/static")),
+        _rule("api", ("RegularExpression", "^/healthz$")),
+        _rule("api", ("Exact", "/healthz")),
+    )
+
+    optimized = optimize_httproute(route)
+
+    assert optimized["spec"]["rules"] == [
+        _rule("api", ("Exact", "/healthz"), ("PathPrefix", "/api")),
+        _rule("web", ("PathPrefix", "/static"), ("PathPrefix", "/")),
+    ]
+    assert route["spec"]["rules"][1]["matches"][0]["path"]["type"] == "RegularExpression"
+    assert optimize_httproute(optimized) is optimized
+
+
+def test_optimize_keeps_ties_and_regexes_in_order():
+    """Test that rules are not moved past matches of equal precedence or regexes."""
+    header = {"headers": [{"name": "x-canary", "value": "1"}]}
+    other = {"headers": [{"name": "x-beta", "value": "1"}]}
+    rules = [
+        _rule("a", ("PathPrefix", "/api", header)),
+        _rule("b", ("PathPrefix", "/api", other)),
+        _rule("a", ("PathPrefix", "/web", other)),
+        _rule("c", ("RegularExpression", "/v[0-9]+")),
+        _rule("c", ("Exact", "/v1")),
+    ]
+
+    assert optimize_httproute(_route(*rules))["spec"]["rules"] == rules
+
+
+def test_optimize_keeps_wildcard_paths():
+    """Test that regex matches with a trailing wildcard such as '/foo/*' are kept."""
+    rules = [
+        _rule("foo", ("RegularExpression", "/foo/*")),
+        _rule("bar", ("RegularExpression", "/foo/.*")),
+        _rule("web", ("RegularExpression", "/*")),
+    ]
+
+    assert optimize_httproute(_route(*rules))["spec"]["rules"] == rules
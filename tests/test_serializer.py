@@ -0,0 +1,192 @@
+"""Tests for the serialization layer."""
+
+import json
+
+import pytest
+import yaml
+
+from src.ingress2gateway import serializer
+from src.ingress2gateway.converter import convert_ingress_to_gateway
+
+INGRESS = {
+    "apiVersion": "networking.k8s.io/v1",
+    "kind": "Ingress",
+    "metadata": {
+        "name": "web",
+        "namespace": "prod",
+        "annotations": {"description": "Long text " * 20, "empty": "", "quoted": "yes"},
+    },
+    "spec": {
+        "ingressClassName": "nginx",
+        "tls": [{"hosts": ["*.example.com"], "secretName": "wildcard-tls"}],
+        "rules": [
+            {
+                "host": "*.example.com",
+                "http": {
+                    "paths": [
+                        {
+                            "path": "/api/v1",
+                            "pathType": "ImplementationSpecific",
+                            "backend": {"service": {"name": "api", "port": {"number": 8080}}},
+                        }
+                    ]
+                },
+            }
+        ],
+    },
+}
+
+
+def test_dump_matches_pure_python_output():
+    """Test that the serializer emits the same bytes as the pure-Python dumper."""
+    resources = convert_ingress_to_gateway(INGRESS)
+    documents = [resources["gateway"], *resources["httproutes"], INGRESS]
+
+    expected = yaml.dump_all(
+        documents, Dumper=yaml.SafeDumper, default_flow_style=False, sort_keys=False
+    )
+    assert serializer.dump_all(documents) == expected
+    assert serializer.dump(INGRESS) == yaml.dump(
+        INGRESS, Dumper=yaml.SafeDumper, default_flow_style=False, sort_keys=False
+    )
+
+
+def test_load_round_trip():
+    """Test that loading dumped output returns the original documents."""
+    assert serializer.load(serializer.dump(INGRESS)) == INGRESS
+    assert list(serializer.load_all(serializer.dump_all([INGRESS, INGRESS]))) == [
+        INGRESS,
+        INGRESS,
+    ]
+
+
+EXPORTED = {
+    **INGRESS,
+    "metadata": {
+        **INGRESS["metadata"],
+        "managedFields": [{"manager": "kubectl", "operation": "Update"}],
+        "annotations": {
+            **INGRESS["metadata"]["annotations"],
+            "kubectl.kubernetes.io/last-applied-configuration": json.dumps(INGRESS),
+        },
+    },
+    "status": {"loadBalancer": {"ingress": [{"ip": "10.0.0.1"}]}},
+}
+
+
+def test_loaders_drop_server_side_state():
+    """Test that status, managedFields and last-applied are dropped from YAML and JSON."""
+    exported_list = {"apiVersion": "v1", "kind": "List", "items": [EXPORTED]}
+
+    assert serializer.load(serializer.dump(EXPORTED)) == INGRESS
+    assert list(serializer.load_all(serializer.dump(exported_list))) == [
+        {**exported_list, "items": [INGRESS]}
+    ]
+    assert list(serializer.load_documents(json.dumps(EXPORTED))) == [INGRESS]
+    assert list(serializer.load_documents(json.dumps([EXPORTED]))) == [INGRESS]
+
+
+ALIAS_BOMB = """a: &a [x, x, x, x, x, x, x, x, x]
+b: &b [*a, *a, *a, *a, *a, *a, *a, *a, *a]
+c: &c [*b, *b, *b, *b, *b, *b, *b, *b, *b]
+d: [*c, *c, *c, *c, *c, *c, *c, *c, *c]
+"""
+
+
+@pytest.fixture
+def limits():
+    """Apply parse limits for one test and restore the previous ones afterwards."""
+    previous = serializer.get_limits()
+    yield serializer.set_limits
+    serializer.set_limits(previous)
+
+
+def test_limits_reject_oversized_input(limits):
+    """Test that alias bombs, deep nesting, large and many documents are rejected."""
+    limits(serializer.ParseLimits(max_alias_nodes=500))
+    with pytest.raises(serializer.LimitExceeded, match="500 nodes"):
+        serializer.load(ALIAS_BOMB)
+
+    limits(serializer.ParseLimits(max_depth=50))
+    with pytest.raises(serializer.LimitExceeded, match="limit of 50"):
+        serializer.load("[" * 200_000)
+    with pytest.raises(serializer.LimitExceeded, match="limit of 50"):
+        list(serializer.load_documents("[" * 60 + "]" * 60))
+
+    limits(serializer.ParseLimits(max_document_size=100, max_documents=2))
+    with pytest.raises(serializer.LimitExceeded, match="100 bytes"):
+        list(serializer.load_all("a: 1\n---\nb: " + "x" * 200 + "\n"))
+    with pytest.raises(serializer.LimitExceeded, match="2 documents"):
+        list(serializer.load_documents("a: 1\n---\nb: 2\n---\nc: 3\n"))
+    with pytest.raises(serializer.LimitExceeded, match="2 documents"):
+        list(serializer.load_documents('{"a": 1}\n{"b": 2}\n{"c": 3}\n'))
+
+
+def test_limits_keep_results(limits):
+    """Test that input within the limits loads exactly as without them."""
+    text = serializer.dump_all([EXPORTED, {"anchored": {"a": 1}}])
+    expected = list(serializer.load_all(text))
+    limits(serializer.ParseLimits(10_000, 10, 100, 10))
+    assert list(serializer.load_all(text)) == expected
+    assert serializer.load(ALIAS_BOMB.split("\nc:")[0]) == {"a": ["x"] * 9, "b": [["x"] * 9] * 9}
+
+
+def test_limits_from_env():
+    """Test reading limits from environment variables."""
+    limits = serializer.ParseLimits.from_env({"I2G_MAX_DEPTH": "20", "I2G_MAX_DOCUMENTS": ""})
+    assert limits == serializer.ParseLimits(max_depth=20)
+    assert serializer.ParseLimits.from_env(limits.to_env()) == limits
+    assert not serializer.ParseLimits.from_env({})
+    with pytest.raises(ValueError, match="I2G_MAX_DEPTH"):
+        serializer.ParseLimits.from_env({"I2G_MAX_DEPTH": "deep"})
+
+
+def test_load_all_is_lazy():
+    """Test that documents are yielded before later invalid documents are parsed."""
+    documents = serializer.load_all("a: 1\n---\n: [invalid")
+    assert next(documents) == {"a": 1}
+
+
+def test_load_documents_detects_json():
+    """Test that JSON objects, arrays and NDJSON are parsed as JSON."""
+    assert list(serializer.load_documents('{"kind": "Ingress"}')) == [{"kind": "Ingress"}]
+    assert list(serializer.load_documents('[{"a": 1}, {"b": 2}]')) == [{"a": 1}, {"b": 2}]
+    assert list(serializer.load_documents('{"a": 1}\n{"b": 2}\n')) == [{"a": 1}, {"b": 2}]
+    assert list(serializer.load_documents("a: 1\n---\nb: 2\n")) == [{"a": 1}, {"b": 2}]
+
+
+def test_load_documents_from_stream(tmp_path):
+    """Test that open files are sniffed and parsed as JSON or YAML."""
+    json_file = tmp_path / "in.json"
+    json_file.write_text('  {"kind": "Ingress"}')
+    yaml_file = tmp_path / "in.yaml"
+    yaml_file.write_text("kind: Ingress\n")
+    with open(json_file) as f:
+        assert list(serializer.load_documents(f)) == [{"kind": "Ingress"}]
+    with open(yaml_file) as f:
+        assert list(serializer.load_documents(f)) == [{"kind": "Ingress"}]
+
+
+def test_expand_lists():
+    """Test that List and typed list objects are expanded into their items."""
+    documents = [
+        {"apiVersion": "v1", "kind": "List", "items": [{"kind": "Ingress"}]},
+        {"kind": "IngressList", "items": [{"kind": "Ingress"}, {"kind": "Ingress"}]},
+        {"kind": "Service"},
+    ]
+    kinds = [doc["kind"] for doc in serializer.expand_lists(documents)]
+    assert kinds == ["Ingress", "Ingress", "Ingress", "Service"]
+
+
+def test_dump_documents_formats():
+    """Test JSON, NDJSON and YAML output formats."""
+    documents = [{"kind": "Gateway"}, {"kind": "HTTPRoute", "spec": {"rules": []}}]
+
+    as_json = json.loads(serializer.dump_documents(documents, "json"))
+    assert as_json == {"apiVersion": "v1", "kind": "List", "items": documents}
+    assert json.loads(serializer.dump_documents([], "json"))["items"] == []
+
+    lines = serializer.dump_documents(documents, "ndjson").splitlines()
+    assert [json.loads(line) for line in lines] == documents
+
+    assert serializer.dump_documents(documents, "yaml") == serializer.dump_all(documents)
@@ -0,0 +1,138 @@
+"""Tests for the background output sink."""
+
+import io
+import os
+import tarfile
+
+import pytest
+
+from src.ingress2gateway.sink import BundleSink, FileSink, OutputSink, write_file
+
+
+class RecordingStream(io.StringIO):
+    """A text stream that records flushes."""
+
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+class FailingStream(io.StringIO):
+    """A text stream whose writes fail like a closed pipe."""
+
+    def write(self, text):
+        raise BrokenPipeError("closed")
+
+
+def test_sink_writes_in_order():
+    """Test that chunks are written in order and flushed on close."""
+    stream = RecordingStream()
+
+    with OutputSink(stream, "close") as sink:
+        sink.write_all(f"doc {i}\n" for i in range(1000))
+
+    assert stream.getvalue() == "".join(f"doc {i}\n" for i in range(1000))
+    assert stream.flushes == 1
+    with pytest.raises(ValueError, match="closed"):
+        sink.write("late")
+
+
+def test_sink_flush_always():
+    """Test flushing after every chunk."""
+    stream = RecordingStream()
+
+    with OutputSink(stream, "always") as sink:
+        sink.write_all(["a", "b", "c"])
+
+    assert stream.flushes == 4
+
+
+def test_sink_auto_policy(tmp_path):
+    """Test that regular files are flushed on close and other streams when idle."""
+    with open(tmp_path / "out.yaml", "w") as output_stream:
+        assert OutputSink(output_stream).flush == "close"
+    assert OutputSink(io.StringIO()).flush == "idle"
+
+    with pytest.raises(ValueError, match="Unknown flush policy"):
+        OutputSink(io.StringIO(), "sometimes")
+
+
+def test_sink_reraises_write_errors():
+    """Test that write errors surface in the producing thread."""
+    sink = OutputSink(FailingStream())
+    sink.write("a")
+
+    with pytest.raises(BrokenPipeError):
+        sink.close()
+
+
+def test_file_sink_skips_unchanged(tmp_path):
+    """Test that a file with identical content is not rewritten."""
+    target = tmp_path / "out" / "gateway.yaml"
+
+    with FileSink(target) as sink:
+        sink.write("kind: Gateway\n")
+    assert sink.written
+    os.utime(target, (0, 0))
+
+    with FileSink(target) as sink:
+        sink.write("kind: Gateway\n")
+    assert not sink.written
+    assert target.stat().st_mtime == 0
+
+    with FileSink(target) as sink:
+        sink.write("kind: HTTPRoute\n")
+    assert sink.written
+    assert target.read_text() == "kind: HTTPRoute\n"
+    assert [p.name for p in target.parent.iterdir()] == ["gateway.yaml"]
+
+
+def test_file_sink_discards_on_error(tmp_path):
+    """Test that a failed conversion leaves the previous output in place."""
+    target = tmp_path / "gateway.yaml"
+    target.write_text("previous\n")
+
+    with pytest.raises(RuntimeError), FileSink(target) as sink:
+        sink.write("partial")
+        raise RuntimeError("conversion failed")
+
+    assert target.read_text() == "previous\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["gateway.yaml"]
+
+
+def test_write_file_skips_unchanged(tmp_path):
+    """Test that write_file only replaces files whose content changed."""
+    target = tmp_path / "sub" / "out.yaml"
+    assert write_file(target, "a\n")
+    assert not write_file(target, "a\n")
+    assert write_file(target, "b\n")
+    assert target.read_text() == "b\n"
+    assert [p.name for p in target.parent.iterdir()] == ["out.yaml"]
+
+
+def test_bundle_sink_is_reproducible(tmp_path):
+    """Test streaming files into an archive that is only rewritten if changed."""
+    target = tmp_path / "bundle.tar.gz"
+
+    with BundleSink(target) as sink:
+        sink.add_all([("ns/a.yaml", "a: 1\n"), ("b.yaml", "b: 2\n")])
+    assert sink.written
+    with tarfile.open(target) as archive:
+        assert archive.getnames() == ["ns/a.yaml", "b.yaml"]
+        assert archive.extractfile("b.yaml").read() == b"b: 2\n"
+
+    with BundleSink(target) as sink:
+        sink.add_all([("ns/a.yaml", "a: 1\n"), ("b.yaml", "b: 2\n")])
+    assert not sink.written
+
+    with pytest.raises(RuntimeError):
+        with BundleSink(target) as sink:
+            sink.add("c.yaml", "c: 3\n")
+            raise RuntimeError("conversion failed")
+    with tarfile.open(target) as archive:
+        assert archive.getnames() == ["ns/a.yaml", "b.yaml"]
+    assert [p.name for p in tmp_path.iterdir()] == ["bundle.tar.gz"]
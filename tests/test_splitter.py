@@ -0,0 +1,148 @@
+"""Tests for pre-parse document splitting and selector pushdown."""
+
+import yaml
+
+from src.ingress2gateway import serializer
+from src.ingress2gateway.splitter import (
+    Selector,
+    iter_raw_documents,
+    sniff,
+    strip_raw_document,
+)
+
+DUMP = """# leading comment
+---
+apiVersion: v1
+kind: Service
+metadata:
+  name: svc
+  namespace: team-a
+spec:
+  ports:
+  - port: 80
+---
+apiVersion: networking.k8s.io/v1
+kind: Ingress
+metadata:
+  managedFields:
+  - manager: kubectl
+    operation: Update
+  name: web
+  namespace: team-b # trailing comment
+  labels:
+    namespace: not-this-one
+spec:
+  ingressClassName: "nginx"
+  rules:
+  - host: example.com
+--- {apiVersion: v1, kind: ConfigMap, metadata: {name: flow}}
+---
+kind: Ingress
+metadata:
+  name: legacy
+  annotations:
+    kubernetes.io/ingress.class: traefik
+description: |
+  ---not-a-marker
+...
+"""
+
+
+def test_iter_raw_documents_matches_yaml_parser():
+    """Test that raw splitting yields the same documents as PyYAML."""
+    raw = list(iter_raw_documents(DUMP))
+    assert [yaml.safe_load(doc) for doc in raw] == list(yaml.safe_load_all(DUMP))
+
+
+def test_iter_raw_documents_from_file(tmp_path):
+    """Test that files are memory-mapped and split identically."""
+    path = tmp_path / "dump.yaml"
+    path.write_text(DUMP)
+    with open(path) as f:
+        assert list(iter_raw_documents(f)) == list(iter_raw_documents(DUMP))
+
+    empty = tmp_path / "empty.yaml"
+    empty.write_text("")
+    with open(empty) as f:
+        assert list(iter_raw_documents(f)) == []
+
+
+def test_sniff_fields():
+    """Test sniffing kind, namespace and ingress class from raw text."""
+    service, ingress, flow, legacy = iter_raw_documents(DUMP)
+
+    assert sniff(service) == {"kind": "Service", "namespace": "team-a", "ingress_class": ""}
+    assert sniff(ingress) == {"kind": "Ingress", "namespace": "team-b", "ingress_class": "nginx"}
+    assert sniff(flow) == {"kind": None, "namespace": None, "ingress_class": None}
+    assert sniff(legacy) == {"kind": "Ingress", "namespace": "default", "ingress_class": "traefik"}
+
+
+def test_sniff_unknown_with_merge_keys():
+    """Test that merge keys leave namespace and class to the parser."""
+    text = "kind: Ingress\nmetadata:\n  <<: *base\n  name: x\n"
+    assert sniff(text) == {"kind": "Ingress", "namespace": None, "ingress_class": None}
+
+
+EXPORTED = """apiVersion: networking.k8s.io/v1
+kind: Ingress
+metadata:
+  annotations:
+    kubectl.kubernetes.io/last-applied-configuration: |
+      {"kind": "Ingress"}
+  managedFields:
+  - manager: kubectl
+    fieldsV1:
+      f:spec: {}
+  name: web
+spec:
+  rules: []
+status:
+  loadBalancer: {}
+# trailing comment
+  ingress: []
+"""
+
+
+def test_strip_raw_document():
+    """Test that server-side state is cut from raw text exactly as the loader drops it."""
+    stripped = strip_raw_document(EXPORTED)
+    assert "managedFields" not in stripped
+    assert "last-applied" not in stripped
+    assert "status" not in stripped
+    assert serializer.load(stripped) == serializer.load(EXPORTED)
+    assert serializer.load(stripped)["metadata"] == {"annotations": {}, "name": "web"}
+
+    for raw in iter_raw_documents(DUMP):
+        assert serializer.load(strip_raw_document(raw)) == serializer.load(raw)
+
+
+def test_strip_raw_document_leaves_unsafe_text():
+    """Test that flow style, CRLF line ends and anchors are left to the loader."""
+    flow = '{"kind": "Ingress", "status": {}}'
+    crlf = "kind: Ingress\r\nstatus:\r\n  a: 1\r\n"
+    anchored = "kind: Ingress\nstatus: &s\n  a: 1\nspec:\n  copy: *s\n"
+    for text in (flow, crlf, anchored):
+        assert strip_raw_document(text) == text
+
+
+def test_selector_match_fields():
+    """Test selector matching on sniffed fields."""
+    selector = Selector(["Ingress"], ["prod"], ["nginx"])
+
+    assert selector.match_fields("Ingress", "prod", "nginx")
+    assert not selector.match_fields("Service", "prod", "")
+    assert not selector.match_fields("Ingress", "dev", "nginx")
+    assert not selector.match_fields("Ingress", "prod", "traefik")
+    # Unknown fields and list kinds always require a parse
+    assert selector.match_fields(None, None, None)
+    assert selector.match_fields("IngressList", "dev", "")
+
+
+def test_selector_matches_document():
+    """Test selector matching on parsed documents."""
+    selector = Selector(namespaces=["default"], ingress_classes=["traefik"])
+    legacy = yaml.safe_load(list(iter_raw_documents(DUMP))[3])
+
+    assert selector.matches(legacy)
+    assert not selector.matches({"kind": "Ingress", "metadata": {"namespace": "prod"}})
+    assert Selector().matches({"kind": "Anything"})
@@ -0,0 +1,84 @@
+"""Tests for the on-disk resource store."""
+
+from src.ingress2gateway.canonical import canonicalize
+from src.ingress2gateway.pipeline import ConversionResult, merge_results
+from src.ingress2gateway.reference_grant import generate_reference_grants
+from src.ingress2gateway.store import ResourceStore
+
+
+def _route(name, namespace="default", hostnames=(), parent=("default", "gw"), backends=()):
+    return {
+        "kind": "HTTPRoute",
+        "metadata": {"name": name, "namespace": namespace},
+        "spec": {
+            "parentRefs": [{"name": parent[1], "namespace": parent[0]}],
+            "hostnames": list(hostnames),
+            "rules": [{"backendRefs": [{"name": backend} for backend in backends]}],
+        },
+    }
+
+
+def test_store_round_trip_and_indexes(tmp_path):
+    """Test reading documents back in order and through the indexes."""
+    routes = [
+        _route("b", hostnames=["b.example.com"], backends=["web"]),
+        _route("a", "prod", hostnames=["a.example.com", "b.example.com"]),
+        _route("c", "prod", parent=("infra", "shared"), backends=["api", "api"]),
+    ]
+    with ResourceStore(tmp_path) as store:
+        store.add_all(routes)
+
+        assert list(store.iter_documents()) == routes
+        assert store.count() == 3
+        assert store.count("GRPCRoute") == 0
+        assert [d["metadata"]["name"] for d in store.iter_documents(namespace="prod")] == ["a", "c"]
+        assert [d["metadata"]["name"] for d in store.iter_documents(cross_namespace=True)] == [
+            "a",
+            "c",
+        ]
+        assert list(store.iter_documents(canonical=True)) == canonicalize(routes)
+        path = store.path
+    assert not path.exists()
+
+
+def test_merge_results_into_store(tmp_path):
+    """Test that merged routes are views of the store."""
+    gateway = {"kind": "Gateway", "metadata": {"name": "gw"}}
+    results = [
+        ConversionResult(
+            {"metadata": {"name": f"ingress-{i}"}},
+            resources={"gateway": gateway, "httproutes": [_route(f"r{i}")], "grpcroutes": []},
+            warnings=[f"warning {i}"],
+            unsupported=[{"annotation": f"a{i}"}],
+        )
+        for i in range(3)
+    ]
+    with ResourceStore(tmp_path, max_memory=1024 * 1024) as store:
+        merged = merge_results(results, store)
+
+        httproutes = merged.resources["httproutes"]
+        assert len(httproutes) == 3
+        assert [r["metadata"]["name"] for r in httproutes] == ["r0", "r1", "r2"]
+        assert not merged.resources["grpcroutes"]
+        assert list(merged.warnings) == ["warning 0", "warning 1", "warning 2"]
+        assert len(merged.unsupported) == 3
+        assert list(merged.unsupported)[2] == {"annotation": "a2"}
+
+
+def test_reference_grants_from_store_index(tmp_path):
+    """Test that the cross-namespace index finds every route that needs a grant."""
+    routes = [
+        _route("a", "prod", parent=("prod", "gw"), backends=["web"]),
+        _route("b", "prod", parent=("prod", "gw")),
+        _route("c", "prod", parent=("infra", "shared")),
+    ]
+    routes[0]["spec"]["rules"][0]["backendRefs"].append({"name": "db", "namespace": "data"})
+    with ResourceStore(tmp_path) as store:
+        store.add_all(routes)
+
+        indexed = list(store.iter_documents(cross_namespace=True))
+        assert [d["metadata"]["name"] for d in indexed] == ["a", "c"]
+        gateway = {"kind": "Gateway", "metadata": {"name": "gw", "namespace": "prod"}}
+        assert generate_reference_grants(gateway, indexed) == generate_reference_grants(
+            gateway, routes
+        )
@@ -2,6 +2,7 @@
 
 from src.ingress2gateway.validation import (
     ValidationResult,
+    validate_conversion_output,
     validate_gateway,
     validate_httproute,
     validate_ingress,
@@ -110,6 +111,48 @@ def test_validate_valid_httproute():
     assert result.is_valid
 
 
+def test_validate_route_attachment():
+    """Test warning about routes that no listener of their Gateway accepts."""
+    gateway = {
+        "apiVersion": "gateway.networking.k8s.io/v1",
+        "kind": "Gateway",
+        "metadata": {"name": "gateway"},
+        "spec": {
+            "gatewayClassName": "istio",
+            "listeners": [
+                {"name": "http", "port": 80, "protocol": "HTTP", "hostname": "*.example.com"}
+            ],
+        },
+    }
+    routes = [
+        {
+            "apiVersion": "gateway.networking.k8s.io/v1",
+            "kind": "HTTPRoute",
+            "metadata": {"name": name},
+            "spec": {
+                "parentRefs": [{"name": parent}],
+                "hostnames": [hostname],
+                "rules": [{"backendRefs": [{"name": "svc", "port": 80}]}],
+            },
+        }
+        for name, parent, hostname in [
+            ("a", "gateway", "a.example.com"),
+            ("b", "gateway", "example.com"),
+            ("c", "other", "example.com"),
+        ]
+    ]
+
+    result = validate_conversion_output({"gateway": gateway, "httproutes": routes})
+
+    assert result.is_valid
+    assert [(w.path, w.message) for w in result.warnings] == [
+        (
+            "httproutes[1].spec.parentRefs",
+            "No listener of the referenced Gateways accepts the route",
+        )
+    ]
+
+
 def test_validation_result_to_dict():
     """Test ValidationResult to_dict method."""
     result = ValidationResult()
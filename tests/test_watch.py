@@ -0,0 +1,109 @@
+"""Tests for watch mode."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.ingress2gateway.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    iter_watch,
+    watch_roots,
+)
+
+INGRESS_YAML = """apiVersion: networking.k8s.io/v1
+kind: Ingress
+metadata:
+  name: {name}
+spec:
+  rules:
+    - host: {name}.example.com
+      http:
+        paths:
+          - path: /
+            pathType: Prefix
+            backend:
+              service:
+                name: {name}
+                port:
+                  number: 80
+"""
+
+
+def _manifest(*names):
+    return "---\n".join(INGRESS_YAML.format(name=name) for name in names)
+
+
+def test_watch_roots(tmp_path):
+    """Test that roots cover files, directories and glob prefixes."""
+    (tmp_path / "apps" / "web").mkdir(parents=True)
+    (tmp_path / "apps" / "web" / "ingress.yaml").write_text("")
+    (tmp_path / "other").mkdir()
+
+    roots = watch_roots(
+        [
+            str(tmp_path / "apps"),
+            str(tmp_path / "apps" / "web" / "ingress.yaml"),
+            str(tmp_path / "other" / "**" / "*.yaml"),
+        ]
+    )
+
+    assert roots == [tmp_path / "apps", tmp_path / "other"]
+
+
+@pytest.mark.parametrize("kind", ["polling", "inotify"])
+def test_iter_watch_reconverts_changes(tmp_path, kind):
+    """Test incremental re-conversion of edited, added and removed files."""
+    if kind == "inotify" and not sys.platform.startswith("linux"):
+        pytest.skip("inotify requires Linux")
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "apps.yaml").write_text(_manifest("web", "api", "admin"))
+    patterns = [str(tmp_path / "in")]
+    output_dir = tmp_path / "out"
+
+    if kind == "inotify":
+        watcher = InotifyWatcher([tmp_path / "in"])
+    else:
+        watcher = PollingWatcher(lambda: sorted((tmp_path / "in").glob("*.yaml")), 0.01)
+    batches = iter_watch(patterns, str(output_dir), watcher=watcher, provider="istio")
+
+    [initial] = next(batches)
+    assert initial.status == "converted"
+    assert initial.ingresses == 3
+
+    (tmp_path / "in" / "apps.yaml").write_text(_manifest("web", "api", "shop"))
+    [edited] = next(batches)
+    assert edited.message == "1 of 3 documents re-converted"
+    assert "shop.example.com" in (output_dir / "apps.yaml").read_text()
+
+    (tmp_path / "in" / "new.yaml").write_text(_manifest("new"))
+    [added] = next(batches)
+    assert Path(added.input_path).name == "new.yaml"
+    assert (output_dir / "new.yaml").exists()
+
+    (tmp_path / "in" / "new.yaml").unlink()
+    [removed] = next(batches)
+    assert removed.status == "removed"
+    assert not (output_dir / "new.yaml").exists()
+
+    batches.close()
+
+
+def test_iter_watch_output_file(tmp_path):
+    """Test that a single watched file can be converted into a named output file."""
+    input_file = tmp_path / "ingress.yaml"
+    input_file.write_text(_manifest("web"))
+    output = tmp_path / "out.yaml"
+    watcher = PollingWatcher(lambda: [input_file], 0.01)
+    batches = iter_watch([str(input_file)], watcher=watcher, output_file=str(output))
+
+    [initial] = next(batches)
+    assert initial.status == "converted"
+    assert output.is_file()
+
+    input_file.write_text(_manifest("shop"))
+    next(batches)
+    assert "shop.example.com" in output.read_text()
+
+    batches.close()